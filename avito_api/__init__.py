@@ -3,24 +3,47 @@
 Оптимизирован для быстрой интеграции и высокой производительности
 """
 
-from .api_client import AvitoAPIClient
+import importlib
+
+# Классы импортируются при первом обращении (PEP 562): import avito_api не загружает requests и aiohttp
+_LAZY = {
+    'AvitoAPIClient': '.api_client',
+    'AsyncAvitoAPIClient': '.async_api_client',
+    'AccountPool': '.account_pool',
+    'Item': '.models',
+    'ReportItem': '.models',
+    'Fee': '.models',
+    'Chat': '.models',
+    'Message': '.models',
+    'ItemStatsRow': '.models',
+    'Exporter': '.export',
+}
 
 # Экспортируем основной класс для удобного импорта
-__all__ = ['AvitoAPIClient']  # Также меняем здесь
+__all__ = [
+    'AvitoAPIClient', 'AsyncAvitoAPIClient', 'AccountPool',
+    'Item', 'ReportItem', 'Fee', 'Chat', 'Message', 'ItemStatsRow', 'Exporter'
+]  # Также меняем здесь
 
 # Версия пакета
 __version__ = '1.1.0'
 
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
 # Настройка логирования
 import logging
 
-# Создаем логгер
-logger = logging.getLogger('avito_api')
-logger.setLevel(logging.INFO)
-
-# Если обработчики еще не настроены, добавляем базовый обработчик
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
\ No newline at end of file
+# Библиотека не настраивает уровень и вывод логов: это делает приложение (logging.basicConfig и т.п.).
+# NullHandler убирает вывод "последней надежды" logging, пока приложение логирование не настроило
+logging.getLogger('avito_api').addHandler(logging.NullHandler())
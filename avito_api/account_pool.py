@@ -0,0 +1,200 @@
+# account_pool.py
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from .api_client import AvitoAPIClient
+from .utils.request_handler import RequestHandler
+from .utils.retry import DEFAULT_RETRY_POLICY
+from .config.settings import POOL_CONNECTIONS, POOL_MAXSIZE, ACCOUNT_POOL_WORKERS
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+class AccountPool:
+    def __init__(self, request_handler=None, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                 max_concurrency=None, max_workers=ACCOUNT_POOL_WORKERS, token_store=None,
+                 rate_limiter=None,
+                 retry_policy=DEFAULT_RETRY_POLICY, cache=None, hooks=None, lazy_auth=False, coalesce=True):
+        """
+        Пул аккаунтов Avito с общим пулом соединений и общим лимитом одновременных запросов.
+
+        Клиенты создаются лениво - при первом обращении к аккаунту, поэтому регистрация
+        сотен аккаунтов не выполняет сетевых запросов.
+
+        Args:
+            request_handler (RequestHandler): Общий обработчик запросов (по умолчанию создается новый)
+            pool_connections (int): Количество хостов, для которых кешируются пулы соединений
+            pool_maxsize (int): Максимальное количество соединений с одним хостом
+            max_concurrency (int): Общий лимит одновременных запросов по всем аккаунтам
+            max_workers (int): Количество потоков по умолчанию для map()
+            token_store (TokenStore): Хранилище токенов: действующие токены берутся из него без запроса к API
+            rate_limiter (RateLimiter): Ограничение частоты запросов по аккаунтам и группам методов
+            retry_policy (RetryPolicy): Политика повтора запросов (None - без повторов)
+            cache (ResponseCache): Кеш ответов для методов, данные которых редко меняются
+            hooks (list): Обработчики событий запросов (RequestHooks, например MetricsCollector)
+            lazy_auth (bool): Проверять токен аккаунта при первом запросе, а не при создании клиента
+            coalesce (bool): Объединять одинаковые одновременные GET-запросы в один
+        """
+        self._owns_request_handler = request_handler is None
+        self.request_handler = request_handler or RequestHandler(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+            max_concurrency=max_concurrency,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            cache=cache,
+            hooks=hooks,
+            coalesce=coalesce
+        )
+        self.max_workers = max_workers
+        self.token_store = token_store
+        self.lazy_auth = lazy_auth
+        self._accounts = {}
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._client_locks = {}
+
+    def add(self, key, client_id=None, client_secret=None, access_token=None, token_expires_at=None):
+        """
+        Регистрирует аккаунт без создания клиента
+
+        Args:
+            key: Ключ аккаунта (например, ID магазина или пользователя)
+            client_id (str): ID клиента для авторизации
+            client_secret (str): Секретный ключ клиента
+            access_token (str): Существующий токен доступа (аккаунт без client_id различается
+                в общем кеше и при объединении запросов по хешу токена)
+            token_expires_at (int): Время истечения токена (timestamp)
+        """
+        with self._lock:
+            self._accounts[key] = {
+                "client_id": client_id,
+                "client_secret": client_secret,
+                "access_token": access_token,
+                "token_expires_at": token_expires_at
+            }
+            # Повторная регистрация заменяет учетные данные - клиент будет создан заново
+            self._clients.pop(key, None)
+            self._client_locks.setdefault(key, threading.Lock())
+
+    def remove(self, key):
+        """
+        Удаляет аккаунт и его клиент из пула
+        """
+        with self._lock:
+            self._accounts.pop(key, None)
+            self._clients.pop(key, None)
+            self._client_locks.pop(key, None)
+
+    def get(self, key):
+        """
+        Возвращает клиент аккаунта, создавая его при первом обращении
+
+        Args:
+            key: Ключ аккаунта
+
+        Returns:
+            AvitoAPIClient: Клиент, использующий общий обработчик запросов
+        """
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            if key not in self._accounts:
+                raise KeyError(f"Аккаунт {key} не зарегистрирован в пуле")
+            client_lock = self._client_locks[key]
+            credentials = self._accounts[key]
+
+        # Отдельная блокировка на аккаунт: клиенты разных аккаунтов создаются параллельно
+        with client_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = AvitoAPIClient(
+                    request_handler=self.request_handler,
+                    token_store=self.token_store,
+                    lazy_auth=self.lazy_auth,
+                    **credentials
+                )
+                with self._lock:
+                    if key in self._accounts:
+                        self._clients[key] = client
+        return client
+
+    def __getitem__(self, key):
+        return self.get(key)
+
+    def __contains__(self, key):
+        return key in self._accounts
+
+    def __len__(self):
+        return len(self._accounts)
+
+    def keys(self):
+        """
+        Возвращает список ключей зарегистрированных аккаунтов
+        """
+        with self._lock:
+            return list(self._accounts)
+
+    def get_token_info(self, key):
+        """
+        Возвращает текущий токен аккаунта (например, для сохранения в базу данных)
+
+        Returns:
+            dict: access_token и token_expires_at или None, если клиент еще не создан
+        """
+        client = self._clients.get(key)
+        if client is None:
+            return None
+        return {
+            "access_token": client.auth.access_token,
+            "token_expires_at": client.auth.token_expires_at
+        }
+
+    def map(self, func, keys=None, max_workers=None, pass_key=False):
+        """
+        Параллельно вызывает func для клиентов нескольких аккаунтов
+
+        Пример:
+            balances = pool.map(lambda key, c: c.user.get_user_balance(key), pass_key=True)
+
+        Args:
+            func (callable): Функция func(client) или func(key, client) при pass_key=True
+            keys (list): Ключи аккаунтов (по умолчанию - все аккаунты пула)
+            max_workers (int): Количество потоков (по умолчанию - max_workers пула)
+            pass_key (bool): Передавать ключ аккаунта первым аргументом
+
+        Returns:
+            dict: {ключ: {"result": результат или None, "error": текст ошибки или None}}
+        """
+        keys = self.keys() if keys is None else list(keys)
+        if not keys:
+            return {}
+
+        def _call(key):
+            try:
+                client = self.get(key)
+                result = func(key, client) if pass_key else func(client)
+                return key, {"result": result, "error": None}
+            except Exception as e:
+                logger.error(f"Ошибка при обработке аккаунта {key}: {str(e)}")
+                return key, {"result": None, "error": str(e)}
+
+        workers = min(max_workers or self.max_workers, len(keys))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(executor.map(_call, keys))
+
+    def close(self):
+        """
+        Закрывает общий пул соединений, если он принадлежит пулу аккаунтов
+        """
+        if self._owns_request_handler:
+            self.request_handler.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,17 +1,29 @@
 # api_client.py
 from .auth.authentication import Authentication
-from .autoload.autoload_client import AutoloadClient
-from .item.item_client import ItemClient
-from .user.user_client import UserClient
-from .services_item.services_client import ServicesClient
-from .messenger.messenger_client import MessengerClient
+from .utils.base_client import LazySubClientsMixin
+from .utils.request_handler import RequestHandler
+from .utils.retry import DEFAULT_RETRY_POLICY
+from .config.settings import POOL_CONNECTIONS, POOL_MAXSIZE
 import logging
 
 # Получаем логгер
 logger = logging.getLogger('avito_api')
 
-class AvitoAPIClient:
-    def __init__(self, client_id=None, client_secret=None, access_token=None, token_expires_at=None):
+class AvitoAPIClient(LazySubClientsMixin):
+    # Блоки методов создаются при первом обращении (client.item, client.autoload, ...)
+    SUB_CLIENTS = {
+        "autoload": (".autoload.autoload_client", "AutoloadClient"),
+        "item": (".item.item_client", "ItemClient"),
+        "user": (".user.user_client", "UserClient"),
+        "services": (".services_item.services_client", "ServicesClient"),
+        "messenger": (".messenger.messenger_client", "MessengerClient"),
+    }
+
+    def __init__(self, client_id=None, client_secret=None, access_token=None, token_expires_at=None,
+                 request_handler=None, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                 pool_block=False, keep_alive=True, warm_up=0, max_concurrency=None, token_store=None,
+                 background_refresh=False, rate_limiter=None,
+                 retry_policy=DEFAULT_RETRY_POLICY, cache=None, hooks=None, lazy_auth=False, coalesce=True):
         """
         Инициализация клиента API Avito
         
@@ -20,22 +32,70 @@ class AvitoAPIClient:
             client_secret (str): Секретный ключ клиента
             access_token (str): Существующий токен доступа
             token_expires_at (int): Время истечения токена (timestamp)
+            request_handler (RequestHandler): Общий обработчик запросов (для нескольких клиентов)
+            pool_connections (int): Количество хостов, для которых кешируются пулы соединений
+            pool_maxsize (int): Максимальное количество соединений с одним хостом
+            pool_block (bool): Ждать освобождения соединения вместо открытия нового сверх pool_maxsize
+            keep_alive (bool): Переиспользовать соединения между запросами
+            warm_up (int): Количество соединений, открываемых заранее при инициализации
+            max_concurrency (int): Максимальное количество одновременно выполняемых запросов
+            token_store (TokenStore): Хранилище токенов, общее для нескольких процессов
+            background_refresh (bool): Обновлять токен заранее в фоновом потоке
+            rate_limiter (RateLimiter): Ограничение частоты запросов по аккаунтам и группам методов
+            retry_policy (RetryPolicy): Политика повтора запросов (None - без повторов)
+            cache (ResponseCache): Кеш ответов для методов, данные которых редко меняются
+            hooks (list): Обработчики событий запросов (RequestHooks, например MetricsCollector)
+            lazy_auth (bool): Не обращаться к API в конструкторе: токен проверяется или получается
+                при первом запросе, а при background_refresh=True - сразу в фоновом потоке
+            coalesce (bool): Объединять одинаковые одновременные GET-запросы в один
         """
+        # Один обработчик запросов с пулом соединений на все блоки методов
+        self._owns_request_handler = request_handler is None
+        self.request_handler = request_handler or RequestHandler(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            max_concurrency=max_concurrency,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            cache=cache,
+            hooks=hooks,
+            coalesce=coalesce
+        )
+        if warm_up:
+            self.request_handler.warm_up(connections=warm_up)
+
         # Инициализируем аутентификацию
         self.auth = Authentication(
             client_id=client_id, 
             client_secret=client_secret,
             access_token=access_token,
-            token_expires_at=token_expires_at
+            token_expires_at=token_expires_at,
+            session=self.request_handler.session,
+            token_store=token_store,
+            hooks=self.request_handler.hooks,
+            lazy=lazy_auth
         )
         
         # Если токен был обновлен при инициализации, логируем это
         if self.auth.token_refreshed:
             logger.info("Токен был обновлен при инициализации клиента")
-        
-        # Инициализируем клиенты для каждого блока методов
-        self.autoload = AutoloadClient(self.auth)
-        self.item = ItemClient(self.auth)
-        self.user = UserClient(self.auth)
-        self.services = ServicesClient(self.auth)
-        self.messenger = MessengerClient(self.auth)
+
+        if background_refresh:
+            self.auth.start_background_refresh()
+
+    def close(self):
+        """
+        Закрывает соединения, если обработчик запросов принадлежит этому клиенту,
+        и останавливает фоновое обновление токена
+        """
+        self.auth.stop_background_refresh()
+        if self._owns_request_handler:
+            self.request_handler.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
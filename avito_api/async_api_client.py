@@ -0,0 +1,97 @@
+# async_api_client.py
+from .auth.async_authentication import AsyncAuthentication
+from .utils.base_client import LazySubClientsMixin
+from .utils.async_request_handler import AsyncRequestHandler
+from .utils.retry import DEFAULT_RETRY_POLICY
+from .config.settings import ASYNC_POOL_LIMIT, ASYNC_MAX_CONCURRENCY
+import logging
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+class AsyncAvitoAPIClient(LazySubClientsMixin):
+    # Блоки методов создаются при первом обращении (client.item, client.autoload, ...)
+    SUB_CLIENTS = {
+        "autoload": (".autoload.autoload_client", "AsyncAutoloadClient"),
+        "item": (".item.item_client", "AsyncItemClient"),
+        "user": (".user.user_client", "AsyncUserClient"),
+        "services": (".services_item.services_client", "AsyncServicesClient"),
+        "messenger": (".messenger.messenger_client", "AsyncMessengerClient"),
+    }
+
+    def __init__(self, client_id=None, client_secret=None, access_token=None, token_expires_at=None,
+                 request_handler=None, limit=ASYNC_POOL_LIMIT, limit_per_host=0, keep_alive=True,
+                 max_concurrency=ASYNC_MAX_CONCURRENCY, token_store=None, rate_limiter=None,
+                 retry_policy=DEFAULT_RETRY_POLICY, cache=None, hooks=None, coalesce=True):
+        """
+        Инициализация асинхронного клиента API Avito
+
+        Конструктор не выполняет сетевых запросов: токен проверяется в start()
+        (или при входе в async with) либо при первом запросе.
+
+        Args:
+            client_id (str): ID клиента для авторизации
+            client_secret (str): Секретный ключ клиента
+            access_token (str): Существующий токен доступа
+            token_expires_at (int): Время истечения токена (timestamp)
+            request_handler (AsyncRequestHandler): Общий обработчик запросов (для нескольких клиентов)
+            limit (int): Общее количество соединений в пуле
+            limit_per_host (int): Максимальное количество соединений с одним хостом (0 - без ограничения)
+            keep_alive (bool): Переиспользовать соединения между запросами
+            max_concurrency (int): Максимальное количество одновременно выполняемых запросов
+            token_store (TokenStore): Хранилище токенов, общее для нескольких процессов
+            rate_limiter (RateLimiter): Ограничение частоты запросов по аккаунтам и группам методов
+            retry_policy (RetryPolicy): Политика повтора запросов (None - без повторов)
+            cache (ResponseCache): Кеш ответов для методов, данные которых редко меняются
+            hooks (list): Обработчики событий запросов (RequestHooks, например MetricsCollector)
+            coalesce (bool): Объединять одинаковые одновременные GET-запросы в один
+        """
+        self._owns_request_handler = request_handler is None
+        self.request_handler = request_handler or AsyncRequestHandler(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            keep_alive=keep_alive,
+            max_concurrency=max_concurrency,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            cache=cache,
+            hooks=hooks,
+            coalesce=coalesce
+        )
+
+        # Инициализируем аутентификацию
+        self.auth = AsyncAuthentication(
+            client_id=client_id,
+            client_secret=client_secret,
+            access_token=access_token,
+            token_expires_at=token_expires_at,
+            request_handler=self.request_handler,
+            token_store=token_store
+        )
+
+    async def start(self):
+        """
+        Проверяет или получает токен до первого запроса
+
+        Returns:
+            AsyncAvitoAPIClient: Этот же клиент
+        """
+        await self.auth.initialize()
+
+        # Если токен был обновлен при инициализации, логируем это
+        if self.auth.token_refreshed:
+            logger.info("Токен был обновлен при инициализации клиента")
+        return self
+
+    async def close(self):
+        """
+        Закрывает соединения, если обработчик запросов принадлежит этому клиенту
+        """
+        if self._owns_request_handler:
+            await self.request_handler.close()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
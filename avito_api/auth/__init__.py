@@ -0,0 +1,4 @@
+from .authentication import Authentication
+from .token_store import TokenStore, FileTokenStore, SQLiteTokenStore
+
+__all__ = ['Authentication', 'TokenStore', 'FileTokenStore', 'SQLiteTokenStore']
@@ -0,0 +1,203 @@
+# /auth/async_authentication.py
+
+import asyncio
+import time
+import logging
+from .token_store import StoredTokenMixin
+from ..utils.hooks import call_hooks
+from ..config.settings import API_BASE_URL, TOKEN_REFRESH_MARGIN
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+class AsyncAuthentication(StoredTokenMixin):
+    def __init__(self, client_id=None, client_secret=None, access_token=None, token_expires_at=None, request_handler=None,
+                 token_store=None):
+        '''
+        Инициализация класса AsyncAuthentication
+
+        В отличие от Authentication, проверка токена не выполняется в конструкторе:
+        она происходит в initialize() или при первом вызове get_headers().
+
+        Args:
+            client_id (str): ID клиента для авторизации
+            client_secret (str): Секретный ключ клиента
+            access_token (str): Существующий токен доступа
+            token_expires_at (int): Время истечения токена в формате timestamp
+            request_handler (AsyncRequestHandler): Обработчик запросов, чья сессия используется для токенов
+            token_store (TokenStore): Хранилище токенов, общее для нескольких процессов
+        '''
+        if request_handler is None:
+            from ..utils.async_request_handler import AsyncRequestHandler
+            request_handler = AsyncRequestHandler()
+        self.request_handler = request_handler
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.access_token = access_token
+        self.token_expires_at = token_expires_at
+        self.token_store = token_store
+
+        # Флаг обновления токена
+        self.token_refreshed = False
+
+        self._initialized = False
+        # Блокировка создается внутри работающего цикла событий
+        self._lock = None
+
+    def _get_lock(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def initialize(self):
+        """
+        Инициализирует или проверяет токен (однократно)
+        """
+        if self._initialized:
+            return
+        async with self._get_lock():
+            if self._initialized:
+                return
+            # Если в хранилище есть действующий токен, используем его без запроса к API
+            if not self._load_stored_token():
+                await self._initialize_token()
+            self._initialized = True
+
+    async def _initialize_token(self):
+        """
+        Проверяет переданный токен или получает новый
+        """
+        # Если токен предоставлен, проверяем его валидность
+        if self.access_token:
+            if not await self._validate_token():
+                # Если токен невалиден и есть client_id/client_secret, получаем новый
+                if self.client_id and self.client_secret:
+                    await self._create_token()
+        # Если токен не предоставлен, но есть учетные данные
+        elif self.client_id and self.client_secret:
+            await self._create_token()
+
+    async def _validate_token(self):
+        """
+        Проверяет валидность токена через тестовый запрос к API
+
+        Returns:
+            bool: True если токен валиден, False если нет
+        """
+        import aiohttp
+
+        if not self.access_token:
+            return False
+
+        # URL для проверки валидности токена
+        url = f"{API_BASE_URL}/core/v1/accounts/self"
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+
+        try:
+            session = self.request_handler.get_session()
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                await response.read()
+
+                # Если токен валиден
+                if response.status == 200:
+                    # Если не знаем время истечения, устанавливаем примерное (24 часа)
+                    if self.token_expires_at is None:
+                        self.token_expires_at = int(time.time()) + 86400
+                    return True
+
+                # Если ошибка авторизации
+                elif response.status in [401, 403]:
+                    return False
+
+                # Другие ошибки считаем не связанными с токеном
+                else:
+                    return True
+
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # При ошибке сети считаем токен валидным
+            return True
+
+    async def get_headers(self):
+        """
+        Возвращает заголовки для запросов с проверкой актуальности токена
+
+        Returns:
+            dict: Заголовки для запроса
+        """
+        await self.initialize()
+
+        # Проверяем срок действия токена
+        await self._ensure_valid_token()
+
+        # Возвращаем заголовки
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+    def _needs_refresh(self, margin=TOKEN_REFRESH_MARGIN):
+        # Если нет токена, пытаемся получить новый
+        if not self.access_token:
+            return bool(self.client_id and self.client_secret)
+
+        # Проверяем срок действия токена (если он известен)
+        current_time = int(time.time())
+        if self.token_expires_at and current_time > self.token_expires_at - margin:
+            return bool(self.client_id and (self.client_secret or self.token_store is not None))
+        return False
+
+    async def _ensure_valid_token(self):
+        """
+        Проверяет срок действия токена и обновляет при необходимости.
+        Одновременные вызовы ждут одно обновление, а не создают токен каждый сам.
+        """
+        if not self._needs_refresh():
+            return
+        started = time.perf_counter()
+        waited, error = True, None
+        try:
+            async with self._get_lock():
+                # Пока ждали блокировку, токен мог обновить другой вызов или другой процесс
+                if self._needs_refresh() and not self._load_stored_token() and self.client_id and self.client_secret:
+                    waited = False
+                    await self._create_token()
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            hooks = getattr(self.request_handler, "hooks", None)
+            if hooks:
+                call_hooks(hooks, "on_auth_refresh", {
+                    "account": self.client_id, "elapsed": time.perf_counter() - started,
+                    "waited": waited, "error": error
+                })
+
+    async def _create_token(self):
+        """
+        Создает новый токен доступа используя client credentials
+
+        Returns:
+            str: Новый токен доступа
+        """
+        if not (self.client_id and self.client_secret):
+            raise ValueError("client_id и client_secret требуются для создания токена")
+
+        url = f"{API_BASE_URL}/token/"
+        data = {
+            "grant_type": "client_credentials",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret
+        }
+
+        session = self.request_handler.get_session()
+        async with session.post(url, data=data) as response:
+            text = await response.text()
+            if response.status == 200:
+                response_data = await response.json(content_type=None)
+                self.access_token = response_data.get("access_token")
+                # Стандартное время жизни токена - 24 часа
+                self.token_expires_at = int(time.time()) + 86400
+                self.token_refreshed = True
+                self._save_token()
+                logger.info("Новый токен успешно получен")
+                return self.access_token
+            else:
+                logger.error(f"Ошибка при получении токена: {response.status} - {text}")
+                raise Exception(f"Ошибка при получении токена: {response.status} - {text}")
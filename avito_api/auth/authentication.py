@@ -1,14 +1,20 @@
 # /auth/authentication.py
 
 import requests
+import threading
 import time
 import logging
+from concurrent.futures import Future
+from .token_store import StoredTokenMixin
+from ..utils.hooks import call_hooks
+from ..config.settings import API_BASE_URL, TOKEN_REFRESH_MARGIN, BACKGROUND_REFRESH_MARGIN, BACKGROUND_REFRESH_INTERVAL
 
 # Получаем логгер
 logger = logging.getLogger('avito_api')
 
-class Authentication:
-    def __init__(self, client_id=None, client_secret=None, access_token=None, token_expires_at=None):
+class Authentication(StoredTokenMixin):
+    def __init__(self, client_id=None, client_secret=None, access_token=None, token_expires_at=None, session=None,
+                 token_store=None, hooks=None, lazy=False):
         '''
         Инициализация класса Authentication
         
@@ -17,22 +23,56 @@ class Authentication:
             client_secret (str): Секретный ключ клиента
             access_token (str): Существующий токен доступа
             token_expires_at (int): Время истечения токена в формате timestamp
+            session (requests.Session): Сессия с пулом соединений (по умолчанию - без пула)
+            token_store (TokenStore): Хранилище токенов, общее для нескольких процессов
+            hooks (list): Обработчики событий (on_auth_refresh получает время обновления токена)
+            lazy (bool): Не проверять токен при создании объекта: проверка или получение токена
+                выполняется при первом запросе (или в initialize())
         '''
+        # Сессия requests и модуль requests имеют одинаковые методы get/post
+        self.http = session if session is not None else requests
         self.client_id = client_id
         self.client_secret = client_secret
         self.access_token = access_token
         self.token_expires_at = token_expires_at
+        self.token_store = token_store
+        self.hooks = hooks if hooks is not None else []
         
         # Флаг обновления токена
         self.token_refreshed = False
-        
+
+        # Обновление токена выполняется одним потоком, остальные ждут его результат
+        self._lock = threading.Lock()
+        self._refresh_flight = None
+        self._refresh_thread = None
+        self._stop_refresh = threading.Event()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
         # Проверяем токен при инициализации
-        self._initialize_token()
-    
+        if not lazy:
+            self.initialize()
+
+    def initialize(self):
+        """
+        Проверяет или получает токен (однократно). При lazy=True вызывается перед первым запросом.
+        """
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            self._initialize_token()
+            self._initialized = True
+
     def _initialize_token(self):
         """
         Инициализирует или проверяет токен при создании объекта
         """
+        # Если в хранилище есть действующий токен, используем его без запроса к API
+        if self._load_stored_token():
+            return
+
         # Если токен предоставлен, проверяем его валидность
         if self.access_token:
             if not self._validate_token():
@@ -54,11 +94,11 @@ class Authentication:
             return False
             
         # URL для проверки валидности токена
-        url = "https://api.avito.ru/core/v1/accounts/self"
+        url = f"{API_BASE_URL}/core/v1/accounts/self"
         headers = {"Authorization": f"Bearer {self.access_token}"}
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.http.get(url, headers=headers, timeout=10)
             
             # Если токен валиден
             if response.status_code == 200:
@@ -86,6 +126,8 @@ class Authentication:
         Returns:
             dict: Заголовки для запроса
         """
+        self.initialize()
+
         # Проверяем срок действия токена
         self._ensure_valid_token()
         
@@ -96,18 +138,121 @@ class Authentication:
         """
         Проверяет срок действия токена и обновляет при необходимости
         """
+        if self._needs_refresh():
+            self._refresh_single_flight()
+
+    def _needs_refresh(self, margin=TOKEN_REFRESH_MARGIN):
+        """
+        Проверяет, нужно ли обновить токен
+
+        Args:
+            margin (int): За сколько секунд до истечения токен считается устаревшим
+
+        Returns:
+            bool: True если токен отсутствует или скоро истекает и его можно обновить
+        """
         # Если нет токена, пытаемся получить новый
-        if not self.access_token and self.client_id and self.client_secret:
-            self._create_token()
-            return
-            
+        if not self.access_token:
+            return bool(self.client_id and self.client_secret)
+
         # Проверяем срок действия токена (если он известен)
         current_time = int(time.time())
-        if self.token_expires_at and current_time > self.token_expires_at - 300:
-            # Если client_id и client_secret доступны, создаем новый токен
-            if self.client_id and self.client_secret:
-                self._create_token()
-    
+        if self.token_expires_at and current_time > self.token_expires_at - margin:
+            return bool(self.client_id and (self.client_secret or self.token_store is not None))
+        return False
+
+    def _refresh_single_flight(self, margin=TOKEN_REFRESH_MARGIN):
+        """
+        Обновляет токен так, что одновременно выполняется только одно обновление.
+        Потоки, пришедшие во время обновления, ждут его результат (или ту же ошибку).
+
+        Args:
+            margin (int): За сколько секунд до истечения токен считается устаревшим
+
+        Returns:
+            str: Актуальный токен доступа
+        """
+        with self._lock:
+            flight = self._refresh_flight
+            is_leader = flight is None
+            if is_leader:
+                # Пока ждали блокировку, токен мог обновить другой поток
+                if not self._needs_refresh(margin):
+                    return self.access_token
+                flight = self._refresh_flight = Future()
+
+        started = time.perf_counter()
+        error = None
+        try:
+            if not is_leader:
+                return flight.result()
+            try:
+                token = self._refresh_token(margin)
+                flight.set_result(token)
+                return token
+            except Exception as e:
+                flight.set_exception(e)
+                raise
+            finally:
+                with self._lock:
+                    self._refresh_flight = None
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            if self.hooks:
+                call_hooks(self.hooks, "on_auth_refresh", {
+                    "account": self.client_id, "elapsed": time.perf_counter() - started,
+                    "waited": not is_leader, "error": error
+                })
+
+    def _refresh_token(self, margin=TOKEN_REFRESH_MARGIN):
+        # Токен мог уже обновить другой процесс
+        if self._load_stored_token(margin):
+            return self.access_token
+        # Если client_id и client_secret доступны, создаем новый токен
+        if self.client_id and self.client_secret:
+            return self._create_token()
+        return self.access_token
+
+    def start_background_refresh(self, margin=BACKGROUND_REFRESH_MARGIN, interval=BACKGROUND_REFRESH_INTERVAL):
+        """
+        Запускает фоновый поток, который обновляет токен заранее, чтобы потоки с запросами
+        не ждали получения токена
+
+        Args:
+            margin (int): За сколько секунд до истечения обновлять токен
+            interval (int): Интервал проверки в секундах
+        """
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._stop_refresh.clear()
+
+        def _run():
+            # При отложенной проверке токен проверяется сразу в фоне, а не при первом запросе
+            try:
+                self.initialize()
+            except Exception as e:
+                logger.error(f"Ошибка фоновой проверки токена: {str(e)}")
+            while not self._stop_refresh.wait(interval):
+                try:
+                    if self._needs_refresh(margin):
+                        self._refresh_single_flight(margin)
+                except Exception as e:
+                    logger.error(f"Ошибка фонового обновления токена: {str(e)}")
+
+        self._refresh_thread = threading.Thread(target=_run, name="avito-token-refresh", daemon=True)
+        self._refresh_thread.start()
+
+    def stop_background_refresh(self):
+        """
+        Останавливает фоновое обновление токена
+        """
+        self._stop_refresh.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join()
+            self._refresh_thread = None
+
     def _create_token(self):
         """
         Создает новый токен доступа используя client credentials
@@ -118,20 +263,21 @@ class Authentication:
         if not (self.client_id and self.client_secret):
             raise ValueError("client_id и client_secret требуются для создания токена")
             
-        url = "https://api.avito.ru/token/"
+        url = f"{API_BASE_URL}/token/"
         data = {
             "grant_type": "client_credentials",
             "client_id": self.client_id,
             "client_secret": self.client_secret
         }
 
-        response = requests.post(url, data=data)
+        response = self.http.post(url, data=data)
         if response.status_code == 200:
             response_data = response.json()
             self.access_token = response_data.get("access_token")
             # Стандартное время жизни токена - 24 часа
             self.token_expires_at = int(time.time()) + 86400
             self.token_refreshed = True
+            self._save_token()
             logger.info("Новый токен успешно получен")
             return self.access_token
         else:
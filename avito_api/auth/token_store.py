@@ -0,0 +1,268 @@
+# /auth/token_store.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import logging
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: межпроцессная блокировка файла недоступна
+    fcntl = None
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+
+class TokenStore:
+    """
+    Интерфейс хранилища токенов.
+
+    Для своего хранилища (Redis, база данных и т.п.) достаточно унаследоваться
+    от TokenStore и реализовать load, save и delete.
+    """
+
+    def load(self, client_id):
+        """
+        Загружает сохраненный токен
+
+        Args:
+            client_id (str): ID клиента
+
+        Returns:
+            dict: {"access_token": str, "token_expires_at": int} или None, если токена нет
+        """
+        raise NotImplementedError
+
+    def save(self, client_id, access_token, token_expires_at):
+        """
+        Сохраняет токен для использования другими процессами
+
+        Args:
+            client_id (str): ID клиента
+            access_token (str): Токен доступа
+            token_expires_at (int): Время истечения токена (timestamp)
+        """
+        raise NotImplementedError
+
+    def delete(self, client_id):
+        """
+        Удаляет сохраненный токен
+
+        Args:
+            client_id (str): ID клиента
+        """
+        raise NotImplementedError
+
+    def load_valid(self, client_id, margin=300):
+        """
+        Загружает токен, если до его истечения осталось больше margin секунд
+
+        Args:
+            client_id (str): ID клиента
+            margin (int): Запас времени до истечения в секундах
+
+        Returns:
+            dict: Сохраненный токен или None
+        """
+        try:
+            stored = self.load(client_id)
+        except Exception as e:
+            logger.warning(f"Ошибка при чтении токена из хранилища: {str(e)}")
+            return None
+        if not stored or not stored.get("access_token"):
+            return None
+        expires_at = stored.get("token_expires_at")
+        if expires_at and int(time.time()) > expires_at - margin:
+            return None
+        return stored
+
+
+class FileTokenStore(TokenStore):
+    def __init__(self, path):
+        """
+        Хранилище токенов в JSON файле, общем для нескольких процессов
+
+        Args:
+            path (str): Путь к файлу с токенами
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        # Блокировка внутри процесса и, где доступно, между процессами
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.path + ".lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning(f"Файл токенов {self.path} поврежден и будет перезаписан")
+            return {}
+
+    def _write(self, tokens):
+        # Пишем во временный файл и атомарно заменяем, чтобы читатели не видели половину файла
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tokens-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(tokens, f)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, client_id):
+        with self._lock:
+            return self._read().get(str(client_id))
+
+    def save(self, client_id, access_token, token_expires_at):
+        with self._locked():
+            tokens = self._read()
+            tokens[str(client_id)] = {"access_token": access_token, "token_expires_at": token_expires_at}
+            self._write(tokens)
+
+    def delete(self, client_id):
+        with self._locked():
+            tokens = self._read()
+            if tokens.pop(str(client_id), None) is not None:
+                self._write(tokens)
+
+
+class SQLiteTokenStore(TokenStore):
+    def __init__(self, path):
+        """
+        Хранилище токенов в базе SQLite, общей для нескольких процессов
+
+        Args:
+            path (str): Путь к файлу базы данных
+        """
+        self.path = path
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS tokens ("
+                    "client_id TEXT PRIMARY KEY, "
+                    "access_token TEXT NOT NULL, "
+                    "token_expires_at INTEGER, "
+                    "updated_at INTEGER NOT NULL)"
+                )
+        finally:
+            conn.close()
+
+    def _connect(self):
+        # Отдельное соединение на операцию: безопасно для потоков и процессов
+        return sqlite3.connect(self.path, timeout=30)
+
+    def load(self, client_id):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT access_token, token_expires_at FROM tokens WHERE client_id = ?",
+                (str(client_id),)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return {"access_token": row[0], "token_expires_at": row[1]}
+
+    def save(self, client_id, access_token, token_expires_at):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO tokens (client_id, access_token, token_expires_at, updated_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (str(client_id), access_token, token_expires_at, int(time.time()))
+                )
+        finally:
+            conn.close()
+
+    def delete(self, client_id):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM tokens WHERE client_id = ?", (str(client_id),))
+        finally:
+            conn.close()
+
+
+class StoredTokenMixin:
+    """
+    Общая логика работы с хранилищем токенов для Authentication и AsyncAuthentication.
+    Ожидает атрибуты client_id, access_token, token_expires_at и token_store.
+    """
+
+    @property
+    def account(self):
+        """
+        Ключ аккаунта для кеша ответов, объединения запросов и ограничения частоты
+
+        Returns:
+            str: client_id, для аккаунта только с токеном - хеш токена, None - если аккаунт неизвестен
+        """
+        if self.client_id:
+            return self.client_id
+        if self.access_token:
+            # Аккаунты без client_id различаются по токену; сам токен в ключ не попадает
+            return "token:" + hashlib.sha256(self.access_token.encode()).hexdigest()[:16]
+        return None
+
+    def _load_stored_token(self, margin=300):
+        """
+        Загружает действующий токен из хранилища токенов
+
+        Args:
+            margin (int): Запас времени до истечения токена в секундах
+
+        Returns:
+            bool: True если токен загружен из хранилища
+        """
+        if self.token_store is None or not self.client_id:
+            return False
+
+        stored = self.token_store.load_valid(self.client_id, margin=margin)
+        if stored is None:
+            return False
+
+        # Переданный токен с более поздним сроком действия важнее сохраненного
+        stored_expires_at = stored.get("token_expires_at")
+        if self.access_token and self.token_expires_at and stored_expires_at and self.token_expires_at > stored_expires_at:
+            return False
+
+        self.access_token = stored["access_token"]
+        self.token_expires_at = stored_expires_at
+        logger.debug("Токен загружен из хранилища токенов")
+        return True
+
+    def _save_token(self):
+        """
+        Сохраняет текущий токен в хранилище для других процессов
+        """
+        if self.token_store is None or not self.client_id:
+            return
+        try:
+            self.token_store.save(self.client_id, self.access_token, self.token_expires_at)
+        except Exception as e:
+            logger.warning(f"Ошибка при сохранении токена в хранилище: {str(e)}")
@@ -0,0 +1,27 @@
+import importlib
+from .autoload_client import AutoloadClient
+
+# Остальные классы загружаются при первом обращении (PEP 562), чтобы создание клиента
+# не импортировало sqlite3
+_LAZY = {
+    'IdIndex': '.id_index',
+    'IdResolver': '.id_index',
+    'AsyncIdResolver': '.id_index',
+    'AutoloadOrchestrator': '.orchestrator',
+    'AsyncAutoloadOrchestrator': '.orchestrator',
+}
+
+__all__ = ['AutoloadClient', 'IdIndex', 'IdResolver', 'AsyncIdResolver', 'AutoloadOrchestrator',
+           'AsyncAutoloadOrchestrator']
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
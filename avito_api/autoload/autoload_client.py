@@ -1,36 +1,114 @@
 # /autoload/autoload_client.py
 
-from ..utils.request_handler import RequestHandler
-from ..config.settings import API_BASE_URL
+import logging
+import warnings
+from ..utils.base_client import BaseClient, AsyncBaseClient
+from ..utils.pagination import fetch_pages, async_fetch_pages, iter_pages, async_iter_pages, page_error, PageError
+from ..utils.chunking import chunked, map_concurrently, async_map_concurrently
+from ..models import Item, ReportItem, Fee
+from ..config.settings import API_BASE_URL, ID_QUERY_MAX_IDS, ID_MAPPING_WORKERS
 
-class AutoloadClient:
-    def __init__(self, auth):
-        self.auth = auth
+# Получаем логгер
+logger = logging.getLogger('avito_api')
 
-    def get_all_items(self, per_page=100, page=1, status='active'):
+class AutoloadClient(BaseClient):
+    def get_all_items(self, per_page=100, page=None, status='active', as_models=False):
         """
         Возвращает список объявлений авторизованного пользователя - статус, категорию и ссылку на сайте
+        :param per_page: Количество объявлений на странице
+        :param page: Устарел и не используется: объявления всегда загружаются со всех страниц
+        :param status: Фильтр по статусу объявлений
+        :param as_models: Возвращать модели Item вместо словарей
+        :return: Список объявлений или словарь с ошибкой (см. page_error), если страница не загрузилась
+        """
+        self._warn_page(page)
+        try:
+            return list(self.iter_all_items(per_page=per_page, status=status, prefetch=False, as_models=as_models))
+        except PageError as e:
+            return e.error
+
+    @staticmethod
+    def _warn_page(page):
+        if page is not None:
+            warnings.warn("Параметр page в get_all_items не используется и будет удален",
+                          DeprecationWarning, stacklevel=3)
+
+    def iter_all_items(self, per_page=100, status='active', prefetch=True, as_models=False):
+        """
+        Постранично отдает объявления авторизованного пользователя, не собирая весь список в памяти.
+        :param per_page: Количество объявлений на странице
+        :param status: Фильтр по статусу объявлений
+        :param prefetch: Загружать следующую страницу, пока обрабатывается текущая
+        :param as_models: Отдавать модели Item вместо словарей
+        :return: Итератор по объявлениям; страница с ошибкой прерывает итерацию исключением PageError
         """
         url = f"{API_BASE_URL}/core/v1/items"
-        headers = self.auth.get_headers()
-        page = 0
-        total_list = []
-        while True:
+
+        def fetch_page(page):
             params = {
                 "per_page": per_page,
                 "page": page,
                 "status": status
             }
-            response = RequestHandler.send_request(url, method="GET", headers=headers, params=params)
-            
-            if response['resources'] == []:
-                break
-            page += 1
-            total_list += response['resources']
-        return total_list
+            return self._send(url, method="GET", params=params)
+
+        get_items = self._get_resources
+        if as_models:
+            def get_items(response):
+                return self._to_models(self._get_resources(response), Item)
+
+        return self._iter_pages(fetch_page, get_items, prefetch=prefetch)
+
+    def iter_report_items(self, report_id, per_page=50, query=None, sections=None, prefetch=True, as_models=False):
+        """
+        Постранично отдает объявления из отчёта (report_id), не собирая весь список в памяти.
+        :param report_id: ID отчёта
+        :param per_page: Количество объявлений на странице
+        :param query: Фильтр по ID объявления
+        :param sections: Фильтр по разделам
+        :param prefetch: Загружать следующую страницу, пока обрабатывается текущая
+        :param as_models: Отдавать модели ReportItem вместо словарей
+        :return: Итератор по объявлениям отчёта; страница с ошибкой прерывает итерацию исключением PageError
+        """
+        url = f"{API_BASE_URL}/autoload/v2/reports/{report_id}/items"
+        params = {
+            "per_page": per_page,
+            "query": query,
+            "sections": sections
+        }
+        params = {k: v for k, v in params.items() if v is not None}
+
+        def fetch_page(page):
+            return self._send(url, method="GET", params={**params, "page": page})
+
+        def get_items(response):
+            if not self._is_page(response):
+                return None
+            return self._to_models(response['items'], ReportItem) if as_models else response['items']
+
+        def has_next(response, page):
+            return page < response['meta']['pages'] - 1
+
+        return self._iter_pages(fetch_page, get_items, has_next, prefetch=prefetch)
+
+    def _iter_pages(self, fetch_page, get_items, has_next=None, prefetch=True):
+        return iter_pages(fetch_page, get_items, has_next, prefetch=prefetch)
+
+    @staticmethod
+    def _to_models(items, model):
+        # Страница разбирается сразу после загрузки, и словари страницы не накапливаются в памяти
+        return None if items is None else model.from_list(items)
+
+    @staticmethod
+    def _get_resources(response):
+        # Ответ с ошибкой не содержит ключа 'resources'
+        if not response or 'resources' not in response:
+            return None
+        return response['resources']
 
     # def для autoload/v2/reports/{report_id}/items GET
-    def get_report_items(self, report_id, per_page=50, page=0, query=None, sections=None):
+    def get_report_items(self, report_id, per_page=50, page=0, query=None, sections=None, max_workers=1,
+                         as_models=False):
          
         """
         Получение всех total из всех страниц по идентификатору отчёта (report_id).
@@ -39,42 +117,60 @@ class AutoloadClient:
         :param per_page: Количество объявлений на странице (по умолчанию 50)
         :param query: Фильтр по ID объявления
         :param sections: Фильтр по разделам
-        :return: Список словарей с total из всех страниц или None в случае ошибки
+        :param max_workers: Сколько страниц загружать параллельно после первой (по умолчанию 1 - последовательно)
+        :param as_models: Возвращать модели ReportItem вместо словарей
+        :return: Список словарей с total из всех страниц или словарь с ошибкой, если страница не загрузилась
         """
         url = f"{API_BASE_URL}/autoload/v2/reports/{report_id}/items"
-        page = 0
-        total_list = []
 
-        while True:
-            # Параметры запроса
-            params = {
-                "per_page": per_page,
-                "page": page,
-                "query": query,
-                "sections": sections
-            }
+        # Параметры запроса
+        params = {
+            "per_page": per_page,
+            "query": query,
+            "sections": sections
+        }
+
+        # Очищаем параметры с None значениями
+        params = {k: v for k, v in params.items() if v is not None}
 
-            # Очищаем параметры с None значениями
-            params = {k: v for k, v in params.items() if v is not None}
-
-            # Выполнение запроса
-            headers = self.auth.get_headers()
-            response = RequestHandler.send_request(url, method="GET", headers=headers, params=params)
-
-            # Проверяем, что ответ не None и содержит ключ 'meta'
-            if response and 'meta' in response:
-                # Извлекаем значение 'total' из 'meta'
-                total = response['items']
-                # Добавляем total в список
-                total_list = total_list + total
-                # Проверяем, достигли ли мы последней страницы
-                if page >= response['meta']['pages'] - 1:
-                    break
-                page += 1
-            else:
-                break
+        return self._get_all_pages(url, params, "items", max_workers=max_workers,
+                                   model=ReportItem if as_models else None)
 
+    def _get_all_pages(self, url, params, items_key, max_workers=1, model=None):
+        """
+        Загружает первую страницу, затем остальные страницы по meta.pages и собирает элементы в порядке страниц.
+        :param url: URL метода с постраничной выдачей
+        :param params: Параметры запроса без номера страницы
+        :param items_key: Ключ списка элементов в ответе
+        :param max_workers: Сколько страниц загружать параллельно после первой
+        :param model: Класс модели, в которую разбираются элементы каждой страницы (None - словари)
+        :return: Список элементов из всех страниц или словарь с ошибкой (см. page_error)
+        """
+        def fetch_page(page):
+            return self._parse_page(self._send(url, method="GET", params={**params, "page": page}), items_key, model)
+
+        first = fetch_page(0)
+        if not self._is_page(first):
+            return page_error(0, first)
+
+        total_list = list(first[items_key])
+        responses = fetch_pages(fetch_page, first['meta']['pages'], self._is_page, max_workers=max_workers)
+        if isinstance(responses, dict):
+            return responses
+        for response in responses:
+            total_list.extend(response[items_key])
         return total_list
+
+    @classmethod
+    def _parse_page(cls, response, items_key, model):
+        if model is not None and cls._is_page(response):
+            response[items_key] = model.from_list(response[items_key])
+        return response
+
+    @staticmethod
+    def _is_page(response):
+        # Проверяем, что ответ не None и содержит ключ 'meta'
+        return bool(response) and 'meta' in response
     
     # def для autoload/v1/profile GET
     def get_profile(self):
@@ -83,8 +179,7 @@ class AutoloadClient:
         :return: Профиль или None в случае ошибки
         """
         url = f"{API_BASE_URL}/autoload/v1/profile"
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="GET", headers=headers)
+        return self._send(url, method="GET")
     
     # def для /autoload/v2/reports/items
     def get_report_items_idMobicom(self, query):
@@ -97,8 +192,7 @@ class AutoloadClient:
                 "query": query,
             }
         url = f"{API_BASE_URL}/autoload/v2/reports/items"
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="GET", headers=headers, params=params)
+        return self._send(url, method="GET", params=params)
 
     # def для autoload/v1/profile POST
     def create_or_update_profile(self, profile_data):
@@ -108,8 +202,7 @@ class AutoloadClient:
         :return: Результат операции или None в случае ошибки
         """
         url = f"{API_BASE_URL}/autoload/v1/profile"
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="POST", headers=headers, data=profile_data)
+        return self._send(url, method="POST", data=profile_data)
 
     # def для autoload/v1/upload POST
     def upload_file(self):
@@ -118,8 +211,7 @@ class AutoloadClient:
         :return: Результат операции или None в случае ошибки
         """
         url = f"{API_BASE_URL}/autoload/v1/upload"
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="POST", headers=headers)
+        return self._send(url, method="POST")
 
     # def для autoload/v2/items/ad_ids GET
     def get_ad_ids_by_avito_ids(self, query):
@@ -129,9 +221,8 @@ class AutoloadClient:
         :return: Список объявлений или None в случае ошибки
         """
         url = f"{API_BASE_URL}/autoload/v2/items/ad_ids"
-        headers = self.auth.get_headers()
         params = {"query": query}
-        return RequestHandler.send_request(url, method="GET", headers=headers, params=params)
+        return self._send(url, method="GET", params=params)
 
     # def для autoload/v2/items/avito_ids GET
     def get_avito_ids_by_ad_ids(self, query):
@@ -141,9 +232,62 @@ class AutoloadClient:
         :return: Список объявлений или None в случае ошибки
         """
         url = f"{API_BASE_URL}/autoload/v2/items/avito_ids"
-        headers = self.auth.get_headers()
         params = {"query": query}
-        return RequestHandler.send_request(url, method="GET", headers=headers, params=params)
+        return self._send(url, method="GET", params=params)
+
+    def get_all_ad_ids_by_avito_ids(self, avito_ids, chunk_size=ID_QUERY_MAX_IDS, max_workers=ID_MAPPING_WORKERS):
+        """
+        Получение ID объявлений из файла для любого количества ID на Авито.
+        :param avito_ids: Список идентификаторов объявлений на Авито
+        :param chunk_size: Количество ID в одном запросе (не больше 100)
+        :param max_workers: Количество одновременных запросов
+        :return: {"items": объявления из всех запросов}; части с ошибкой - в ключе "errors" ({"ids", "response"})
+        """
+        return self._collect_by_ids(self.get_ad_ids_by_avito_ids, avito_ids, chunk_size, max_workers)
+
+    def get_all_avito_ids_by_ad_ids(self, ad_ids, chunk_size=ID_QUERY_MAX_IDS, max_workers=ID_MAPPING_WORKERS):
+        """
+        Получение ID объявлений на Авито для любого количества ID из файла.
+        :param ad_ids: Список идентификаторов объявлений из файла
+        :param chunk_size: Количество ID в одном запросе (не больше 100)
+        :param max_workers: Количество одновременных запросов
+        :return: {"items": объявления из всех запросов}; части с ошибкой - в ключе "errors" ({"ids", "response"})
+        """
+        return self._collect_by_ids(self.get_avito_ids_by_ad_ids, ad_ids, chunk_size, max_workers)
+
+    def get_all_report_items_by_ad_ids(self, ad_ids, chunk_size=ID_QUERY_MAX_IDS, max_workers=ID_MAPPING_WORKERS):
+        """
+        Получение данных по любому количеству объявлений из файла (get_report_items_idMobicom частями).
+        :param ad_ids: Список идентификаторов объявлений из файла
+        :param chunk_size: Количество ID в одном запросе (не больше 100)
+        :param max_workers: Количество одновременных запросов
+        :return: {"items": объявления из всех запросов}; части с ошибкой - в ключе "errors" ({"ids", "response"})
+        """
+        return self._collect_by_ids(self.get_report_items_idMobicom, ad_ids, chunk_size, max_workers)
+
+    def _collect_by_ids(self, func, ids, chunk_size, max_workers):
+        chunks = chunked(ids, chunk_size)
+        responses = map_concurrently(func, self._id_queries(chunks), max_workers=max_workers)
+        return self._merge_items(responses, chunks)
+
+    @staticmethod
+    def _id_queries(chunks):
+        return [(",".join(str(i) for i in chunk),) for chunk in chunks]
+
+    @staticmethod
+    def _merge_items(responses, chunks):
+        items, errors = [], []
+        for chunk, response in zip(chunks, responses):
+            # Ответ с ошибкой не содержит ключа 'items'
+            if not response or 'items' not in response:
+                logger.error(f"Ошибка при сопоставлении ID объявлений: {response}")
+                errors.append({"ids": chunk, "response": response})
+                continue
+            items.extend(response['items'])
+        result = {"items": items}
+        if errors:
+            result["errors"] = errors
+        return result
 
     # def для autoload/v2/reports GET
     def get_reports(self, per_page=50, page=0, date_from=None, date_to=None):
@@ -156,7 +300,6 @@ class AutoloadClient:
         :return: Список отчетов или None в случае ошибки
         """
         url = f"{API_BASE_URL}/autoload/v2/reports"
-        headers = self.auth.get_headers()
         params = {
             "per_page": per_page,
             "page": page,
@@ -164,7 +307,7 @@ class AutoloadClient:
             "date_to": date_to,
         }
         params = {k: v for k, v in params.items() if v is not None}
-        return RequestHandler.send_request(url, method="GET", headers=headers, params=params)
+        return self._send(url, method="GET", params=params)
 
     # def для autoload/v2/reports/last_completed_report GET
     def get_last_completed_report(self):
@@ -173,8 +316,7 @@ class AutoloadClient:
         :return: Статистика или None в случае ошибки
         """
         url = f"{API_BASE_URL}/autoload/v2/reports/last_completed_report"
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="GET", headers=headers)
+        return self._send(url, method="GET")
 
     # def для autoload/v2/reports/{report_id} GET
     def get_report_by_id(self, report_id):
@@ -184,8 +326,7 @@ class AutoloadClient:
         :return: Статистика или None в случае ошибки
         """
         url = f"{API_BASE_URL}/autoload/v2/reports/{report_id}"
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="GET", headers=headers)
+        return self._send(url, method="GET")
 
     # def для autoload/v2/reports/{report_id}/items/fees GET
     def get_report_items_fees(self, report_id, per_page=100, page=0):
@@ -197,9 +338,89 @@ class AutoloadClient:
         :return: Информация о списаниях или None в случае ошибки
         """
         url = f"{API_BASE_URL}/autoload/v2/reports/{report_id}/items/fees"
-        headers = self.auth.get_headers()
         params = {
             "per_page": per_page,
             "page": page,
         }
-        return RequestHandler.send_request(url, method="GET", headers=headers, params=params)
\ No newline at end of file
+        return self._send(url, method="GET", params=params)
+
+    def iter_report_items_fees(self, report_id, per_page=100, prefetch=True, as_models=False):
+        """
+        Постранично отдает списания за объявления конкретной выгрузки, не собирая весь список в памяти.
+        :param report_id: ID отчёта
+        :param per_page: Количество объявлений на странице
+        :param prefetch: Загружать следующую страницу, пока обрабатывается текущая
+        :param as_models: Отдавать модели Fee вместо словарей
+        :return: Итератор по списаниям; страница с ошибкой прерывает итерацию исключением PageError
+        """
+        url = f"{API_BASE_URL}/autoload/v2/reports/{report_id}/items/fees"
+
+        def fetch_page(page):
+            return self._send(url, method="GET", params={"per_page": per_page, "page": page})
+
+        def get_items(response):
+            if not self._is_page(response):
+                return None
+            return self._to_models(response['fees'], Fee) if as_models else response['fees']
+
+        def has_next(response, page):
+            return page < response['meta']['pages'] - 1
+
+        return self._iter_pages(fetch_page, get_items, has_next, prefetch=prefetch)
+
+    def get_all_report_items_fees(self, report_id, per_page=100, max_workers=1, as_models=False):
+        """
+        Получение списаний за размещение объявлений со всех страниц конкретной выгрузки.
+        :param report_id: ID отчёта
+        :param per_page: Количество объявлений на странице
+        :param max_workers: Сколько страниц загружать параллельно после первой (по умолчанию 1 - последовательно)
+        :param as_models: Возвращать модели Fee вместо словарей
+        :return: Список списаний из всех страниц или словарь с ошибкой, если страница не загрузилась
+        """
+        url = f"{API_BASE_URL}/autoload/v2/reports/{report_id}/items/fees"
+        params = {
+            "per_page": per_page,
+        }
+        return self._get_all_pages(url, params, "fees", max_workers=max_workers, model=Fee if as_models else None)
+
+
+class AsyncAutoloadClient(AsyncBaseClient, AutoloadClient):
+    """
+    Асинхронная версия AutoloadClient: те же методы, возвращающие корутины
+    """
+
+    async def _collect_by_ids(self, func, ids, chunk_size, max_workers):
+        chunks = chunked(ids, chunk_size)
+        responses = await async_map_concurrently(func, self._id_queries(chunks), max_workers=max_workers)
+        return self._merge_items(responses, chunks)
+
+    async def get_all_items(self, per_page=100, page=None, status='active', as_models=False):
+        """
+        Возвращает список объявлений авторизованного пользователя - статус, категорию и ссылку на сайте
+        """
+        self._warn_page(page)
+        try:
+            return [item async for item in self.iter_all_items(per_page=per_page, status=status, prefetch=False,
+                                                               as_models=as_models)]
+        except PageError as e:
+            return e.error
+
+    def _iter_pages(self, fetch_page, get_items, has_next=None, prefetch=True):
+        return async_iter_pages(fetch_page, get_items, has_next, prefetch=prefetch)
+
+    async def _get_all_pages(self, url, params, items_key, max_workers=1, model=None):
+        async def fetch_page(page):
+            return self._parse_page(await self._send(url, method="GET", params={**params, "page": page}),
+                                    items_key, model)
+
+        first = await fetch_page(0)
+        if not self._is_page(first):
+            return page_error(0, first)
+
+        total_list = list(first[items_key])
+        responses = await async_fetch_pages(fetch_page, first['meta']['pages'], self._is_page, max_workers=max_workers)
+        if isinstance(responses, dict):
+            return responses
+        for response in responses:
+            total_list.extend(response[items_key])
+        return total_list
@@ -0,0 +1,308 @@
+# /autoload/id_index.py
+
+import sqlite3
+import time
+import logging
+from ..utils.pagination import PageError
+from ..config.settings import ID_QUERY_MAX_IDS, ID_MAPPING_WORKERS
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+# Сколько сопоставлений из отчета сохранять одной транзакцией
+_SAVE_BATCH = 1000
+
+
+class IdIndex:
+    def __init__(self, path):
+        """
+        Сопоставление ID объявлений из файла (ad_id) и ID на Авито (avito_id) в базе SQLite
+
+        Args:
+            path (str): Путь к файлу базы данных
+        """
+        self.path = path
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS id_map ("
+                    "account TEXT NOT NULL, "
+                    "ad_id TEXT NOT NULL, "
+                    "avito_id INTEGER NOT NULL, "
+                    "updated_at INTEGER NOT NULL, "
+                    "PRIMARY KEY (account, ad_id))"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS id_map_avito_id ON id_map (account, avito_id)")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS imported_reports ("
+                    "account TEXT NOT NULL, "
+                    "report_id INTEGER NOT NULL, "
+                    "imported_at INTEGER NOT NULL, "
+                    "PRIMARY KEY (account, report_id))"
+                )
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _lookup(self, account, column, key_column, keys):
+        result = {}
+        conn = self._connect()
+        try:
+            # Ограничение SQLite на количество параметров в запросе
+            for i in range(0, len(keys), 500):
+                part = keys[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT {key_column}, {column} FROM id_map "
+                    f"WHERE account = ? AND {key_column} IN ({','.join('?' * len(part))})",
+                    [str(account), *part]
+                ).fetchall()
+                result.update(rows)
+        finally:
+            conn.close()
+        return result
+
+    def avito_ids(self, account, ad_ids):
+        """
+        Returns:
+            dict: {ad_id: avito_id} для известных ad_id
+        """
+        return self._lookup(account, "avito_id", "ad_id", [str(i) for i in ad_ids])
+
+    def ad_ids(self, account, avito_ids):
+        """
+        Returns:
+            dict: {avito_id: ad_id} для известных avito_id
+        """
+        return self._lookup(account, "ad_id", "avito_id", [int(i) for i in avito_ids])
+
+    def save(self, account, pairs):
+        """
+        Сохраняет сопоставления
+
+        Args:
+            account (str): Ключ аккаунта (client_id)
+            pairs (iterable): Пары (ad_id, avito_id)
+
+        Returns:
+            int: Количество сохраненных пар
+        """
+        rows = [(str(account), str(ad_id), int(avito_id), int(time.time())) for ad_id, avito_id in pairs]
+        if not rows:
+            return 0
+        conn = self._connect()
+        try:
+            with conn:
+                # Объявление на Авито могло получить новый ad_id: старое сопоставление удаляется
+                conn.executemany(
+                    "DELETE FROM id_map WHERE account = ? AND avito_id = ? AND ad_id != ?",
+                    [(account, avito_id, ad_id) for account, ad_id, avito_id, _ in rows]
+                )
+                conn.executemany("INSERT OR REPLACE INTO id_map VALUES (?, ?, ?, ?)", rows)
+        finally:
+            conn.close()
+        return len(rows)
+
+    def is_imported(self, account, report_id):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT 1 FROM imported_reports WHERE account = ? AND report_id = ?", (str(account), int(report_id))
+            ).fetchone()
+        finally:
+            conn.close()
+        return row is not None
+
+    def mark_imported(self, account, report_id):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO imported_reports VALUES (?, ?, ?)",
+                    (str(account), int(report_id), int(time.time()))
+                )
+        finally:
+            conn.close()
+
+
+class ResolvedIds(dict):
+    """
+    Результат сопоставления {ID: ID}.
+    В failed - ID, которые не удалось запросить из-за ошибки API: их нет в словаре,
+    но это не значит, что таких объявлений нет на Авито.
+    """
+
+    def __init__(self, pairs=(), failed=()):
+        super().__init__(pairs)
+        self.failed = list(failed)
+
+
+def _pairs(items):
+    # Объявления без avito_id (еще не опубликованные) не сопоставляются
+    for item in items:
+        if item.get("ad_id") and item.get("avito_id"):
+            yield item["ad_id"], item["avito_id"]
+
+
+class IdResolver:
+    def __init__(self, autoload, index, chunk_size=ID_QUERY_MAX_IDS, max_workers=ID_MAPPING_WORKERS):
+        """
+        Сопоставление ad_id и avito_id с локальным индексом.
+
+        Известные сопоставления берутся из индекса без запроса к API, остальные
+        запрашиваются частями по chunk_size ID параллельно и сохраняются в индекс.
+        Индекс пополняется из отчетов автозагрузки (refresh_from_report).
+
+        Args:
+            autoload (AutoloadClient): Блок методов autoload аккаунта (client.autoload)
+            index: Путь к базе SQLite или объект IdIndex
+            chunk_size (int): Количество ID в одном запросе
+            max_workers (int): Количество одновременных запросов
+        """
+        self.autoload = autoload
+        self.index = IdIndex(index) if isinstance(index, str) else index
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+
+    @property
+    def account(self):
+        return self.autoload.auth.account
+
+    def avito_ids(self, ad_ids, refresh=False):
+        """
+        Возвращает ID на Авито по ID объявлений из файла
+
+        Args:
+            ad_ids (list): ID объявлений из файла
+            refresh (bool): Запросить все ID из API, не используя индекс
+
+        Returns:
+            ResolvedIds: {ad_id: avito_id}; ID, которых нет в API, отсутствуют в словаре,
+                ID из запросов с ошибкой - в атрибуте failed
+        """
+        ad_ids = [str(i) for i in ad_ids]
+        known = {} if refresh else self.index.avito_ids(self.account, ad_ids)
+        missing = [i for i in dict.fromkeys(ad_ids) if i not in known]
+        return self._resolve(self.autoload.get_all_avito_ids_by_ad_ids, known, missing, by_ad_id=True)
+
+    def ad_ids(self, avito_ids, refresh=False):
+        """
+        Возвращает ID объявлений из файла по ID на Авито
+
+        Args:
+            avito_ids (list): ID объявлений на Авито
+            refresh (bool): Запросить все ID из API, не используя индекс
+
+        Returns:
+            ResolvedIds: {avito_id: ad_id}; ID, которых нет в API, отсутствуют в словаре,
+                ID из запросов с ошибкой - в атрибуте failed
+        """
+        avito_ids = [int(i) for i in avito_ids]
+        known = {} if refresh else self.index.ad_ids(self.account, avito_ids)
+        missing = [i for i in dict.fromkeys(avito_ids) if i not in known]
+        return self._resolve(self.autoload.get_all_ad_ids_by_avito_ids, known, missing, by_ad_id=False)
+
+    def _resolve(self, fetch, known, missing, by_ad_id):
+        if not missing:
+            return ResolvedIds(known)
+        result = fetch(missing, chunk_size=self.chunk_size, max_workers=self.max_workers)
+        return self._complete(known, result, by_ad_id)
+
+    def _complete(self, known, result, by_ad_id):
+        pairs = list(_pairs(result["items"]))
+        self.index.save(self.account, pairs)
+        resolved = ResolvedIds(known)
+        for ad_id, avito_id in pairs:
+            if by_ad_id:
+                resolved[str(ad_id)] = int(avito_id)
+            else:
+                resolved[int(avito_id)] = str(ad_id)
+        # ID из части с ошибкой могли найтись в другом ответе (повтор ID в запросе)
+        resolved.failed = [
+            i for error in result.get("errors", ()) for i in error["ids"] if i not in resolved
+        ]
+        return resolved
+
+    def refresh_from_report(self, report_id=None, per_page=100, force=False):
+        """
+        Пополняет индекс сопоставлениями из отчета автозагрузки.
+        Уже загруженные отчеты пропускаются. Если страница отчета не загрузилась, сопоставления
+        с прочитанных страниц сохраняются, но отчет не отмечается загруженным и при следующем
+        вызове загружается заново.
+
+        Args:
+            report_id (int): ID отчета (по умолчанию - последний завершенный)
+            per_page (int): Количество объявлений на странице отчета
+            force (bool): Загрузить отчет повторно
+
+        Returns:
+            int: Количество сохраненных сопоставлений или словарь с ошибкой страницы (см. page_error)
+        """
+        if report_id is None:
+            report_id = self._report_id(self.autoload.get_last_completed_report())
+            if report_id is None:
+                return 0
+        if not force and self.index.is_imported(self.account, report_id):
+            return 0
+
+        saved, batch = 0, []
+        try:
+            for pair in _pairs(self.autoload.iter_report_items(report_id, per_page=per_page)):
+                batch.append(pair)
+                if len(batch) >= _SAVE_BATCH:
+                    saved += self.index.save(self.account, batch)
+                    batch = []
+        except PageError as e:
+            return self._import_failed(report_id, saved + self.index.save(self.account, batch), e)
+        return self._imported(report_id, saved + self.index.save(self.account, batch))
+
+    def _imported(self, report_id, saved):
+        self.index.mark_imported(self.account, report_id)
+        logger.info(f"Индекс ID: из отчета {report_id} сохранено {saved} сопоставлений")
+        return saved
+
+    @staticmethod
+    def _import_failed(report_id, saved, error):
+        logger.error(f"Индекс ID: отчет {report_id} загружен не полностью (сохранено {saved} сопоставлений)")
+        return error.error
+
+    @staticmethod
+    def _report_id(report):
+        if not report or "error" in report:
+            logger.error(f"Не удалось получить последний завершенный отчет: {report}")
+            return None
+        return report.get("report_id") or report.get("id")
+
+
+class AsyncIdResolver(IdResolver):
+    """
+    Асинхронная версия IdResolver для AsyncAutoloadClient
+    """
+
+    async def _resolve(self, fetch, known, missing, by_ad_id):
+        if not missing:
+            return known
+        items = await fetch(missing, chunk_size=self.chunk_size, max_workers=self.max_workers)
+        return self._complete(known, items, by_ad_id)
+
+    async def refresh_from_report(self, report_id=None, per_page=100, force=False):
+        if report_id is None:
+            report_id = self._report_id(await self.autoload.get_last_completed_report())
+            if report_id is None:
+                return 0
+        if not force and self.index.is_imported(self.account, report_id):
+            return 0
+
+        saved, batch = 0, []
+        try:
+            async for item in self.autoload.iter_report_items(report_id, per_page=per_page):
+                batch.extend(_pairs((item,)))
+                if len(batch) >= _SAVE_BATCH:
+                    saved += self.index.save(self.account, batch)
+                    batch = []
+        except PageError as e:
+            return self._import_failed(report_id, saved + self.index.save(self.account, batch), e)
+        return self._imported(report_id, saved + self.index.save(self.account, batch))
@@ -0,0 +1,262 @@
+# /autoload/orchestrator.py
+
+import time
+import random
+import asyncio
+import logging
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from ..config.settings import (
+    AUTOLOAD_POLL_MIN, AUTOLOAD_POLL_MAX, AUTOLOAD_POLL_FACTOR, AUTOLOAD_EXPECTED_SHARE, AUTOLOAD_TIMEOUT,
+    AUTOLOAD_FETCH_WORKERS
+)
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+# Случайное отклонение паузы между опросами, чтобы опросы многих аккаунтов не совпадали
+POLL_JITTER = 0.1
+
+
+def _parse_time(value):
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def expected_duration(report):
+    """
+    Returns:
+        float: Длительность обработки отчета в секундах (по started_at и finished_at) или None
+    """
+    if not isinstance(report, dict) or not report.get("started_at") or not report.get("finished_at"):
+        return None
+    started, finished = _parse_time(report["started_at"]), _parse_time(report["finished_at"])
+    if started is None or finished is None or started.tzinfo is None or finished.tzinfo is None:
+        return None
+    seconds = (finished - started).total_seconds()
+    return seconds if seconds > 0 else None
+
+
+class AutoloadOrchestrator:
+    def __init__(self, poll_min=AUTOLOAD_POLL_MIN, poll_max=AUTOLOAD_POLL_MAX, poll_factor=AUTOLOAD_POLL_FACTOR,
+                 expected_share=AUTOLOAD_EXPECTED_SHARE, timeout=AUTOLOAD_TIMEOUT, max_workers=AUTOLOAD_FETCH_WORKERS):
+        """
+        Запуск автозагрузки и получение ее результата одним вызовом.
+
+        Перед запуском запоминается последний завершенный отчет (get_last_completed_report),
+        затем вызывается upload_file и опрашивается get_last_completed_report, пока не появится новый отчет.
+        Первый опрос откладывается на expected_share от длительности прошлой выгрузки, дальше пауза
+        между опросами растет от poll_min до poll_max. После завершения объявления и списания отчета
+        загружаются одновременно.
+
+        Args:
+            poll_min (float): Минимальная пауза между опросами в секундах
+            poll_max (float): Максимальная пауза между опросами в секундах
+            poll_factor (float): Во сколько раз растет пауза после каждого опроса
+            expected_share (float): Доля длительности прошлой выгрузки, через которую выполняется первый опрос
+            timeout (float): Сколько секунд ждать завершения выгрузки
+            max_workers (int): Сколько страниц объявлений и списаний загружать параллельно
+        """
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.poll_factor = poll_factor
+        self.expected_share = expected_share
+        self.timeout = timeout
+        self.max_workers = max_workers
+
+    def _delays(self, expected):
+        if expected:
+            yield max(self.poll_min, expected * self.expected_share)
+        delay = self.poll_min
+        while True:
+            yield delay * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+            delay = min(self.poll_max, delay * self.poll_factor)
+
+    @staticmethod
+    def _report_id(report):
+        if isinstance(report, dict) and "error" not in report:
+            return report.get("report_id", report.get("id"))
+        return None
+
+    @classmethod
+    def _new_result(cls, baseline):
+        """
+        Returns:
+            dict: Начальный результат выгрузки; если прошлый отчет не получен, ошибка - в "errors"
+        """
+        result = {"report_id": None, "status": None, "report": None, "items": None, "fees": None,
+                  "errors": {}, "polls": 0, "elapsed": 0.0, "baseline_report_id": cls._report_id(baseline)}
+        # 404 - у аккаунта еще нет завершенных выгрузок; при другой ошибке новый отчет нельзя отличить от прошлого
+        if result["baseline_report_id"] is None and not (isinstance(baseline, dict) and baseline.get("status_code") == 404):
+            logger.error(f"Ошибка при получении последнего отчета автозагрузки: {baseline}")
+            result["errors"]["baseline"] = baseline
+        return result
+
+    @staticmethod
+    def _uploaded(result, response):
+        if isinstance(response, dict) and "error" in response:
+            logger.error(f"Ошибка при запуске автозагрузки: {response}")
+            result["errors"]["upload"] = response
+            return False
+        return True
+
+    def _check(self, result, report):
+        """
+        Returns:
+            bool: True, если появился новый завершенный отчет
+        """
+        result["polls"] += 1
+        report_id = self._report_id(report)
+        if report_id is None:
+            # Ошибка опроса не прерывает ожидание: следующий опрос будет через обычную паузу
+            logger.warning(f"Ошибка при опросе отчета автозагрузки: {report}")
+            result["errors"]["poll"] = report
+            return False
+        if report_id == result["baseline_report_id"]:
+            return False
+        result["errors"].pop("poll", None)
+        result.update(report_id=report_id, status=report.get("status"), report=report)
+        return True
+
+    def _timed_out(self, result):
+        logger.error(f"Автозагрузка не завершилась за {self.timeout} с")
+        result["errors"]["timeout"] = {"error": f"Отчет автозагрузки не получен за {self.timeout} с"}
+        return result
+
+    @staticmethod
+    def _move_page_errors(result):
+        # Если страница отчета не загрузилась, вместо списка возвращается ошибка
+        for name in ("items", "fees"):
+            if isinstance(result[name], dict):
+                result["errors"][name] = result[name]
+                result[name] = None
+
+    def _sleep(self, delay, deadline):
+        time.sleep(max(0.0, min(delay, deadline - time.monotonic())))
+
+    def run(self, autoload, upload=True, fetch_items=True, fetch_fees=True, sections=None, as_models=False):
+        """
+        Запускает автозагрузку, дожидается отчета и загружает его объявления и списания
+
+        Args:
+            autoload (AutoloadClient): Блок методов autoload (client.autoload)
+            upload (bool): Запустить выгрузку (False - только дождаться следующего отчета)
+            fetch_items (bool): Загрузить объявления отчета
+            fetch_fees (bool): Загрузить списания за объявления отчета
+            sections (str): Фильтр объявлений по разделам
+            as_models (bool): Возвращать модели ReportItem и Fee вместо словарей
+
+        Returns:
+            dict: {"report_id", "status", "report": отчет, "items": объявления, "fees": списания,
+                   "errors": {"baseline"/"upload"/"poll"/"timeout"/"items"/"fees": ошибка}, "polls": количество опросов,
+                   "elapsed": секунд с запуска, "baseline_report_id": прошлый отчет}
+        """
+        started = time.monotonic()
+        deadline = started + self.timeout
+        baseline = autoload.get_last_completed_report()
+        result = self._new_result(baseline)
+        if result["errors"] or (upload and not self._uploaded(result, autoload.upload_file())):
+            return result
+
+        for delay in self._delays(expected_duration(baseline)):
+            if time.monotonic() >= deadline:
+                return self._timed_out(result)
+            self._sleep(delay, deadline)
+            if self._check(result, autoload.get_last_completed_report()):
+                break
+
+        logger.info(f"Автозагрузка завершена: отчет {result['report_id']}, статус {result['status']}, "
+                    f"опросов {result['polls']}")
+        report_id = result["report_id"]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            items = executor.submit(autoload.get_report_items, report_id, sections=sections,
+                                    max_workers=self.max_workers, as_models=as_models) if fetch_items else None
+            fees = executor.submit(autoload.get_all_report_items_fees, report_id, max_workers=self.max_workers,
+                                   as_models=as_models) if fetch_fees else None
+            result["items"] = items.result() if items is not None else None
+            result["fees"] = fees.result() if fees is not None else None
+        self._move_page_errors(result)
+        result["elapsed"] = time.monotonic() - started
+        return result
+
+    def run_many(self, pool, keys=None, max_workers=None, **options):
+        """
+        Запускает автозагрузку для нескольких аккаунтов пула одновременно
+
+        Args:
+            pool (AccountPool): Пул аккаунтов
+            keys (list): Ключи аккаунтов (по умолчанию - все аккаунты пула)
+            max_workers (int): Количество аккаунтов, обрабатываемых одновременно
+            **options: Параметры run (upload, fetch_items, fetch_fees, sections, as_models)
+
+        Returns:
+            dict: {ключ: {"result": результат run или None, "error": текст ошибки или None}}
+        """
+        return pool.map(lambda client: self.run(client.autoload, **options), keys=keys, max_workers=max_workers)
+
+
+class AsyncAutoloadOrchestrator(AutoloadOrchestrator):
+    """
+    Асинхронная версия AutoloadOrchestrator для AsyncAutoloadClient
+    """
+
+    async def _sleep(self, delay, deadline):
+        await asyncio.sleep(max(0.0, min(delay, deadline - time.monotonic())))
+
+    async def run(self, autoload, upload=True, fetch_items=True, fetch_fees=True, sections=None, as_models=False):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        baseline = await autoload.get_last_completed_report()
+        result = self._new_result(baseline)
+        if result["errors"] or (upload and not self._uploaded(result, await autoload.upload_file())):
+            return result
+
+        for delay in self._delays(expected_duration(baseline)):
+            if time.monotonic() >= deadline:
+                return self._timed_out(result)
+            await self._sleep(delay, deadline)
+            if self._check(result, await autoload.get_last_completed_report()):
+                break
+
+        logger.info(f"Автозагрузка завершена: отчет {result['report_id']}, статус {result['status']}, "
+                    f"опросов {result['polls']}")
+        report_id = result["report_id"]
+
+        async def skip():
+            return None
+
+        result["items"], result["fees"] = await asyncio.gather(
+            autoload.get_report_items(report_id, sections=sections, max_workers=self.max_workers, as_models=as_models)
+            if fetch_items else skip(),
+            autoload.get_all_report_items_fees(report_id, max_workers=self.max_workers, as_models=as_models)
+            if fetch_fees else skip()
+        )
+        self._move_page_errors(result)
+        result["elapsed"] = time.monotonic() - started
+        return result
+
+    async def run_many(self, autoloads, max_workers=None, **options):
+        """
+        Запускает автозагрузку для нескольких аккаунтов одновременно
+
+        Args:
+            autoloads (dict): {ключ аккаунта: AsyncAutoloadClient}
+            max_workers (int): Количество аккаунтов, обрабатываемых одновременно (None - все сразу)
+            **options: Параметры run
+
+        Returns:
+            dict: {ключ: {"result": результат run или None, "error": текст ошибки или None}}
+        """
+        semaphore = asyncio.Semaphore(max_workers or max(1, len(autoloads)))
+
+        async def _call(key, autoload):
+            async with semaphore:
+                try:
+                    return key, {"result": await self.run(autoload, **options), "error": None}
+                except Exception as e:
+                    logger.error(f"Ошибка при обработке аккаунта {key}: {str(e)}")
+                    return key, {"result": None, "error": str(e)}
+
+        return dict(await asyncio.gather(*[_call(key, autoload) for key, autoload in autoloads.items()]))
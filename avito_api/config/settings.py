@@ -1,3 +1,109 @@
 # /config/settings.py
-API_BASE_URL = "https://api.avito.ru"
+import os
+
+# Адрес API можно переопределить переменной окружения (например, для локального mock-сервера)
+API_BASE_URL = os.environ.get("AVITO_API_BASE_URL", "https://api.avito.ru").rstrip("/")
 TIMEOUT = 30
+
+# Пул соединений: количество кешируемых пулов по хостам и соединений на один хост
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+
+# Асинхронный клиент: общий лимит соединений и одновременно выполняемых запросов
+ASYNC_POOL_LIMIT = 100
+ASYNC_MAX_CONCURRENCY = 100
+
+# Пул аккаунтов: количество потоков для параллельного обхода аккаунтов
+ACCOUNT_POOL_WORKERS = 16
+
+# Токены: за сколько секунд до истечения обновлять токен перед запросом и в фоновом потоке
+TOKEN_REFRESH_MARGIN = 300
+BACKGROUND_REFRESH_MARGIN = 900
+BACKGROUND_REFRESH_INTERVAL = 60
+
+# Ограничение частоты запросов по группам методов: (запросов в секунду, размер пачки)
+RATE_LIMITS = {
+    "messenger": (5, 10),
+    "core": (10, 20),
+    "stats": (2, 5),
+    "autoload": (5, 10),
+    "stock-management": (5, 10),
+    "default": (10, 20),
+}
+# Сколько раз повторять запрос, получивший 429, после ожидания
+RATE_LIMIT_MAX_REQUEUES = 5
+
+# Повтор запросов: количество попыток и экспоненциальная задержка между ними (секунды)
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_MAX_BACKOFF = 30
+
+# Кеш ответов: время жизни по шаблонам методов (секунды) и максимальное количество записей
+CACHE_TTLS = {
+    "/core/v1/accounts/self": 3600,
+    "/core/v1/accounts/{user_id}/items/{item_id}/": 60,
+    "/core/v1/accounts/{user_id}/vas/prices": 600,
+    "/autoload/v1/profile": 600,
+    "/autoload/v2/reports/{report_id}": 3600,
+}
+CACHE_MAXSIZE = 1024
+
+# Массовое обновление: остатков в одном запросе stock-management и параллельных запросов цен
+STOCK_BATCH_SIZE = 200
+BULK_PRICE_WORKERS = 8
+
+# Статистика объявлений и звонков: объявлений и дней в одном запросе, параллельных запросов
+STATS_MAX_ITEM_IDS = 200
+STATS_MAX_DAYS = 270
+STATS_WORKERS = 4
+
+# Сопоставление ID объявлений: ID в одном запросе и параллельных запросов
+ID_QUERY_MAX_IDS = 100
+ID_MAPPING_WORKERS = 4
+
+# Синхронизация мессенджера: количество чатов, синхронизируемых одновременно
+MESSENGER_SYNC_WORKERS = 4
+
+# Прием webhook-уведомлений: размер очереди событий, обработчиков и таймауты (секунды)
+WEBHOOK_QUEUE_SIZE = 1000
+WEBHOOK_WORKERS = 4
+WEBHOOK_ENQUEUE_TIMEOUT = 5
+WEBHOOK_READ_TIMEOUT = 30
+WEBHOOK_MAX_BODY_SIZE = 1024 * 1024
+
+# Метрики: границы гистограммы времени ответа (секунды)
+METRICS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Выгрузка в CSV/Parquet: строк в буфере до записи (одна группа строк Parquet)
+EXPORT_BATCH_ROWS = 50000
+
+# Зеркало каталога: объявлений на странице, синхронизируемые статусы, запас по дате изменений (дни)
+# и интервал полной синхронизации (секунды)
+CATALOG_PAGE_SIZE = 100
+CATALOG_STATUSES = "active,old,removed,blocked,rejected"
+CATALOG_SYNC_OVERLAP_DAYS = 1
+CATALOG_FULL_RESYNC_INTERVAL = 7 * 24 * 3600
+
+# Загрузка файлов: размер читаемой с диска части тела multipart (байты)
+MULTIPART_CHUNK_SIZE = 64 * 1024
+
+# Загрузка изображений мессенджера: одновременных загрузок и время жизни ID изображения в кеше (секунды, None - без ограничения)
+IMAGE_UPLOAD_WORKERS = 4
+IMAGE_CACHE_TTL = None
+
+# Голосовые сообщения: ID в одном запросе getVoiceFiles, одновременных загрузок, размер части файла (байты),
+# максимальный размер файла (байты) и количество попыток загрузки
+VOICE_IDS_PER_REQUEST = 100
+VOICE_DOWNLOAD_WORKERS = 4
+VOICE_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+VOICE_MAX_BYTES = 50 * 1024 * 1024
+VOICE_DOWNLOAD_ATTEMPTS = 3
+
+# Запуск автозагрузки: пауза между опросами отчета (секунды) и ее рост, доля длительности прошлой выгрузки
+# до первого опроса, время ожидания отчета (секунды) и параллельных запросов страниц объявлений и списаний
+AUTOLOAD_POLL_MIN = 10
+AUTOLOAD_POLL_MAX = 300
+AUTOLOAD_POLL_FACTOR = 1.5
+AUTOLOAD_EXPECTED_SHARE = 0.8
+AUTOLOAD_TIMEOUT = 4 * 3600
+AUTOLOAD_FETCH_WORKERS = 4
@@ -0,0 +1,356 @@
+# /export.py
+"""
+Потоковая выгрузка статистики и отчетов автозагрузки в CSV или Parquet.
+
+Строки раскладываются по колонкам (array.array для чисел, список для строк) и записываются
+пачками по batch_rows, поэтому в памяти одновременно находится не больше одной пачки.
+Для Parquet нужен pyarrow (pip install "avito_api[parquet]"); если установлен NumPy,
+числовые колонки передаются в pyarrow без копирования.
+"""
+
+import csv
+import logging
+from array import array
+from .utils.chunking import chunked, map_concurrently
+from .utils.pagination import PageError
+from .config.settings import EXPORT_BATCH_ROWS, STATS_MAX_ITEM_IDS, STATS_MAX_DAYS, STATS_WORKERS
+
+try:
+    import numpy
+except ImportError:  # NumPy ускоряет передачу колонок в pyarrow, но не обязателен
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pyarrow нужен только для выгрузки в Parquet
+    pyarrow = None
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+INT = "int"
+FLOAT = "float"
+STR = "str"
+
+# Схемы выгрузки: (колонка, тип, ключ или путь к значению в записи API)
+STATS_SCHEMA = (
+    ("item_id", INT, "itemId"),
+    ("date", STR, "date"),
+    ("uniq_views", INT, "uniqViews"),
+    ("uniq_contacts", INT, "uniqContacts"),
+    ("uniq_favorites", INT, "uniqFavorites"),
+)
+
+CALLS_STATS_SCHEMA = (
+    ("item_id", INT, "itemId"),
+    ("date", STR, "date"),
+    ("calls", INT, "calls"),
+    ("answered_calls", INT, "answeredCalls"),
+    ("new_calls", INT, "newCalls"),
+    ("new_answered_calls", INT, "newAnsweredCalls"),
+)
+
+REPORT_ITEMS_SCHEMA = (
+    ("ad_id", STR, "ad_id"),
+    ("avito_id", INT, "avito_id"),
+    ("url", STR, "url"),
+    ("avito_status", STR, "avito_status"),
+    ("avito_date_end", STR, "avito_date_end"),
+    ("feed_name", STR, "feed_name"),
+    ("section_slug", STR, ("section", "slug")),
+    ("section_title", STR, ("section", "title")),
+    ("messages_count", INT, lambda row: len(row.get("messages") or ())),
+    ("message_codes", STR, lambda row: ",".join(str(m.get("code")) for m in row.get("messages") or ()) or None),
+)
+
+FEES_SCHEMA = (
+    ("ad_id", STR, "ad_id"),
+    ("avito_id", INT, "avito_id"),
+    ("amount", FLOAT, "amount"),
+    ("fees_total", FLOAT, lambda row: sum(f.get("amount") or 0 for f in row.get("fees") or ()) if row.get("fees") else None),
+)
+
+
+def _getter(path):
+    if callable(path):
+        return path
+    if isinstance(path, str):
+        return lambda row: row.get(path)
+
+    def get(row):
+        for key in path:
+            if row is None:
+                return None
+            row = row.get(key)
+        return row
+    return get
+
+
+class _Column:
+    def __init__(self, name, kind, path):
+        self.name = name
+        self.kind = kind
+        self.get = _getter(path)
+        self.reset()
+
+    def reset(self):
+        if self.kind == STR:
+            self.values = []
+        else:
+            self.values = array("q" if self.kind == INT else "d")
+        # 1 - значения нет (null)
+        self.nulls = bytearray()
+
+    def append(self, row):
+        value = self.get(row)
+        if self.kind == STR:
+            self.values.append(None if value is None else str(value))
+            return
+        try:
+            value = (int if self.kind == INT else float)(value)
+            null = 0
+        except (TypeError, ValueError):
+            value, null = 0, 1
+        self.values.append(value)
+        self.nulls.append(null)
+
+    def to_list(self):
+        # Значения для CSV: None вместо пропущенных чисел
+        if self.kind == STR or 1 not in self.nulls:
+            return self.values
+        return [None if null else value for value, null in zip(self.values, self.nulls)]
+
+    def to_arrow(self):
+        arrow_type = {INT: pyarrow.int64(), FLOAT: pyarrow.float64(), STR: pyarrow.string()}[self.kind]
+        if self.kind == STR:
+            return pyarrow.array(self.values, type=arrow_type)
+        mask = None
+        if numpy is not None:
+            # Колонка передается в pyarrow без поэлементного копирования
+            values = numpy.frombuffer(self.values, dtype=numpy.int64 if self.kind == INT else numpy.float64)
+            if 1 in self.nulls:
+                mask = numpy.frombuffer(self.nulls, dtype=numpy.bool_)
+            return pyarrow.array(values, type=arrow_type, mask=mask)
+        return pyarrow.array(self.to_list(), type=arrow_type)
+
+
+class _CsvSink:
+    def __init__(self, path, names, delimiter=","):
+        self._file = open(path, "w", newline="", encoding="utf-8") if isinstance(path, str) else path
+        self._owns_file = isinstance(path, str)
+        self._writer = csv.writer(self._file, delimiter=delimiter)
+        self._writer.writerow(names)
+
+    def write(self, columns):
+        self._writer.writerows(zip(*[column.to_list() for column in columns]))
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class _ParquetSink:
+    def __init__(self, path, columns, compression="snappy"):
+        if pyarrow is None:
+            raise ImportError("Для выгрузки в Parquet требуется pyarrow: pip install pyarrow")
+        types = {INT: pyarrow.int64(), FLOAT: pyarrow.float64(), STR: pyarrow.string()}
+        self.schema = pyarrow.schema([(column.name, types[column.kind]) for column in columns])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression=compression)
+
+    def write(self, columns):
+        # Каждая пачка записывается отдельной группой строк
+        table = pyarrow.Table.from_arrays([column.to_arrow() for column in columns], schema=self.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+
+
+class Exporter:
+    def __init__(self, path, schema, format=None, batch_rows=EXPORT_BATCH_ROWS, **options):
+        """
+        Потоковая запись строк в CSV или Parquet с плоской схемой
+
+        Пример:
+            with Exporter("report.parquet", REPORT_ITEMS_SCHEMA) as exporter:
+                exporter.write_rows(client.autoload.iter_report_items(report_id))
+
+        Args:
+            path: Путь к файлу (или открытый текстовый файл для CSV)
+            schema (tuple): Колонки (имя, тип INT/FLOAT/STR, ключ, путь-кортеж или функция row -> значение)
+            format (str): "csv" или "parquet" (по умолчанию - по расширению файла)
+            batch_rows (int): Сколько строк накапливать перед записью
+            **options: delimiter для CSV, compression для Parquet
+        """
+        if format is None:
+            format = "parquet" if isinstance(path, str) and path.endswith((".parquet", ".pq")) else "csv"
+        self.columns = [_Column(name, kind, path_) for name, kind, path_ in schema]
+        self.batch_rows = batch_rows
+        self.rows = 0
+        self._pending = 0
+        if format == "parquet":
+            self._sink = _ParquetSink(path, self.columns, **options)
+        elif format == "csv":
+            self._sink = _CsvSink(path, [column.name for column in self.columns], **options)
+        else:
+            raise ValueError(f"Неизвестный формат выгрузки: {format}")
+
+    def write_row(self, row):
+        """
+        Добавляет строку (словарь API или модель) в буфер
+        """
+        for column in self.columns:
+            column.append(row)
+        self._pending += 1
+        if self._pending >= self.batch_rows:
+            self.flush()
+
+    def write_rows(self, rows):
+        """
+        Добавляет строки из итератора, записывая их пачками
+
+        Returns:
+            int: Количество добавленных строк
+        """
+        count = 0
+        for row in rows:
+            self.write_row(row)
+            count += 1
+        return count
+
+    def flush(self):
+        """
+        Записывает накопленные строки и очищает буферы
+        """
+        if not self._pending:
+            return
+        self._sink.write(self.columns)
+        self.rows += self._pending
+        self._pending = 0
+        for column in self.columns:
+            column.reset()
+
+    def close(self):
+        self.flush()
+        self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def iter_stats_rows(response, rows_key="stats"):
+    """
+    Разворачивает ответ статистики ({"result": {"items": [{"itemId", rows_key: [...]}]}}) в плоские строки
+
+    Yields:
+        dict: Строка статистики с ключом itemId
+    """
+    for item in ((response or {}).get("result") or {}).get("items") or ():
+        item_id = item.get("itemId")
+        for row in item.get(rows_key) or ():
+            yield {"itemId": item_id, **row}
+
+
+def export_items_stats(item_client, path, user_id, date_from, date_to, item_ids, period_grouping="day", calls=False,
+                       chunk_size=STATS_MAX_ITEM_IDS, max_days=STATS_MAX_DAYS, max_workers=STATS_WORKERS, **options):
+    """
+    Выгружает статистику объявлений (или звонков при calls=True) за любой период по любому количеству объявлений.
+
+    Запросы делятся на части как в get_all_items_stats, но ответы записываются сразу по мере получения
+    (по max_workers частей за раз), а не собираются в один ответ. Строки упорядочены по частям запроса.
+
+    Args:
+        item_client (ItemClient): Блок методов item (client.item)
+        path: Путь к файлу CSV или Parquet
+        user_id (int): ID пользователя
+        date_from (str): Начальная дата периода
+        date_to (str): Конечная дата периода
+        item_ids (list): ID объявлений
+        period_grouping (str): Группировка статистики (day, week, month)
+        calls (bool): Выгружать статистику звонков
+        chunk_size (int): Объявлений в одном запросе
+        max_days (int): Дней в одном запросе
+        max_workers (int): Количество одновременных запросов
+        **options: Параметры Exporter (format, batch_rows, ...)
+
+    Returns:
+        dict: {"rows": количество строк, "errors": [{"chunk", "response"}]}
+    """
+    chunks = item_client.stats_chunks(item_ids, date_from, date_to, chunk_size, max_days,
+                                      "day" if calls else period_grouping)
+    if calls:
+        schema, rows_key = CALLS_STATS_SCHEMA, "days"
+        args_list = [(user_id, c["date_from"], c["date_to"], c["item_ids"]) for c in chunks]
+        func = item_client.get_calls_stats
+    else:
+        schema, rows_key = STATS_SCHEMA, "stats"
+        args_list = [(user_id, c["date_from"], c["date_to"], c["item_ids"], period_grouping) for c in chunks]
+        func = item_client.get_items_stats
+
+    errors = []
+    with Exporter(path, schema, **options) as exporter:
+        for window in chunked(range(len(chunks)), max(1, max_workers)):
+            responses = map_concurrently(func, [args_list[i] for i in window], max_workers=max_workers)
+            for index, response in zip(window, responses):
+                if not isinstance(response, dict) or "error" in response:
+                    logger.error(f"Ошибка при выгрузке части статистики: {response}")
+                    errors.append({"chunk": chunks[index], "response": response})
+                    continue
+                exporter.write_rows(iter_stats_rows(response, rows_key))
+    return {"rows": exporter.rows, "errors": errors}
+
+
+def export_report_items(autoload, path, report_id, per_page=100, sections=None, **options):
+    """
+    Выгружает объявления отчета автозагрузки, загружая страницы по одной с предзагрузкой следующей
+
+    Args:
+        autoload (AutoloadClient): Блок методов autoload (client.autoload)
+        path: Путь к файлу CSV или Parquet
+        report_id (int): ID отчета
+        per_page (int): Объявлений на странице
+        sections (str): Фильтр по разделам
+        **options: Параметры Exporter (format, batch_rows, ...)
+
+    Returns:
+        dict: {"rows": количество строк, "errors": [ошибка страницы (см. page_error)]};
+            при ошибке файл содержит только строки страниц до нее
+    """
+    items = autoload.iter_report_items(report_id, per_page=per_page, sections=sections)
+    return _export_pages(path, REPORT_ITEMS_SCHEMA, items, options)
+
+
+def export_report_fees(autoload, path, report_id, per_page=100, **options):
+    """
+    Выгружает списания за объявления отчета автозагрузки
+
+    Args:
+        autoload (AutoloadClient): Блок методов autoload (client.autoload)
+        path: Путь к файлу CSV или Parquet
+        report_id (int): ID отчета
+        per_page (int): Записей на странице
+        **options: Параметры Exporter (format, batch_rows, ...)
+
+    Returns:
+        dict: {"rows": количество строк, "errors": [ошибка страницы (см. page_error)]};
+            при ошибке файл содержит только строки страниц до нее
+    """
+    return _export_pages(path, FEES_SCHEMA, autoload.iter_report_items_fees(report_id, per_page=per_page), options)
+
+
+def _export_pages(path, schema, items, options):
+    errors = []
+    with Exporter(path, schema, **options) as exporter:
+        try:
+            exporter.write_rows(items)
+        except PageError as e:
+            errors.append(e.error)
+    if errors:
+        logger.error(f"Выгрузка в {path} прервана на странице {errors[0]['page']}, записано строк: {exporter.rows}")
+    return {"rows": exporter.rows, "errors": errors}
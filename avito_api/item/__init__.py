@@ -0,0 +1,24 @@
+# Явный импорт для ускорения загрузки
+import importlib
+from .item_client import ItemClient
+
+# Зеркало каталога загружается при первом обращении (PEP 562), чтобы создание клиента не импортировало sqlite3
+_LAZY = {
+    'CatalogStore': '.catalog',
+    'CatalogMirror': '.catalog',
+    'AsyncCatalogMirror': '.catalog',
+}
+
+__all__ = ['ItemClient', 'CatalogStore', 'CatalogMirror', 'AsyncCatalogMirror']
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,394 @@
+# /item/catalog.py
+
+import json
+import sqlite3
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+from ..config.settings import (
+    CATALOG_PAGE_SIZE, CATALOG_STATUSES, CATALOG_SYNC_OVERLAP_DAYS, CATALOG_FULL_RESYNC_INTERVAL
+)
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+FULL = "full"
+DELTA = "delta"
+
+
+class CatalogStore:
+    def __init__(self, path):
+        """
+        Локальная копия каталога объявлений в базе SQLite с индексами по статусу и категории
+
+        Args:
+            path (str): Путь к файлу базы данных
+        """
+        self.path = path
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS items ("
+                    "account TEXT NOT NULL, "
+                    "item_id INTEGER NOT NULL, "
+                    "status TEXT, "
+                    "category_id INTEGER, "
+                    "synced_at INTEGER NOT NULL, "
+                    "data TEXT NOT NULL, "
+                    "PRIMARY KEY (account, item_id))"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS items_status ON items (account, status)")
+                conn.execute("CREATE INDEX IF NOT EXISTS items_category ON items (account, category_id, status)")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS catalog_state ("
+                    "account TEXT PRIMARY KEY, "
+                    "watermark TEXT, "
+                    "full_synced_at INTEGER, "
+                    "synced_at INTEGER)"
+                )
+                # Объявления, которых не было в последней полной синхронизации
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS unseen_items ("
+                    "account TEXT NOT NULL, "
+                    "item_id INTEGER NOT NULL, "
+                    "unseen_at INTEGER NOT NULL, "
+                    "PRIMARY KEY (account, item_id))"
+                )
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_state(self, account):
+        """
+        Returns:
+            dict: {"watermark": дата для updatedAtFrom, "full_synced_at": timestamp, "synced_at": timestamp}
+                или None, если каталог аккаунта еще не синхронизировался
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT watermark, full_synced_at, synced_at FROM catalog_state WHERE account = ?", (str(account),)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return {"watermark": row[0], "full_synced_at": row[1], "synced_at": row[2]}
+
+    def set_state(self, account, watermark, synced_at, full=False):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO catalog_state VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (account) DO UPDATE SET watermark = excluded.watermark, synced_at = excluded.synced_at, "
+                    "full_synced_at = COALESCE(excluded.full_synced_at, catalog_state.full_synced_at)",
+                    (str(account), watermark, synced_at if full else None, synced_at)
+                )
+        finally:
+            conn.close()
+
+    def upsert(self, account, items, synced_at):
+        """
+        Сохраняет объявления (ответ core/v1/items) поверх сохраненных
+
+        Returns:
+            int: Количество сохраненных объявлений
+        """
+        rows = [
+            (str(account), int(item["id"]), item.get("status"), (item.get("category") or {}).get("id"),
+             synced_at, json.dumps(item, ensure_ascii=False))
+            for item in items
+        ]
+        if not rows:
+            return 0
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?)", rows)
+        finally:
+            conn.close()
+        return len(rows)
+
+    def remove_unseen(self, account, synced_at):
+        """
+        Удаляет объявления, которых не было в полной синхронизации, начатой в synced_at,
+        и в предыдущей полной синхронизации (и которые не обновлялись между ними).
+        Остальные пропавшие объявления только отмечаются.
+
+        Страницы выдачи задаются смещением, и объявление может не попасть ни на одну страницу,
+        если список сдвинулся во время загрузки, поэтому одного пропуска для удаления недостаточно.
+
+        Returns:
+            int: Количество удаленных объявлений
+        """
+        account = str(account)
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "DELETE FROM items WHERE account = ? AND synced_at < ? AND EXISTS ("
+                    "SELECT 1 FROM unseen_items u WHERE u.account = items.account AND u.item_id = items.item_id "
+                    "AND u.unseen_at > items.synced_at)",
+                    (account, synced_at)
+                )
+                conn.execute("DELETE FROM unseen_items WHERE account = ?", (account,))
+                conn.execute(
+                    "INSERT INTO unseen_items SELECT account, item_id, ? FROM items WHERE account = ? AND synced_at < ?",
+                    (synced_at, account, synced_at)
+                )
+        finally:
+            conn.close()
+        return cursor.rowcount
+
+    def get(self, account, item_ids):
+        """
+        Returns:
+            dict: {item_id: объявление} для сохраненных объявлений
+        """
+        result = {}
+        ids = [int(i) for i in item_ids]
+        conn = self._connect()
+        try:
+            # Ограничение SQLite на количество параметров в запросе
+            for i in range(0, len(ids), 500):
+                part = ids[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT item_id, data FROM items WHERE account = ? AND item_id IN ({','.join('?' * len(part))})",
+                    [str(account), *part]
+                ).fetchall()
+                result.update((item_id, json.loads(data)) for item_id, data in rows)
+        finally:
+            conn.close()
+        return result
+
+    def statuses(self, account, item_ids):
+        """
+        Returns:
+            dict: {item_id: статус} для сохраненных объявлений
+        """
+        result = {}
+        ids = [int(i) for i in item_ids]
+        conn = self._connect()
+        try:
+            for i in range(0, len(ids), 500):
+                part = ids[i:i + 500]
+                result.update(conn.execute(
+                    f"SELECT item_id, status FROM items WHERE account = ? AND item_id IN ({','.join('?' * len(part))})",
+                    [str(account), *part]
+                ).fetchall())
+        finally:
+            conn.close()
+        return result
+
+    def find(self, account, status=None, category_id=None, limit=None, offset=0):
+        """
+        Returns:
+            list: Сохраненные объявления с указанным статусом и категорией в порядке item_id
+        """
+        query, params = "SELECT data FROM items WHERE account = ?", [str(account)]
+        if status is not None:
+            query += " AND status = ?"
+            params.append(status)
+        if category_id is not None:
+            query += " AND category_id = ?"
+            params.append(int(category_id))
+        query += " ORDER BY item_id LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else int(limit), int(offset)]
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+        return [json.loads(row[0]) for row in rows]
+
+    def counts(self, account, by="status"):
+        """
+        Args:
+            by (str): "status" или "category_id"
+
+        Returns:
+            dict: {значение: количество объявлений}
+        """
+        if by not in ("status", "category_id"):
+            raise ValueError(f"Неизвестная группировка: {by}")
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT {by}, COUNT(*) FROM items WHERE account = ? GROUP BY {by}", (str(account),)
+            ).fetchall()
+        finally:
+            conn.close()
+        return dict(rows)
+
+
+class CatalogMirror:
+    def __init__(self, item, store, statuses=CATALOG_STATUSES, per_page=CATALOG_PAGE_SIZE,
+                 overlap_days=CATALOG_SYNC_OVERLAP_DAYS, full_resync_interval=CATALOG_FULL_RESYNC_INTERVAL):
+        """
+        Локальное зеркало каталога объявлений с инкрементальной синхронизацией.
+
+        Первая синхронизация загружает весь каталог. Следующие запрашивают только объявления,
+        обновленные после сохраненной даты (updatedAtFrom), и записывают их поверх сохраненных.
+        Раз в full_resync_interval (и если дата синхронизации неизвестна) выполняется полная
+        синхронизация. Объявление удаляется, если его нет в двух полных синхронизациях подряд,
+        завершившихся без ошибок (см. CatalogStore.remove_unseen).
+        Поиск объявлений, статусов и количества по статусам выполняется по локальной базе без запросов к API.
+
+        Args:
+            item (ItemClient): Блок методов item (client.item)
+            store: Путь к базе SQLite или объект CatalogStore
+            statuses (str): Статусы синхронизируемых объявлений через запятую
+            per_page (int): Объявлений на странице (не больше 100)
+            overlap_days (int): На сколько дней раньше прошлой синхронизации запрашивать изменения
+                (updatedAtFrom задается датой, а время обновления на стороне API - по московскому времени)
+            full_resync_interval (int): Интервал полной синхронизации в секундах (None - только при необходимости)
+        """
+        self.item = item
+        self.store = CatalogStore(store) if isinstance(store, str) else store
+        self.statuses = statuses
+        self.per_page = per_page
+        self.overlap_days = overlap_days
+        self.full_resync_interval = full_resync_interval
+
+    @property
+    def account(self):
+        return self.item.auth.account
+
+    def _mode(self, full):
+        if full:
+            return FULL
+        state = self.store.get_state(self.account)
+        if state is None or not state["watermark"] or state["full_synced_at"] is None:
+            return FULL
+        if self.full_resync_interval is not None and time.time() - state["full_synced_at"] >= self.full_resync_interval:
+            return FULL
+        return DELTA
+
+    def _watermark(self, started):
+        day = datetime.fromtimestamp(started, timezone.utc).date() - timedelta(days=self.overlap_days)
+        return day.isoformat()
+
+    def _fetch_params(self, mode):
+        state = self.store.get_state(self.account) if mode == DELTA else None
+        return {
+            "per_page": self.per_page,
+            "status": self.statuses,
+            "updated_at_from": state["watermark"] if state else None,
+        }
+
+    def sync(self, full=False):
+        """
+        Синхронизирует каталог: изменения с прошлой синхронизации или весь каталог
+
+        Args:
+            full (bool): Принудительно выполнить полную синхронизацию
+
+        Returns:
+            dict: {"mode": "full" или "delta", "updated": количество сохраненных объявлений,
+                   "removed": количество удаленных, "error": ответ с ошибкой или None}
+        """
+        mode = self._mode(full)
+        started = int(time.time())
+        params = self._fetch_params(mode)
+        updated, page = 0, 1
+        while True:
+            response = self.item.get_items_info(page=page, **params)
+            resources, done = self._page(response)
+            if resources is None:
+                return self._finish(mode, started, updated, response)
+            updated += self.store.upsert(self.account, resources, started)
+            if done:
+                return self._finish(mode, started, updated, None)
+            page += 1
+
+    def _page(self, response):
+        """
+        Returns:
+            tuple: (объявления страницы или None при ошибке; True, если страница последняя)
+        """
+        if not isinstance(response, dict) or "resources" not in response:
+            logger.error(f"Ошибка при синхронизации каталога: {response}")
+            return None, True
+        resources = response["resources"]
+        return resources, len(resources) < self.per_page
+
+    def _finish(self, mode, started, updated, error):
+        removed = 0
+        # Дата синхронизации сдвигается, только если все страницы загружены без ошибок
+        if error is None:
+            if mode == FULL:
+                removed = self.store.remove_unseen(self.account, started)
+            self.store.set_state(self.account, self._watermark(started), started, full=mode == FULL)
+        logger.info(f"Синхронизация каталога ({mode}): сохранено {updated}, удалено {removed}"
+                    + (", остановлена из-за ошибки" if error is not None else ""))
+        return {"mode": mode, "updated": updated, "removed": removed, "error": error}
+
+    # Поиск по локальной копии без запросов к API
+
+    def get(self, item_id):
+        """
+        Returns:
+            dict: Сохраненное объявление или None
+        """
+        return self.store.get(self.account, [item_id]).get(int(item_id))
+
+    def get_many(self, item_ids):
+        """
+        Returns:
+            dict: {item_id: объявление} для сохраненных объявлений
+        """
+        return self.store.get(self.account, item_ids)
+
+    def status(self, item_id):
+        """
+        Returns:
+            str: Статус объявления или None, если объявления нет в локальной копии
+        """
+        return self.store.statuses(self.account, [item_id]).get(int(item_id))
+
+    def statuses_of(self, item_ids):
+        """
+        Returns:
+            dict: {item_id: статус}
+        """
+        return self.store.statuses(self.account, item_ids)
+
+    def find(self, status=None, category_id=None, limit=None, offset=0):
+        """
+        Returns:
+            list: Объявления с указанным статусом и категорией
+        """
+        return self.store.find(self.account, status=status, category_id=category_id, limit=limit, offset=offset)
+
+    def counts(self, by="status"):
+        """
+        Returns:
+            dict: {статус или ID категории: количество объявлений}
+        """
+        return self.store.counts(self.account, by=by)
+
+
+class AsyncCatalogMirror(CatalogMirror):
+    """
+    Асинхронная версия CatalogMirror для AsyncItemClient (поиск по локальной копии остается синхронным)
+    """
+
+    async def sync(self, full=False):
+        mode = self._mode(full)
+        started = int(time.time())
+        params = self._fetch_params(mode)
+        updated, page = 0, 1
+        while True:
+            response = await self.item.get_items_info(page=page, **params)
+            resources, done = self._page(response)
+            if resources is None:
+                return self._finish(mode, started, updated, response)
+            updated += self.store.upsert(self.account, resources, started)
+            if done:
+                return self._finish(mode, started, updated, None)
+            page += 1
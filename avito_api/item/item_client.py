@@ -1,12 +1,10 @@
 # /item/item_client.py
 
-from ..utils.request_handler import RequestHandler
-from ..config.settings import API_BASE_URL
-
-class ItemClient:
-    def __init__(self, auth):
-        self.auth = auth
+from ..utils.base_client import BaseClient, AsyncBaseClient
+from ..utils.chunking import chunked, split_date_range, map_concurrently, async_map_concurrently, merge_item_stats
+from ..config.settings import API_BASE_URL, STATS_MAX_ITEM_IDS, STATS_MAX_DAYS, STATS_WORKERS
 
+class ItemClient(BaseClient):
     # def для core/v1/accounts/{userId}/vas/prices POST
     def get_vas_prices(self, user_id, item_ids):
         """
@@ -16,11 +14,10 @@ class ItemClient:
         :return: Информация о стоимости услуг или None в случае ошибки
         """
         url = f"{API_BASE_URL}/core/v1/accounts/{user_id}/vas/prices"
-        headers = self.auth.get_headers()
         data = {
             "itemIds": item_ids
         }
-        return RequestHandler.send_request(url, method="POST", headers=headers, data=data)
+        return self._send(url, method="POST", data=data, retry=True)
 
     # def для core/v1/accounts/{user_id}/calls/stats/ POST
     def get_calls_stats(self, user_id, date_from, date_to, item_ids):
@@ -33,13 +30,12 @@ class ItemClient:
         :return: Статистика звонков или None в случае ошибки
         """
         url = f"{API_BASE_URL}/core/v1/accounts/{user_id}/calls/stats/"
-        headers = self.auth.get_headers()
         data = {
             "dateFrom": date_from,
             "dateTo": date_to,
             "itemIds": item_ids
         }
-        return RequestHandler.send_request(url, method="POST", headers=headers, data=data)
+        return self._send(url, method="POST", data=data, retry=True)
 
     # def для core/v1/accounts/{user_id}/items/{item_id}/ GET
     def get_item_info(self, user_id, item_id):
@@ -50,8 +46,7 @@ class ItemClient:
         :return: Информация об объявлении или None в случае ошибки
         """
         url = f"{API_BASE_URL}/core/v1/accounts/{user_id}/items/{item_id}/"
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="GET", headers=headers)
+        return self._send(url, method="GET")
 
     # def для core/v1/items GET
     def get_items_info(self, per_page=25, page=1, status=None, updated_at_from=None, category=None):
@@ -65,7 +60,6 @@ class ItemClient:
         :return: Список объявлений или None в случае ошибки
         """
         url = f"{API_BASE_URL}/core/v1/items"
-        headers = self.auth.get_headers()
         params = {
             "per_page": per_page,
             "page": page,
@@ -74,7 +68,7 @@ class ItemClient:
             "category": category
         }
         params = {k: v for k, v in params.items() if v is not None}
-        return RequestHandler.send_request(url, method="GET", headers=headers, params=params)
+        return self._send(url, method="GET", params=params)
 
     # def для core/v2/accounts/{user_id}/items/{item_id}/vas_packages PUT
     def apply_vas_package(self, user_id, item_id, package_id):
@@ -86,11 +80,10 @@ class ItemClient:
         :return: Информация о примененной услуге или None в случае ошибки
         """
         url = f"{API_BASE_URL}/core/v2/accounts/{user_id}/items/{item_id}/vas_packages"
-        headers = self.auth.get_headers()
         data = {
             "package_id": package_id
         }
-        return RequestHandler.send_request(url, method="PUT", headers=headers, data=data)
+        return self._send(url, method="PUT", data=data)
 
     # def для core/v2/items/{itemId}/vas/ PUT
     def apply_vas(self, item_id, slugs, stickers=None):
@@ -102,13 +95,12 @@ class ItemClient:
         :return: Информация о примененных услугах или None в случае ошибки
         """
         url = f"{API_BASE_URL}/core/v2/items/{item_id}/vas/"
-        headers = self.auth.get_headers()
         data = {
             "slugs": slugs,
             "stickers": stickers
         }
         data = {k: v for k, v in data.items() if v is not None}
-        return RequestHandler.send_request(url, method="PUT", headers=headers, data=data)
+        return self._send(url, method="PUT", data=data)
 
     # def для stats/v1/accounts/{user_id}/items POST
     def get_items_stats(self, user_id, date_from, date_to, item_ids, period_grouping="day"):
@@ -122,11 +114,83 @@ class ItemClient:
         :return: Статистика по объявлениям или None в случае ошибки
         """
         url = f"{API_BASE_URL}/stats/v1/accounts/{user_id}/items"
-        headers = self.auth.get_headers()
         data = {
             "dateFrom": date_from,
             "dateTo": date_to,
             "itemIds": item_ids,
             "periodGrouping": period_grouping
         }
-        return RequestHandler.send_request(url, method="POST", headers=headers, data=data)
\ No newline at end of file
+        return self._send(url, method="POST", data=data, retry=True)
+
+    def get_all_items_stats(self, user_id, date_from, date_to, item_ids, period_grouping="day",
+                            chunk_size=STATS_MAX_ITEM_IDS, max_days=STATS_MAX_DAYS, max_workers=STATS_WORKERS):
+        """
+        Получение статистики по любому количеству объявлений за любой период.
+        Список объявлений и период делятся на допустимые для API части, части загружаются параллельно.
+        :param user_id: Идентификатор пользователя
+        :param date_from: Начальная дата периода
+        :param date_to: Конечная дата периода
+        :param item_ids: Список идентификаторов объявлений
+        :param period_grouping: Период группировки (по умолчанию "day")
+        :param chunk_size: Количество объявлений в одном запросе
+        :param max_days: Количество дней в одном запросе
+        :param max_workers: Количество одновременных запросов
+        :return: Статистика в формате ответа get_items_stats; части с ошибкой - в ключе "errors"
+        """
+        chunks = self.stats_chunks(item_ids, date_from, date_to, chunk_size, max_days, period_grouping)
+        args_list = [
+            (user_id, chunk["date_from"], chunk["date_to"], chunk["item_ids"], period_grouping) for chunk in chunks
+        ]
+        return self._collect_stats(self.get_items_stats, args_list, chunks, "stats", max_workers)
+
+    def get_all_calls_stats(self, user_id, date_from, date_to, item_ids,
+                            chunk_size=STATS_MAX_ITEM_IDS, max_days=STATS_MAX_DAYS, max_workers=STATS_WORKERS):
+        """
+        Получение статистики звонков по любому количеству объявлений за любой период.
+        Список объявлений и период делятся на допустимые для API части, части загружаются параллельно.
+        :param user_id: Идентификатор пользователя
+        :param date_from: Начальная дата периода
+        :param date_to: Конечная дата периода
+        :param item_ids: Список идентификаторов объявлений
+        :param chunk_size: Количество объявлений в одном запросе
+        :param max_days: Количество дней в одном запросе
+        :param max_workers: Количество одновременных запросов
+        :return: Статистика в формате ответа get_calls_stats; части с ошибкой - в ключе "errors"
+        """
+        chunks = self.stats_chunks(item_ids, date_from, date_to, chunk_size, max_days)
+        args_list = [(user_id, chunk["date_from"], chunk["date_to"], chunk["item_ids"]) for chunk in chunks]
+        return self._collect_stats(self.get_calls_stats, args_list, chunks, "days", max_workers)
+
+    @staticmethod
+    def stats_chunks(item_ids, date_from, date_to, chunk_size=STATS_MAX_ITEM_IDS, max_days=STATS_MAX_DAYS,
+                     period_grouping="day"):
+        """
+        Делит список объявлений и период на части, допустимые для одного запроса статистики.
+        :param item_ids: Список идентификаторов объявлений
+        :param date_from: Начальная дата периода
+        :param date_to: Конечная дата периода
+        :param chunk_size: Количество объявлений в одном запросе
+        :param max_days: Количество дней в одном запросе
+        :param period_grouping: Период группировки (границы частей выравниваются по нему)
+        :return: Список частей {"item_ids", "date_from", "date_to"}
+        """
+        spans = split_date_range(date_from, date_to, max_days, period_grouping)
+        return [
+            {"item_ids": ids, "date_from": start, "date_to": stop}
+            for ids in chunked(item_ids, chunk_size)
+            for start, stop in spans
+        ]
+
+    def _collect_stats(self, func, args_list, chunks, rows_key, max_workers):
+        responses = map_concurrently(func, args_list, max_workers=max_workers)
+        return merge_item_stats(responses, chunks, rows_key)
+
+
+class AsyncItemClient(AsyncBaseClient, ItemClient):
+    """
+    Асинхронная версия ItemClient: те же методы, возвращающие корутины
+    """
+
+    async def _collect_stats(self, func, args_list, chunks, rows_key, max_workers):
+        responses = await async_map_concurrently(func, args_list, max_workers=max_workers)
+        return merge_item_stats(responses, chunks, rows_key)
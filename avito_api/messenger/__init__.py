@@ -1,4 +1,38 @@
 # Явный импорт для ускорения загрузки
+import importlib
 from .messenger_client import MessengerClient
 
-__all__ = ['MessengerClient']
\ No newline at end of file
+# Остальные классы загружаются при первом обращении (PEP 562), чтобы создание клиента
+# не импортировало sqlite3 и asyncio-сервер
+_LAZY = {
+    'MessengerStore': '.sync',
+    'MessengerSync': '.sync',
+    'AsyncMessengerSync': '.sync',
+    'WebhookServer': '.webhook',
+    'WebhookEvent': '.webhook',
+    'MessageEvent': '.webhook',
+    'parse_event': '.webhook',
+    'ImageCache': '.images',
+    'ImageUploader': '.images',
+    'AsyncImageUploader': '.images',
+    'VoiceDownloader': '.voice',
+    'AsyncVoiceDownloader': '.voice',
+}
+
+__all__ = [
+    'MessengerClient', 'MessengerStore', 'MessengerSync', 'AsyncMessengerSync',
+    'WebhookServer', 'WebhookEvent', 'MessageEvent', 'parse_event',
+    'ImageCache', 'ImageUploader', 'AsyncImageUploader', 'VoiceDownloader', 'AsyncVoiceDownloader'
+]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
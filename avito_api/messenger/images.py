@@ -0,0 +1,291 @@
+# /messenger/images.py
+
+import asyncio
+import sqlite3
+import threading
+import time
+import logging
+from ..utils.chunking import map_concurrently
+from ..utils.multipart import FileSource
+from ..config.settings import IMAGE_UPLOAD_WORKERS, IMAGE_CACHE_TTL, MULTIPART_CHUNK_SIZE
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+# Коды ответа send_image_message, при которых сохраненный ID изображения считается недействительным
+_STALE_IMAGE_CODES = (400, 404)
+
+
+class ImageCache:
+    def __init__(self, path=None, ttl=IMAGE_CACHE_TTL):
+        """
+        Кеш ID загруженных изображений по хешу содержимого: в памяти и, если указан path, в базе SQLite
+
+        Args:
+            path (str): Путь к базе SQLite (None - только в памяти процесса)
+            ttl (int): Время жизни ID изображения в секундах (None - без ограничения)
+        """
+        self.path = path
+        self.ttl = ttl
+        self._memory = {}
+        self._lock = threading.Lock()
+        if path is None:
+            return
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS images ("
+                    "user_id TEXT NOT NULL, "
+                    "digest TEXT NOT NULL, "
+                    "image_id TEXT NOT NULL, "
+                    "uploaded_at INTEGER NOT NULL, "
+                    "PRIMARY KEY (user_id, digest))"
+                )
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _fresh(self, uploaded_at):
+        return self.ttl is None or time.time() - uploaded_at < self.ttl
+
+    def get(self, user_id, digest):
+        """
+        Returns:
+            str: ID изображения или None, если изображение не загружалось или запись устарела
+        """
+        key = (str(user_id), digest)
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is None and self.path is not None:
+            conn = self._connect()
+            try:
+                entry = conn.execute(
+                    "SELECT image_id, uploaded_at FROM images WHERE user_id = ? AND digest = ?", key
+                ).fetchone()
+            finally:
+                conn.close()
+            if entry is not None:
+                with self._lock:
+                    self._memory[key] = entry
+        if entry is None or not self._fresh(entry[1]):
+            return None
+        return entry[0]
+
+    def set(self, user_id, digest, image_id):
+        entry = (str(image_id), int(time.time()))
+        with self._lock:
+            self._memory[(str(user_id), digest)] = entry
+        if self.path is not None:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?)", (str(user_id), digest) + entry)
+            finally:
+                conn.close()
+
+    def invalidate(self, user_id, digest):
+        with self._lock:
+            self._memory.pop((str(user_id), digest), None)
+        if self.path is not None:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM images WHERE user_id = ? AND digest = ?", (str(user_id), digest))
+            finally:
+                conn.close()
+
+
+def image_id_from_response(response):
+    """
+    Returns:
+        str: ID изображения из ответа uploadImages ({ID изображения: {размер: ссылка}}) или None
+    """
+    if isinstance(response, dict) and response and "error" not in response:
+        return next(iter(response))
+    return None
+
+
+class ImageUploader:
+    def __init__(self, messenger, user_id, cache=None, max_workers=IMAGE_UPLOAD_WORKERS,
+                 chunk_size=MULTIPART_CHUNK_SIZE):
+        """
+        Загрузка изображений мессенджера без повторов.
+
+        Для каждого изображения считается SHA-256 содержимого; если изображение с таким хешем уже
+        загружалось, используется сохраненный ID и запрос uploadImages не выполняется.
+        Новые изображения загружаются параллельно, тело запроса читается с диска частями.
+
+        Args:
+            messenger (MessengerClient): Блок методов messenger (client.messenger)
+            user_id (int): ID пользователя
+            cache: Путь к базе SQLite, объект ImageCache или None (кеш в памяти)
+            max_workers (int): Количество одновременных загрузок
+            chunk_size (int): Размер читаемой части файла при хешировании
+        """
+        self.messenger = messenger
+        self.user_id = user_id
+        self.cache = cache if isinstance(cache, ImageCache) else ImageCache(cache)
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+
+    def _digest(self, image):
+        source = image if isinstance(image, FileSource) else FileSource(image)
+        return source, source.digest(self.chunk_size)
+
+    def _plan(self, prepared):
+        """
+        Returns:
+            tuple: (результаты [ID из кеша или None], {хеш: источник} для загрузки)
+        """
+        results, missing = [], {}
+        for source, digest in prepared:
+            image_id = self.cache.get(self.user_id, digest)
+            results.append(image_id)
+            if image_id is None:
+                # Одинаковые изображения в одном вызове загружаются один раз
+                missing.setdefault(digest, source)
+        return results, missing
+
+    def _store(self, digest, response):
+        image_id = image_id_from_response(response)
+        if image_id is None:
+            logger.error(f"Ошибка при загрузке изображения: {response}")
+            return response
+        self.cache.set(self.user_id, digest, image_id)
+        return image_id
+
+    def _upload(self, digest, source):
+        return self._store(digest, self.messenger.upload_image(self.user_id, source))
+
+    def upload_many(self, images):
+        """
+        Загружает изображения, пропуская уже загруженные
+
+        Args:
+            images (list): Пути к файлам, bytes/bytearray/memoryview или открытые бинарные файлы
+
+        Returns:
+            list: ID изображений в порядке images (словарь с ошибкой для незагруженных)
+        """
+        return [result for _, result, _ in self._resolve(images)]
+
+    def _resolve(self, images):
+        """
+        Returns:
+            list: [(хеш, ID изображения или ошибка, True если ID взят из кеша)]
+        """
+        prepared = map_concurrently(self._digest, [(image,) for image in images], max_workers=self.max_workers)
+        results, missing = self._plan(prepared)
+        uploaded = dict(zip(missing, map_concurrently(self._upload, list(missing.items()), max_workers=self.max_workers)))
+        return [(digest, image_id if image_id is not None else uploaded[digest], image_id is not None)
+                for (_, digest), image_id in zip(prepared, results)]
+
+    def upload(self, image):
+        """
+        Returns:
+            str: ID изображения или словарь с ошибкой
+        """
+        return self.upload_many([image])[0]
+
+    def send_images(self, chat_id, images):
+        """
+        Отправляет изображения в чат по порядку, загружая только новые.
+
+        Если сохраненный ID изображения больше не принимается API, изображение загружается заново.
+
+        Args:
+            chat_id (str): ID чата
+            images (list): Изображения (см. upload_many)
+
+        Returns:
+            list: Ответы send_image_message (или ошибки загрузки) в порядке images
+        """
+        sources = [FileSource(image) for image in images]
+        responses, reuploaded = [], {}
+        for source, (digest, image_id, cached) in zip(sources, self._resolve(sources)):
+            # Повтор изображения, которое уже загружено заново в этом вызове
+            if digest in reuploaded:
+                image_id, cached = reuploaded[digest], False
+            if not isinstance(image_id, str):
+                responses.append(image_id)
+                continue
+            response = self.messenger.send_image_message(self.user_id, chat_id, image_id)
+            if cached and self._is_stale(response):
+                self.cache.invalidate(self.user_id, digest)
+                image_id = reuploaded[digest] = self._upload(digest, source)
+                if isinstance(image_id, str):
+                    response = self.messenger.send_image_message(self.user_id, chat_id, image_id)
+                else:
+                    response = image_id
+            responses.append(response)
+        return responses
+
+    def send_image(self, chat_id, image):
+        """
+        Returns:
+            dict: Ответ send_image_message или ошибка загрузки
+        """
+        return self.send_images(chat_id, [image])[0]
+
+    def _is_stale(self, response):
+        if isinstance(response, dict) and response.get("status_code") in _STALE_IMAGE_CODES:
+            logger.warning("Сохраненный ID изображения не принят, изображение будет загружено заново")
+            return True
+        return False
+
+
+class AsyncImageUploader(ImageUploader):
+    """
+    Асинхронная версия ImageUploader для AsyncMessengerClient (хеши считаются в пуле потоков)
+    """
+
+    async def _upload(self, digest, source):
+        return self._store(digest, await self.messenger.upload_image(self.user_id, source))
+
+    async def _resolve(self, images):
+        loop = asyncio.get_running_loop()
+        prepared = await asyncio.gather(*[loop.run_in_executor(None, self._digest, image) for image in images])
+        results, missing = self._plan(prepared)
+        semaphore = asyncio.Semaphore(max(1, self.max_workers))
+
+        async def bounded(digest, source):
+            async with semaphore:
+                return await self._upload(digest, source)
+
+        uploaded = dict(zip(missing, await asyncio.gather(*[bounded(d, s) for d, s in missing.items()])))
+        return [(digest, image_id if image_id is not None else uploaded[digest], image_id is not None)
+                for (_, digest), image_id in zip(prepared, results)]
+
+    async def upload_many(self, images):
+        return [result for _, result, _ in await self._resolve(images)]
+
+    async def upload(self, image):
+        return (await self.upload_many([image]))[0]
+
+    async def send_images(self, chat_id, images):
+        sources = [FileSource(image) for image in images]
+        responses, reuploaded = [], {}
+        for source, (digest, image_id, cached) in zip(sources, await self._resolve(sources)):
+            # Повтор изображения, которое уже загружено заново в этом вызове
+            if digest in reuploaded:
+                image_id, cached = reuploaded[digest], False
+            if not isinstance(image_id, str):
+                responses.append(image_id)
+                continue
+            response = await self.messenger.send_image_message(self.user_id, chat_id, image_id)
+            if cached and self._is_stale(response):
+                self.cache.invalidate(self.user_id, digest)
+                image_id = reuploaded[digest] = await self._upload(digest, source)
+                if isinstance(image_id, str):
+                    response = await self.messenger.send_image_message(self.user_id, chat_id, image_id)
+                else:
+                    response = image_id
+            responses.append(response)
+        return responses
+
+    async def send_image(self, chat_id, image):
+        return (await self.send_images(chat_id, [image]))[0]
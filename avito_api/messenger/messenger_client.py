@@ -1,12 +1,10 @@
 # /messenger/messenger_client.py
 
-from ..utils.request_handler import RequestHandler
+from ..utils.base_client import BaseClient, AsyncBaseClient
+from ..utils.multipart import MultipartBody
 from ..config.settings import API_BASE_URL
 
-class MessengerClient:
-    def __init__(self, auth):
-        self.auth = auth
-
+class MessengerClient(BaseClient):
     def get_chats(self, user_id, item_ids=None, unread_only=False, chat_types="u2i", limit=100, offset=0):
         """
         Получение списка чатов пользователя.
@@ -33,8 +31,7 @@ class MessengerClient:
         # Удаляем None значения
         params = {k: v for k, v in params.items() if v is not None}
         
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="GET", headers=headers, params=params)
+        return self._send(url, method="GET", params=params)
 
     def get_chat(self, user_id, chat_id):
         """
@@ -48,8 +45,7 @@ class MessengerClient:
             dict: Информация о чате
         """
         url = f"{API_BASE_URL}/messenger/v2/accounts/{user_id}/chats/{chat_id}"
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="GET", headers=headers)
+        return self._send(url, method="GET")
 
     def get_messages(self, user_id, chat_id, limit=100, offset=0):
         """
@@ -69,8 +65,7 @@ class MessengerClient:
             "limit": limit,
             "offset": offset
         }
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="GET", headers=headers, params=params)
+        return self._send(url, method="GET", params=params)
 
     def send_message(self, user_id, chat_id, data):
         """
@@ -90,8 +85,7 @@ class MessengerClient:
         """
         url = f"{API_BASE_URL}/messenger/v1/accounts/{user_id}/chats/{chat_id}/messages"
 
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="POST", headers=headers, data=data)
+        return self._send(url, method="POST", data=data)
 
     def send_image_message(self, user_id, chat_id, image_id):
         """
@@ -109,26 +103,27 @@ class MessengerClient:
         data = {
             "image_id": image_id
         }
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="POST", headers=headers, data=data)
+        return self._send(url, method="POST", data=data)
 
-    def upload_image(self, user_id, image_file):
+    def upload_image(self, user_id, image_file, filename=None):
         """
         Загрузка изображения для отправки в чат.
+
+        Тело запроса не собирается в памяти: файл читается с диска частями во время отправки.
         
         Args:
             user_id (int): ID пользователя
-            image_file (file): Файл изображения
+            image_file: Открытый бинарный файл, путь к файлу или bytes/bytearray/memoryview
+            filename (str, optional): Имя файла (по умолчанию - из пути или по формату изображения)
             
         Returns:
-            dict: Информация о загруженном изображении
+            dict: Информация о загруженном изображении ({ID изображения: {размер: ссылка}})
         """
         url = f"{API_BASE_URL}/messenger/v1/accounts/{user_id}/uploadImages"
-        files = {
-            'uploadfile[]': image_file
-        }
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="POST", headers=headers, files=files)
+        files = MultipartBody({
+            'uploadfile[]': (filename, image_file) if filename else image_file
+        })
+        return self._send(url, method="POST", files=files)
 
     def mark_chat_as_read(self, user_id, chat_id):
         """
@@ -142,8 +137,7 @@ class MessengerClient:
             dict: Результат операции
         """
         url = f"{API_BASE_URL}/messenger/v1/accounts/{user_id}/chats/{chat_id}/read"
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="POST", headers=headers)
+        return self._send(url, method="POST")
 
     def delete_message(self, user_id, chat_id, message_id):
         """
@@ -158,8 +152,7 @@ class MessengerClient:
             dict: Результат операции
         """
         url = f"{API_BASE_URL}/messenger/v1/accounts/{user_id}/chats/{chat_id}/messages/{message_id}"
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="POST", headers=headers)
+        return self._send(url, method="POST")
 
     def get_voice_files(self, user_id, voice_ids):
         """
@@ -174,10 +167,9 @@ class MessengerClient:
         """
         url = f"{API_BASE_URL}/messenger/v1/accounts/{user_id}/getVoiceFiles"
         params = {
-            "voice_ids": ','.join(voice_ids)
+            "voice_ids": ','.join(map(str, voice_ids))
         }
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="GET", headers=headers, params=params)
+        return self._send(url, method="GET", params=params)
     
     def get_subscriptions(self):
         """
@@ -187,5 +179,42 @@ class MessengerClient:
             dict: Список активных подписок на уведомления
         """
         url = f"{API_BASE_URL}/messenger/v1/subscriptions"
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="POST", headers=headers)
+        return self._send(url, method="POST", retry=True)
+
+    def subscribe_webhook(self, url):
+        """
+        Подписка на webhook-уведомления о новых сообщениях.
+
+        Args:
+            url (str): Адрес, на который Авито будет отправлять уведомления (например, WebhookServer)
+
+        Returns:
+            dict: Результат операции
+        """
+        api_url = f"{API_BASE_URL}/messenger/v3/webhook"
+        data = {
+            "url": url
+        }
+        return self._send(api_url, method="POST", data=data, retry=True)
+
+    def unsubscribe_webhook(self, url):
+        """
+        Отключение webhook-уведомлений.
+
+        Args:
+            url (str): Адрес, указанный при подписке
+
+        Returns:
+            dict: Результат операции
+        """
+        api_url = f"{API_BASE_URL}/messenger/v1/webhook/unsubscribe"
+        data = {
+            "url": url
+        }
+        return self._send(api_url, method="POST", data=data, retry=True)
+
+
+class AsyncMessengerClient(AsyncBaseClient, MessengerClient):
+    """
+    Асинхронная версия MessengerClient: те же методы, возвращающие корутины
+    """
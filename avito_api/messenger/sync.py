@@ -0,0 +1,358 @@
+# /messenger/sync.py
+
+import asyncio
+import json
+import sqlite3
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from ..config.settings import MESSENGER_SYNC_WORKERS
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+# Максимальный размер страницы чатов и сообщений
+PAGE_LIMIT = 100
+
+
+class MessengerStore:
+    def __init__(self, path):
+        """
+        Локальная копия чатов и сообщений в базе SQLite
+
+        Args:
+            path (str): Путь к файлу базы данных
+        """
+        self.path = path
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS chats ("
+                    "user_id TEXT NOT NULL, "
+                    "chat_id TEXT NOT NULL, "
+                    "updated INTEGER, "
+                    "last_message_id TEXT, "
+                    "last_message_created INTEGER, "
+                    "data TEXT NOT NULL, "
+                    "PRIMARY KEY (user_id, chat_id))"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS messages ("
+                    "user_id TEXT NOT NULL, "
+                    "chat_id TEXT NOT NULL, "
+                    "message_id TEXT NOT NULL, "
+                    "created INTEGER, "
+                    "data TEXT NOT NULL, "
+                    "PRIMARY KEY (user_id, chat_id, message_id))"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS messages_created ON messages (user_id, chat_id, created)")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS sync_state ("
+                    "user_id TEXT PRIMARY KEY, "
+                    "chats_updated INTEGER)"
+                )
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_chats_cursor(self, user_id):
+        """
+        Returns:
+            int: Время обновления самого свежего чата на момент прошлой синхронизации или None
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT chats_updated FROM sync_state WHERE user_id = ?", (str(user_id),)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def set_chats_cursor(self, user_id, updated):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (str(user_id), updated))
+        finally:
+            conn.close()
+
+    def get_chat_cursor(self, user_id, chat_id):
+        """
+        Returns:
+            tuple: (ID последнего сохраненного сообщения, время его создания) или (None, None)
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT last_message_id, last_message_created FROM chats WHERE user_id = ? AND chat_id = ?",
+                (str(user_id), chat_id)
+            ).fetchone()
+        finally:
+            conn.close()
+        return tuple(row) if row else (None, None)
+
+    def get_chat_cursors(self, user_id):
+        """
+        Returns:
+            dict: {ID чата: ID последнего сохраненного сообщения}
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT chat_id, last_message_id FROM chats WHERE user_id = ?", (str(user_id),)
+            ).fetchall()
+        finally:
+            conn.close()
+        return dict(rows)
+
+    def save_chats(self, user_id, chats):
+        """
+        Сохраняет чаты, не меняя курсоры сообщений
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO chats (user_id, chat_id, updated, data) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (user_id, chat_id) DO UPDATE SET updated = excluded.updated, data = excluded.data",
+                    [(str(user_id), chat["id"], chat.get("updated"), json.dumps(chat, ensure_ascii=False))
+                     for chat in chats]
+                )
+        finally:
+            conn.close()
+
+    def save_messages(self, user_id, chat_id, messages):
+        """
+        Сохраняет сообщения чата и сдвигает курсор чата на самое новое сообщение
+
+        Returns:
+            int: Количество новых сообщений
+        """
+        if not messages:
+            return 0
+        newest = max(messages, key=lambda message: message.get("created") or 0)
+        conn = self._connect()
+        try:
+            with conn:
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO messages VALUES (?, ?, ?, ?, ?)",
+                    [(str(user_id), chat_id, str(message["id"]), message.get("created"),
+                      json.dumps(message, ensure_ascii=False)) for message in messages]
+                )
+                added = conn.total_changes - before
+                conn.execute(
+                    "UPDATE chats SET last_message_id = ?, last_message_created = ? "
+                    "WHERE user_id = ? AND chat_id = ? AND (last_message_created IS NULL OR last_message_created <= ?)",
+                    (str(newest["id"]), newest.get("created"), str(user_id), chat_id, newest.get("created"))
+                )
+        finally:
+            conn.close()
+        return added
+
+    def get_chats(self, user_id):
+        """
+        Returns:
+            list: Сохраненные чаты, сначала недавно обновленные
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT data FROM chats WHERE user_id = ? ORDER BY updated DESC", (str(user_id),)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_messages(self, user_id, chat_id, since=None):
+        """
+        Args:
+            since (int): Вернуть только сообщения, созданные позже этого времени (timestamp)
+
+        Returns:
+            list: Сохраненные сообщения чата в порядке создания
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT data FROM messages WHERE user_id = ? AND chat_id = ? AND COALESCE(created, 0) > ? ORDER BY created",
+                (str(user_id), chat_id, since if since is not None else -1)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [json.loads(row[0]) for row in rows]
+
+
+class MessengerSync:
+    def __init__(self, messenger, user_id, store, chat_types="u2i,u2u", max_workers=MESSENGER_SYNC_WORKERS):
+        """
+        Инкрементальная синхронизация мессенджера с локальным хранилищем.
+
+        Чаты запрашиваются от недавно обновленных, пока не встретится чат, не менявшийся
+        с прошлой синхронизации. Для каждого изменившегося чата запрашиваются только
+        сообщения новее курсора чата. Чаты синхронизируются параллельно.
+
+        Args:
+            messenger (MessengerClient): Блок методов messenger (client.messenger)
+            user_id (int): ID пользователя
+            store: Путь к базе SQLite или объект MessengerStore
+            chat_types (str): Типы синхронизируемых чатов
+            max_workers (int): Количество чатов, синхронизируемых одновременно
+        """
+        self.messenger = messenger
+        self.user_id = user_id
+        self.store = MessengerStore(store) if isinstance(store, str) else store
+        self.chat_types = chat_types
+        self.max_workers = max_workers
+
+    def sync(self):
+        """
+        Синхронизирует изменившиеся чаты и новые сообщения
+
+        Returns:
+            dict: {"chats": список ID обновленных чатов, "messages": количество новых сообщений,
+                   "errors": {ID чата или "chats": ответ с ошибкой}}
+        """
+        cursor = self.store.get_chats_cursor(self.user_id)
+        chats, errors = self._fetch_changed_chats(cursor)
+        if errors:
+            return {"chats": [], "messages": 0, "errors": errors}
+
+        changed = self._save_chats(chats)
+        if changed:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(changed)))) as executor:
+                results = list(executor.map(self._sync_chat, changed))
+        else:
+            results = []
+        return self._finish(chats, cursor, changed, results)
+
+    def _fetch_changed_chats(self, cursor):
+        chats, offset = [], 0
+        while True:
+            response = self.messenger.get_chats(
+                self.user_id, chat_types=self.chat_types, limit=PAGE_LIMIT, offset=offset
+            )
+            page, done = self._changed_on_page(response, cursor)
+            if page is None:
+                return chats, {"chats": response}
+            chats.extend(page)
+            if done:
+                return chats, {}
+            offset += PAGE_LIMIT
+
+    @staticmethod
+    def _changed_on_page(response, cursor):
+        """
+        Returns:
+            tuple: (чаты, обновленные после cursor, или None при ошибке; True, если следующие страницы не нужны)
+        """
+        if not isinstance(response, dict) or "chats" not in response:
+            logger.error(f"Ошибка при загрузке чатов: {response}")
+            return None, True
+        page = response["chats"]
+        changed = [chat for chat in page if cursor is None or (chat.get("updated") or 0) > cursor]
+        return changed, len(changed) < len(page) or len(page) < PAGE_LIMIT
+
+    def _save_chats(self, chats):
+        # Чат обновляется и при прочтении: сообщения запрашиваются, только если изменилось последнее сообщение
+        self.store.save_chats(self.user_id, chats)
+        cursors = self.store.get_chat_cursors(self.user_id)
+        changed = []
+        for chat in chats:
+            last_message = chat.get("last_message") or {}
+            last_id = cursors.get(chat["id"])
+            if not last_message or last_id is None or str(last_message.get("id")) != last_id:
+                changed.append(chat["id"])
+        return changed
+
+    def _sync_chat(self, chat_id):
+        last_id, last_created = self.store.get_chat_cursor(self.user_id, chat_id)
+        messages, offset = [], 0
+        while True:
+            response = self.messenger.get_messages(self.user_id, chat_id, limit=PAGE_LIMIT, offset=offset)
+            page, done = self._new_on_page(response, last_id, last_created)
+            if page is None:
+                return chat_id, 0, response
+            messages.extend(page)
+            if done:
+                break
+            offset += PAGE_LIMIT
+        return chat_id, self.store.save_messages(self.user_id, chat_id, messages), None
+
+    @staticmethod
+    def _new_on_page(response, last_id, last_created):
+        """
+        Returns:
+            tuple: (сообщения новее курсора или None при ошибке; True, если следующие страницы не нужны)
+        """
+        page = response.get("messages") if isinstance(response, dict) else response
+        if not isinstance(page, list):
+            logger.error(f"Ошибка при загрузке сообщений: {response}")
+            return None, True
+        new = []
+        for message in page:
+            if last_id is not None and (str(message.get("id")) == last_id or (message.get("created") or 0) < (last_created or 0)):
+                return new, True
+            new.append(message)
+        return new, len(page) < PAGE_LIMIT
+
+    def _finish(self, chats, cursor, changed, results):
+        errors = {chat_id: error for chat_id, _, error in results if error is not None}
+        added = sum(count for _, count, _ in results)
+        # Курсор чатов сдвигается, только если все чаты синхронизированы без ошибок
+        if chats and not errors:
+            self.store.set_chats_cursor(self.user_id, max([chat.get("updated") or 0 for chat in chats] + [cursor or 0]))
+        logger.info(f"Синхронизация мессенджера: чатов {len(changed)}, новых сообщений {added}, ошибок {len(errors)}")
+        return {"chats": changed, "messages": added, "errors": errors}
+
+
+class AsyncMessengerSync(MessengerSync):
+    """
+    Асинхронная версия MessengerSync для AsyncMessengerClient
+    """
+
+    async def sync(self):
+        cursor = self.store.get_chats_cursor(self.user_id)
+        chats, errors = await self._fetch_changed_chats(cursor)
+        if errors:
+            return {"chats": [], "messages": 0, "errors": errors}
+
+        changed = self._save_chats(chats)
+        semaphore = asyncio.Semaphore(max(1, self.max_workers))
+
+        async def bounded(chat_id):
+            async with semaphore:
+                return await self._sync_chat(chat_id)
+
+        results = await asyncio.gather(*[bounded(chat_id) for chat_id in changed])
+        return self._finish(chats, cursor, changed, results)
+
+    async def _fetch_changed_chats(self, cursor):
+        chats, offset = [], 0
+        while True:
+            response = await self.messenger.get_chats(
+                self.user_id, chat_types=self.chat_types, limit=PAGE_LIMIT, offset=offset
+            )
+            page, done = self._changed_on_page(response, cursor)
+            if page is None:
+                return chats, {"chats": response}
+            chats.extend(page)
+            if done:
+                return chats, {}
+            offset += PAGE_LIMIT
+
+    async def _sync_chat(self, chat_id):
+        last_id, last_created = self.store.get_chat_cursor(self.user_id, chat_id)
+        messages, offset = [], 0
+        while True:
+            response = await self.messenger.get_messages(self.user_id, chat_id, limit=PAGE_LIMIT, offset=offset)
+            page, done = self._new_on_page(response, last_id, last_created)
+            if page is None:
+                return chat_id, 0, response
+            messages.extend(page)
+            if done:
+                break
+            offset += PAGE_LIMIT
+        return chat_id, self.store.save_messages(self.user_id, chat_id, messages), None
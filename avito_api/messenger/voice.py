@@ -0,0 +1,299 @@
+# /messenger/voice.py
+
+import os
+import re
+import glob
+import asyncio
+import logging
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp
+except ImportError:  # Нужен только для AsyncVoiceDownloader
+    aiohttp = None
+from ..utils.chunking import chunked, map_concurrently, async_map_concurrently
+from ..config.settings import (
+    VOICE_IDS_PER_REQUEST, VOICE_DOWNLOAD_WORKERS, VOICE_DOWNLOAD_CHUNK_SIZE, VOICE_MAX_BYTES,
+    VOICE_DOWNLOAD_ATTEMPTS
+)
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+# Расширение файла, если его нет в ссылке
+DEFAULT_EXTENSION = ".m4a"
+PART_SUFFIX = ".part"
+
+
+class _TooLarge(Exception):
+    pass
+
+
+class _Rejected(Exception):
+    # Ответ, который не изменится при повторе
+    pass
+
+
+# Ответы 4xx, после которых загрузку имеет смысл повторить
+_RETRYABLE_CLIENT_ERRORS = (408, 429)
+
+
+def _content_range_total(value):
+    match = re.match(r"bytes \d+-\d+/(\d+)", value or "")
+    return int(match.group(1)) if match else None
+
+
+class VoiceDownloader:
+    def __init__(self, messenger, user_id, directory, max_workers=VOICE_DOWNLOAD_WORKERS,
+                 chunk_size=VOICE_DOWNLOAD_CHUNK_SIZE, max_bytes=VOICE_MAX_BYTES, attempts=VOICE_DOWNLOAD_ATTEMPTS):
+        """
+        Загрузка голосовых сообщений на диск.
+
+        ID делятся на части для getVoiceFiles, ссылки запрашиваются и файлы скачиваются параллельно.
+        Файл пишется на диск частями по chunk_size во временный файл .part, поэтому память не зависит
+        от длины записи. После обрыва загрузка продолжается с места остановки (заголовок Range),
+        уже скачанные файлы пропускаются.
+
+        Args:
+            messenger (MessengerClient): Блок методов messenger (client.messenger)
+            user_id (int): ID пользователя
+            directory (str): Каталог для файлов (файл называется по ID голосового сообщения)
+            max_workers (int): Количество одновременных запросов
+            chunk_size (int): Размер части файла в байтах
+            max_bytes (int): Максимальный размер файла; файлы больше не скачиваются (None - без ограничения)
+            attempts (int): Количество попыток скачать файл
+        """
+        self.messenger = messenger
+        self.user_id = user_id
+        self.directory = directory
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.attempts = attempts
+        os.makedirs(directory, exist_ok=True)
+
+    def _chunks(self, voice_ids):
+        return chunked([str(voice_id) for voice_id in voice_ids], VOICE_IDS_PER_REQUEST)
+
+    @staticmethod
+    def _collect(chunks, responses):
+        """
+        Returns:
+            tuple: ({ID: ссылка}, {ID: ошибка})
+        """
+        urls, errors = {}, {}
+        for chunk, response in zip(chunks, responses):
+            found = response.get("voices_urls") if isinstance(response, dict) else None
+            if not isinstance(found, dict):
+                logger.error(f"Ошибка при получении ссылок на голосовые сообщения: {response}")
+                errors.update((voice_id, response) for voice_id in chunk)
+                continue
+            for voice_id in chunk:
+                if found.get(voice_id):
+                    urls[voice_id] = found[voice_id]
+                else:
+                    errors[voice_id] = {"error": "Ссылка на голосовое сообщение не найдена"}
+        return urls, errors
+
+    def resolve(self, voice_ids):
+        """
+        Получает ссылки на файлы голосовых сообщений
+
+        Returns:
+            tuple: ({ID: ссылка}, {ID: ошибка})
+        """
+        chunks = self._chunks(voice_ids)
+        responses = map_concurrently(self.messenger.get_voice_files, [(self.user_id, chunk) for chunk in chunks],
+                                     max_workers=self.max_workers)
+        return self._collect(chunks, responses)
+
+    def path_for(self, voice_id, url=None):
+        """
+        Returns:
+            str: Путь к файлу голосового сообщения
+        """
+        extension = os.path.splitext(urlsplit(url).path)[1] if url else ""
+        return os.path.join(self.directory, f"{voice_id}{extension or DEFAULT_EXTENSION}")
+
+    def _existing(self, voice_id):
+        for path in glob.glob(os.path.join(glob.escape(self.directory), f"{glob.escape(str(voice_id))}.*")):
+            if not path.endswith(PART_SUFFIX):
+                return {"path": path, "size": os.path.getsize(path), "skipped": True}
+        return None
+
+    def _pending(self, voice_ids):
+        results, pending = {}, []
+        for voice_id in dict.fromkeys(str(voice_id) for voice_id in voice_ids):
+            existing = self._existing(voice_id)
+            if existing is not None:
+                results[voice_id] = existing
+            else:
+                pending.append(voice_id)
+        return results, pending
+
+    def download(self, voice_ids):
+        """
+        Скачивает голосовые сообщения, которых еще нет в каталоге
+
+        Args:
+            voice_ids (list): ID голосовых сообщений
+
+        Returns:
+            dict: {ID: {"path", "size"[, "skipped"]} или словарь с ошибкой}
+        """
+        results, pending = self._pending(voice_ids)
+        urls, errors = self.resolve(pending) if pending else ({}, {})
+        results.update(errors)
+        downloads = list(urls.items())
+        results.update(zip(urls, map_concurrently(self.download_url, downloads, max_workers=self.max_workers)))
+        return results
+
+    def _check_size(self, size):
+        if self.max_bytes is not None and size is not None and size > self.max_bytes:
+            raise _TooLarge(f"Размер файла {size} больше ограничения {self.max_bytes} байт")
+
+    @staticmethod
+    def _check_status(status):
+        # 416 разбирается в _begin: при докачке он означает, что файл уже скачан
+        if 400 <= status < 500 and status != 416 and status not in _RETRYABLE_CLIENT_ERRORS:
+            raise _Rejected(f"Сервер ответил {status} на запрос файла")
+
+    def _begin(self, status, headers, offset):
+        """
+        Разбирает ответ на запрос файла с учетом уже скачанной части
+
+        Returns:
+            tuple: (смещение, с которого пишется ответ, полный размер файла или None) или None, если файл уже скачан
+        """
+        if status == 416:
+            if offset:
+                # Сохраненная часть уже содержит весь файл
+                return None
+            # Без Range ответ 416 - ошибка сервера, а не содержимое файла
+            raise _Rejected("Сервер ответил 416 на запрос файла целиком")
+        if status == 206:
+            total = _content_range_total(headers.get("Content-Range"))
+        else:
+            # Сервер не поддерживает Range: файл скачивается заново
+            offset = 0
+            length = headers.get("Content-Length")
+            total = int(length) if length and length.isdigit() else None
+        self._check_size(total)
+        return offset, total
+
+    def _finish(self, voice_id, part, path, written, total):
+        if total is not None and written < total:
+            raise IOError(f"Соединение оборвалось: получено {written} из {total} байт")
+        os.replace(part, path)
+        logger.debug(f"Голосовое сообщение {voice_id} сохранено: {path} ({written} байт)")
+        return {"path": path, "size": written}
+
+    def _write(self, handle, written, chunk):
+        written += len(chunk)
+        self._check_size(written)
+        handle.write(chunk)
+        return written
+
+    def _fail(self, voice_id, part, error, attempt):
+        if isinstance(error, (_TooLarge, _Rejected)):
+            if os.path.exists(part):
+                os.remove(part)
+            logger.error(f"Голосовое сообщение {voice_id} не скачано: {error}")
+            return {"error": str(error)}
+        logger.warning(f"Ошибка при загрузке голосового сообщения {voice_id} (попытка {attempt + 1}): {error}")
+        return None
+
+    def download_url(self, voice_id, url):
+        """
+        Скачивает файл голосового сообщения по ссылке, продолжая ранее прерванную загрузку
+
+        Returns:
+            dict: {"path", "size"} или словарь с ошибкой
+        """
+        path = self.path_for(voice_id, url)
+        part = path + PART_SUFFIX
+        error = None
+        for attempt in range(self.attempts):
+            try:
+                return self._fetch(voice_id, url, path, part)
+            except Exception as e:
+                error = e
+                result = self._fail(voice_id, part, e, attempt)
+                if result is not None:
+                    return result
+        return {"error": f"Голосовое сообщение не скачано: {error}"}
+
+    def _fetch(self, voice_id, url, path, part):
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+        session = self.messenger.request_handler.session
+        # Ссылка ведет на файловый сервер, поэтому запрос идет без заголовков авторизации
+        with session.get(url, headers=headers, stream=True, timeout=self.messenger.request_handler.timeout) as response:
+            self._check_status(response.status_code)
+            if response.status_code != 416:
+                response.raise_for_status()
+            begin = self._begin(response.status_code, response.headers, offset)
+            if begin is None:
+                return self._finish(voice_id, part, path, offset, None)
+            written, total = begin
+            with open(part, "ab" if written else "wb") as handle:
+                for chunk in response.iter_content(self.chunk_size):
+                    written = self._write(handle, written, chunk)
+        return self._finish(voice_id, part, path, written, total)
+
+
+class AsyncVoiceDownloader(VoiceDownloader):
+    """
+    Асинхронная версия VoiceDownloader для AsyncMessengerClient
+    """
+
+    async def resolve(self, voice_ids):
+        chunks = self._chunks(voice_ids)
+        responses = await async_map_concurrently(
+            self.messenger.get_voice_files, [(self.user_id, chunk) for chunk in chunks], max_workers=self.max_workers
+        )
+        return self._collect(chunks, responses)
+
+    async def download(self, voice_ids):
+        results, pending = self._pending(voice_ids)
+        urls, errors = await self.resolve(pending) if pending else ({}, {})
+        results.update(errors)
+        downloads = list(urls.items())
+        results.update(zip(urls, await async_map_concurrently(self.download_url, downloads, max_workers=self.max_workers)))
+        return results
+
+    async def download_url(self, voice_id, url):
+        path = self.path_for(voice_id, url)
+        part = path + PART_SUFFIX
+        error = None
+        for attempt in range(self.attempts):
+            try:
+                return await self._fetch(voice_id, url, path, part)
+            except Exception as e:
+                error = e
+                result = self._fail(voice_id, part, e, attempt)
+                if result is not None:
+                    return result
+        return {"error": f"Голосовое сообщение не скачано: {error}"}
+
+    async def _fetch(self, voice_id, url, path, part):
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+        handler = self.messenger.request_handler
+        # Таймаут сессии ограничивает весь запрос, а длинная запись может скачиваться дольше:
+        # как и в синхронной версии, ограничивается только ожидание очередной части
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=handler.timeout, sock_read=handler.timeout)
+        async with handler.get_session().get(url, headers=headers, timeout=timeout) as response:
+            self._check_status(response.status)
+            if response.status != 416:
+                response.raise_for_status()
+            begin = self._begin(response.status, response.headers, offset)
+            if begin is None:
+                return self._finish(voice_id, part, path, offset, None)
+            written, total = begin
+            loop = asyncio.get_running_loop()
+            with open(part, "ab" if written else "wb") as handle:
+                async for chunk in response.content.iter_chunked(self.chunk_size):
+                    # Запись на диск выполняется в пуле потоков, чтобы не блокировать цикл событий
+                    written = await loop.run_in_executor(None, self._write, handle, written, chunk)
+        return self._finish(voice_id, part, path, written, total)
@@ -0,0 +1,362 @@
+# /messenger/webhook.py
+
+import asyncio
+import hmac
+import inspect
+import ipaddress
+import json
+import logging
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+from ..config.settings import (
+    WEBHOOK_QUEUE_SIZE, WEBHOOK_WORKERS, WEBHOOK_ENQUEUE_TIMEOUT, WEBHOOK_READ_TIMEOUT, WEBHOOK_MAX_BODY_SIZE
+)
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+# Сколько ID последних событий помнить для отбрасывания повторных доставок
+_SEEN_EVENTS = 10000
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+
+class WebhookEvent:
+    def __init__(self, data):
+        """
+        Webhook-уведомление мессенджера
+
+        Args:
+            data (dict): Тело уведомления {"id", "version", "timestamp", "payload": {"type", "value"}}
+        """
+        payload = data["payload"]
+        self.id = data.get("id")
+        self.version = data.get("version")
+        self.timestamp = data.get("timestamp")
+        self.type = payload["type"]
+        self.value = payload.get("value") or {}
+        self.raw = data
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.type} {self.id}>"
+
+
+class MessageEvent(WebhookEvent):
+    def __init__(self, data):
+        """
+        Уведомление о новом сообщении
+        """
+        super().__init__(data)
+        value = self.value
+        self.message_id = value.get("id")
+        self.chat_id = value.get("chat_id")
+        self.chat_type = value.get("chat_type")
+        self.user_id = value.get("user_id")
+        self.author_id = value.get("author_id")
+        self.item_id = value.get("item_id")
+        self.created = value.get("created")
+        self.message_type = value.get("type")
+        self.content = value.get("content") or {}
+
+    @property
+    def text(self):
+        return self.content.get("text")
+
+    @property
+    def is_own(self):
+        # Сообщение отправлено самим пользователем (например, через API)
+        return self.author_id is not None and self.author_id == self.user_id
+
+
+# Классы событий по типу уведомления
+EVENT_TYPES = {
+    "message": MessageEvent,
+}
+
+
+def parse_event(data):
+    """
+    Проверяет и разбирает тело уведомления
+
+    Args:
+        data (dict): Тело уведомления в формате JSON
+
+    Returns:
+        WebhookEvent: Событие (MessageEvent для новых сообщений)
+
+    Raises:
+        ValueError: Если тело не похоже на уведомление мессенджера или поля имеют неверный тип
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("payload"), dict):
+        raise ValueError("В уведомлении нет payload")
+    payload = data["payload"]
+    event_type = payload.get("type")
+    if not isinstance(event_type, str):
+        raise ValueError("В уведомлении нет payload.type")
+    # ID события - ключ для отбрасывания повторных доставок
+    if not isinstance(data.get("id"), (str, int, type(None))):
+        raise ValueError("ID уведомления должен быть строкой или числом")
+    value = payload.get("value")
+    if value is not None and not isinstance(value, dict):
+        raise ValueError("payload.value должен быть объектом")
+    if value and value.get("content") is not None and not isinstance(value["content"], dict):
+        raise ValueError("payload.value.content должен быть объектом")
+    return EVENT_TYPES.get(event_type, WebhookEvent)(data)
+
+
+def _is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        # Пустой адрес - все интерфейсы, имя хоста может указывать на внешний адрес
+        return False
+
+
+class WebhookServer:
+    def __init__(self, host="127.0.0.1", port=8080, path="/", secret=None, queue_size=WEBHOOK_QUEUE_SIZE,
+                 workers=WEBHOOK_WORKERS, enqueue_timeout=WEBHOOK_ENQUEUE_TIMEOUT, read_timeout=WEBHOOK_READ_TIMEOUT,
+                 max_body_size=WEBHOOK_MAX_BODY_SIZE):
+        """
+        Встраиваемый asyncio HTTP-сервер для webhook-уведомлений мессенджера.
+
+        Уведомления проверяются, разбираются в события и попадают в ограниченную очередь,
+        из которой их забирают обработчики. Если очередь заполнена дольше enqueue_timeout,
+        сервер отвечает 503, и Авито повторит доставку позже.
+
+        Args:
+            host (str): Адрес для входящих соединений (по умолчанию только локальные; за обратным
+                прокси или для приема напрямую от Авито - например, "0.0.0.0" вместе с secret)
+            port (int): Порт (0 - любой свободный)
+            path (str): Путь, на который приходят уведомления
+            secret (str): Секрет, который должен быть в параметре token адреса подписки
+                (например, https://example.com/avito?token=secret)
+            queue_size (int): Максимальное количество необработанных событий
+            workers (int): Количество одновременно работающих обработчиков
+            enqueue_timeout (float): Сколько ждать места в очереди перед ответом 503
+            read_timeout (float): Таймаут чтения запроса
+            max_body_size (int): Максимальный размер тела запроса в байтах
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.secret = secret
+        self.queue_size = queue_size
+        self.workers = workers
+        self.enqueue_timeout = enqueue_timeout
+        self.read_timeout = read_timeout
+        self.max_body_size = max_body_size
+        self.received = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self._handlers = []
+        self._seen = OrderedDict()
+        self._server = None
+        self._queue = None
+        self._worker_tasks = []
+        if secret is None and not _is_loopback(host):
+            logger.warning(f"Webhook-сервер на адресе {host or '*'} принимает уведомления без проверки secret: "
+                           f"любой, кто может подключиться к порту {port}, сможет отправить события")
+
+    def add_handler(self, handler, event_type=None):
+        """
+        Регистрирует обработчик событий
+
+        Args:
+            handler (callable): Функция или корутина handler(event)
+            event_type (str): Тип событий (None - все события)
+        """
+        self._handlers.append((event_type, handler))
+
+    def on(self, event_type=None):
+        """
+        Декоратор для регистрации обработчика:
+
+            @server.on("message")
+            async def handle(event): ...
+        """
+        def decorator(handler):
+            self.add_handler(handler, event_type)
+            return handler
+        return decorator
+
+    @property
+    def url(self):
+        """
+        Адрес сервера (после start), например для подписки через туннель или для проверки локально
+        """
+        if self._server is None:
+            return None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        url = f"http://{host}:{port}{self.path}"
+        return f"{url}?token={self.secret}" if self.secret else url
+
+    async def start(self):
+        """
+        Запускает сервер и обработчики событий
+        """
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._worker_tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        logger.info(f"Webhook-сервер запущен: {self.url}")
+
+    async def serve_forever(self):
+        """
+        Запускает сервер (если еще не запущен) и работает до отмены
+        """
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def stop(self, timeout=None):
+        """
+        Останавливает прием уведомлений и ждет обработки событий из очереди
+
+        Args:
+            timeout (float): Сколько ждать обработки очереди (None - без ограничения)
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Webhook-сервер остановлен, необработанных событий: {self._queue.qsize()}")
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+
+    async def _worker(self):
+        while True:
+            event = await self._queue.get()
+            try:
+                await self.dispatch(event)
+            finally:
+                self._queue.task_done()
+
+    async def dispatch(self, event):
+        """
+        Передает событие подходящим обработчикам. Ошибка обработчика не останавливает остальные.
+        """
+        for event_type, handler in self._handlers:
+            if event_type is not None and event_type != event.type:
+                continue
+            try:
+                result = handler(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Ошибка в обработчике webhook-события {event!r}: {str(e)}")
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await asyncio.wait_for(reader.readline(), self.read_timeout)
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    await self._respond(writer, 400, keep_alive=False)
+                    break
+                method, target, version = parts
+
+                headers = {}
+                while True:
+                    line = await asyncio.wait_for(reader.readline(), self.read_timeout)
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                if "chunked" in headers.get("transfer-encoding", "").lower():
+                    await self._respond(writer, 411, keep_alive=False)
+                    break
+                length = headers.get("content-length") or "0"
+                if not length.isdigit():
+                    await self._respond(writer, 400, keep_alive=False)
+                    break
+                length = int(length)
+                if length > self.max_body_size:
+                    await self._respond(writer, 413, keep_alive=False)
+                    break
+                body = await asyncio.wait_for(reader.readexactly(length), self.read_timeout) if length else b""
+
+                status = await self._handle_request(method, target, body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, method, target, body):
+        target = urlsplit(target)
+        if target.path.rstrip("/") != self.path.rstrip("/"):
+            return 404
+        if method != "POST":
+            return 405
+        if self.secret is not None:
+            token = parse_qs(target.query).get("token", [""])[0]
+            if not hmac.compare_digest(token.encode(), self.secret.encode()):
+                self.rejected += 1
+                return 403
+
+        try:
+            event = parse_event(json.loads(body))
+        except ValueError as e:
+            self.rejected += 1
+            logger.warning(f"Некорректное webhook-уведомление: {str(e)}")
+            return 400
+
+        self.received += 1
+        # Повторная доставка того же уведомления не обрабатывается второй раз
+        if event.id is not None:
+            if event.id in self._seen:
+                self.duplicates += 1
+                return 200
+            self._seen[event.id] = True
+            if len(self._seen) > _SEEN_EVENTS:
+                self._seen.popitem(last=False)
+
+        try:
+            await asyncio.wait_for(self._queue.put(event), self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            # Событие не принято: разрешаем повторную доставку
+            self._seen.pop(event.id, None)
+            logger.warning("Очередь webhook-событий заполнена, уведомление отклонено")
+            return 503
+        return 200
+
+    @staticmethod
+    async def _respond(writer, status, keep_alive=True):
+        body = b"ok" if status == 200 else _REASONS.get(status, "").encode()
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: text/plain\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
@@ -0,0 +1,323 @@
+# /models.py
+"""
+Компактные модели ответов API.
+
+Модели не заменяют словари: методы по-прежнему возвращают ответ API как есть, а модели
+создаются по запросу (as_models=True в методах постраничной загрузки или Model.from_list).
+
+Поля хранятся в __slots__, повторяющиеся строки (статусы, категории, типы) интернируются.
+Небольшие повторяющиеся вложенные объекты (категория, раздел отчета) разбираются сразу в общие
+для всех записей объекты, остальные вложенные объекты и списки остаются в исходном виде
+и разбираются при первом обращении.
+Неизвестные поля сохраняются в extra, поэтому to_dict() возвращает исходные данные.
+"""
+
+import sys
+
+_intern = sys.intern
+
+# Сколько разных значений хранить в кеше общих вложенных объектов (категории, разделы) одного класса
+_SHARED_CACHE_SIZE = 4096
+
+
+class _Nested:
+    """
+    Дескриптор вложенного поля: значение хранится в слоте как пришло от API
+    и заменяется моделью (или кортежем моделей) при первом обращении
+    """
+
+    def __init__(self, slot, model, many=False):
+        self.slot = slot
+        self.model = model
+        self.many = many
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if type(value) is dict and not self.many:
+            value = self.model.from_dict(value)
+            setattr(obj, self.slot, value)
+        elif type(value) is list and self.many:
+            value = tuple(self.model.from_list(value))
+            setattr(obj, self.slot, value)
+        return value
+
+
+def _dump(value):
+    if isinstance(value, Model):
+        return value.to_dict()
+    if type(value) is tuple:
+        return [_dump(v) for v in value]
+    return value
+
+
+class Model:
+    __slots__ = ("extra",)
+
+    # Ключи JSON, которые хранятся в одноименных слотах
+    FIELDS = ()
+    # Ключи JSON, которые хранятся в слотах с другим именем: {"itemId": "item_id"}
+    ALIASES = {}
+    # Вложенные поля: {ключ JSON: имя слота}; для слота объявляется дескриптор _Nested
+    NESTED = {}
+    # Слоты, строковые значения которых интернируются
+    INTERNED = ()
+    # Небольшой объект-значение, который повторяется у многих записей (категория, раздел, сообщение отчета):
+    # разбирается сразу, и одинаковые значения используют один общий объект (его не следует изменять)
+    SHARED = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        keys = {key: key for key in cls.FIELDS}
+        keys.update(cls.ALIASES)
+        keys.update(cls.NESTED)
+        cls._KEYS = keys
+        cls._ATTRS = {attr: key for key, attr in keys.items()}
+        cls._INTERNED = frozenset(cls.INTERNED)
+        cls._SHARED = {}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Создает модель из словаря ответа API
+
+        Args:
+            data (dict): Элемент ответа API
+
+        Returns:
+            Model: Модель
+        """
+        obj = cls.__new__(cls)
+        for attr in cls._ATTRS:
+            setattr(obj, attr, None)
+        extra = None
+        keys, interned = cls._KEYS, cls._INTERNED
+        for key, value in data.items():
+            attr = keys.get(key)
+            if attr is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+                continue
+            if type(value) is str:
+                if attr in interned:
+                    value = _intern(value)
+            elif key in cls.NESTED:
+                model = getattr(cls, key).model
+                if model.SHARED:
+                    if type(value) is dict:
+                        value = model.shared(value)
+                    elif type(value) is list:
+                        value = tuple(model.shared(v) if type(v) is dict else v for v in value)
+            setattr(obj, attr, value)
+        obj.extra = extra
+        return obj
+
+    @classmethod
+    def shared(cls, data):
+        """
+        Возвращает общий объект для одинаковых значений (модели с SHARED = True)
+        """
+        try:
+            key = tuple(data.items())
+            obj = cls._SHARED.get(key)
+        except TypeError:
+            # Во вложенном объекте есть изменяемые значения - общий объект не используется
+            return cls.from_dict(data)
+        if obj is None:
+            obj = cls.from_dict(data)
+            if len(cls._SHARED) < _SHARED_CACHE_SIZE:
+                obj = cls._SHARED.setdefault(key, obj)
+        return obj
+
+    @classmethod
+    def from_list(cls, rows):
+        """
+        Создает модели из списка элементов ответа API
+
+        Returns:
+            list: Модели
+        """
+        from_dict = cls.from_dict
+        return [from_dict(row) for row in rows or ()]
+
+    def to_dict(self):
+        """
+        Возвращает словарь в формате API (поля со значением None не включаются)
+        """
+        data = {}
+        for attr, key in self._ATTRS.items():
+            value = getattr(self, attr)
+            if value is not None:
+                data[key] = _dump(value)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    # Доступ по ключам JSON, как к словарю: item["status"], item.get("url")
+
+    def __getitem__(self, key):
+        attr = self._KEYS.get(key)
+        if attr is not None:
+            value = getattr(self, attr if key not in self.NESTED else key)
+            if value is not None:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ", ".join(f"{attr}={getattr(self, attr)!r}" for attr in self._ATTRS
+                           if not attr.startswith("_") and getattr(self, attr) is not None)
+        return f"{type(self).__name__}({fields})"
+
+
+class Category(Model):
+    __slots__ = ("id", "name")
+    FIELDS = ("id", "name")
+    INTERNED = ("name",)
+    SHARED = True
+
+
+class Item(Model):
+    """
+    Объявление (core/v1/items)
+    """
+    __slots__ = ("id", "title", "price", "status", "url", "address", "_category")
+    FIELDS = ("id", "title", "price", "status", "url", "address")
+    NESTED = {"category": "_category"}
+    INTERNED = ("status", "address")
+
+    category = _Nested("_category", Category)
+
+
+class Section(Model):
+    __slots__ = ("slug", "title")
+    FIELDS = ("slug", "title")
+    INTERNED = ("slug", "title")
+    SHARED = True
+
+
+class ReportMessage(Model):
+    __slots__ = ("code", "title", "description", "type", "updated_at")
+    FIELDS = ("code", "title", "description", "type", "updated_at")
+    INTERNED = ("title", "type", "updated_at")
+    SHARED = True
+
+
+class ReportItem(Model):
+    """
+    Объявление из отчета автозагрузки (autoload/v2/reports/{report_id}/items)
+    """
+    __slots__ = ("ad_id", "avito_id", "url", "avito_status", "avito_date_end", "feed_name", "_section", "_messages")
+    FIELDS = ("ad_id", "avito_id", "url", "avito_status", "avito_date_end", "feed_name")
+    NESTED = {"section": "_section", "messages": "_messages"}
+    INTERNED = ("avito_status", "feed_name")
+
+    section = _Nested("_section", Section)
+    messages = _Nested("_messages", ReportMessage, many=True)
+
+
+class FeeItem(Model):
+    __slots__ = ("type", "amount", "title")
+    FIELDS = ("type", "amount", "title")
+    INTERNED = ("type", "title")
+
+
+class Fee(Model):
+    """
+    Списания за объявление из отчета автозагрузки (autoload/v2/reports/{report_id}/items/fees)
+    """
+    __slots__ = ("ad_id", "avito_id", "amount", "_fees")
+    FIELDS = ("ad_id", "avito_id", "amount")
+    NESTED = {"fees": "_fees"}
+
+    fees = _Nested("_fees", FeeItem, many=True)
+
+
+class MessageContent(Model):
+    __slots__ = ("text", "link", "image", "item", "location", "voice", "call", "flow_id")
+    FIELDS = ("text", "link", "image", "item", "location", "voice", "call", "flow_id")
+
+
+class Message(Model):
+    """
+    Сообщение чата (messenger/v3/.../messages)
+    """
+    __slots__ = ("id", "author_id", "created", "type", "direction", "is_read", "read", "_content", "quote")
+    FIELDS = ("id", "author_id", "created", "type", "direction", "is_read", "read", "quote")
+    NESTED = {"content": "_content"}
+    INTERNED = ("type", "direction")
+
+    content = _Nested("_content", MessageContent)
+
+    @property
+    def text(self):
+        content = self.content
+        return content.text if content is not None else None
+
+
+class ChatContext(Model):
+    __slots__ = ("type", "value")
+    FIELDS = ("type", "value")
+    INTERNED = ("type",)
+
+
+class Chat(Model):
+    """
+    Чат мессенджера (messenger/v2/accounts/{user_id}/chats)
+    """
+    __slots__ = ("id", "created", "updated", "users", "_context", "_last_message")
+    FIELDS = ("id", "created", "updated", "users")
+    NESTED = {"context": "_context", "last_message": "_last_message"}
+
+    context = _Nested("_context", ChatContext)
+    last_message = _Nested("_last_message", Message)
+
+
+class ItemStatsRow(Model):
+    """
+    Строка статистики объявления за период (stats/v1/accounts/{user_id}/items)
+    """
+    __slots__ = ("item_id", "date", "uniq_views", "uniq_contacts", "uniq_favorites")
+    FIELDS = ("date",)
+    ALIASES = {"itemId": "item_id", "uniqViews": "uniq_views", "uniqContacts": "uniq_contacts",
+               "uniqFavorites": "uniq_favorites"}
+    INTERNED = ("date",)
+
+    @classmethod
+    def from_stats(cls, response, rows_key="stats"):
+        """
+        Разворачивает ответ статистики ({"result": {"items": [{"itemId", "stats": [...]}]}})
+        в плоский список строк
+
+        Args:
+            response (dict): Ответ get_items_stats или get_all_items_stats
+            rows_key (str): Ключ строк объявления ("stats" или "days" для статистики звонков)
+
+        Returns:
+            list: Строки ItemStatsRow
+        """
+        rows = []
+        for item in ((response or {}).get("result") or {}).get("items") or ():
+            item_id = item.get("itemId")
+            for row in item.get(rows_key) or ():
+                row = cls.from_dict(row)
+                row.item_id = item_id
+                rows.append(row)
+        return rows
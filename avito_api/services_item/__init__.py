@@ -0,0 +1,24 @@
+import importlib
+from .services_client import ServicesClient
+
+# Остальные классы загружаются при первом обращении (PEP 562), чтобы создание клиента
+# не импортировало sqlite3
+_LAZY = {
+    'BulkUpdater': '.bulk_updater',
+    'AsyncBulkUpdater': '.bulk_updater',
+    'PushSnapshot': '.bulk_updater',
+}
+
+__all__ = ['ServicesClient', 'BulkUpdater', 'AsyncBulkUpdater', 'PushSnapshot']
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
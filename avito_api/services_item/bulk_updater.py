@@ -0,0 +1,269 @@
+# /services_item/bulk_updater.py
+
+import asyncio
+import sqlite3
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from ..config.settings import STOCK_BATCH_SIZE, BULK_PRICE_WORKERS
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+# Статусы в отчете по объявлению
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+
+
+class PushSnapshot:
+    def __init__(self, path):
+        """
+        Последние отправленные в API цены и остатки в базе SQLite
+
+        Args:
+            path (str): Путь к файлу базы данных
+        """
+        self.path = path
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS pushed ("
+                    "account TEXT NOT NULL, "
+                    "item_id INTEGER NOT NULL, "
+                    "price REAL, "
+                    "quantity INTEGER, "
+                    "updated_at INTEGER NOT NULL, "
+                    "PRIMARY KEY (account, item_id))"
+                )
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def load(self, account):
+        """
+        Загружает снимок аккаунта
+
+        Args:
+            account (str): Ключ аккаунта (client_id)
+
+        Returns:
+            dict: {item_id: (цена, остаток)}
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT item_id, price, quantity FROM pushed WHERE account = ?", (str(account),)
+            ).fetchall()
+        finally:
+            conn.close()
+        return {item_id: (price, quantity) for item_id, price, quantity in rows}
+
+    def save(self, account, prices=(), quantities=()):
+        """
+        Сохраняет успешно отправленные значения
+
+        Args:
+            account (str): Ключ аккаунта (client_id)
+            prices (list): [(item_id, цена)]
+            quantities (list): [(item_id, остаток)]
+        """
+        account, now = str(account), int(time.time())
+        conn = self._connect()
+        try:
+            with conn:
+                for column, values in (("price", prices), ("quantity", quantities)):
+                    conn.executemany(
+                        f"INSERT INTO pushed (account, item_id, {column}, updated_at) VALUES (?, ?, ?, ?) "
+                        f"ON CONFLICT (account, item_id) DO UPDATE SET {column} = excluded.{column}, "
+                        f"updated_at = excluded.updated_at",
+                        [(account, item_id, value, now) for item_id, value in values]
+                    )
+        finally:
+            conn.close()
+
+    def clear(self, account):
+        """
+        Удаляет снимок аккаунта: следующая отправка передаст все значения
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM pushed WHERE account = ?", (str(account),))
+        finally:
+            conn.close()
+
+
+class BulkUpdater:
+    def __init__(self, services, snapshot, stock_batch_size=STOCK_BATCH_SIZE, max_workers=BULK_PRICE_WORKERS):
+        """
+        Массовое обновление цен и остатков.
+
+        Таблица цен и остатков сравнивается со снимком последних отправленных значений,
+        и в API уходят только изменения: остатки - пачками по stock_batch_size,
+        цены - параллельно, не больше max_workers запросов одновременно.
+
+        Args:
+            services (ServicesClient): Блок методов services аккаунта (client.services)
+            snapshot: Путь к базе SQLite со снимком или объект PushSnapshot
+            stock_batch_size (int): Количество остатков в одном запросе
+            max_workers (int): Количество одновременных запросов
+        """
+        self.services = services
+        self.snapshot = PushSnapshot(snapshot) if isinstance(snapshot, str) else snapshot
+        self.stock_batch_size = stock_batch_size
+        self.max_workers = max_workers
+
+    @property
+    def account(self):
+        return self.services.auth.account
+
+    def diff(self, rows, force=False):
+        """
+        Сравнивает таблицу со снимком
+
+        Args:
+            rows (iterable): Строки {"item_id": int, "price": число, "quantity": int, "external_id": str};
+                price и quantity необязательны
+            force (bool): Отправить все значения, не сравнивая со снимком
+
+        Returns:
+            tuple: (цены [(item_id, цена)], остатки [dict], отчет {item_id: {"price": статус, "quantity": статус}})
+        """
+        pushed = {} if force else self.snapshot.load(self.account)
+        prices, stocks, report = [], [], {}
+        for row in rows:
+            item_id = int(row["item_id"])
+            last_price, last_quantity = pushed.get(item_id, (None, None))
+            result = report[item_id] = {"price": None, "quantity": None}
+
+            price = row.get("price")
+            if price is not None:
+                if price == last_price:
+                    result["price"] = UNCHANGED
+                else:
+                    prices.append((item_id, price))
+
+            quantity = row.get("quantity")
+            if quantity is not None:
+                if quantity == last_quantity:
+                    result["quantity"] = UNCHANGED
+                else:
+                    stock = {"item_id": item_id, "quantity": quantity}
+                    if row.get("external_id"):
+                        stock["external_id"] = row["external_id"]
+                    stocks.append(stock)
+        return prices, stocks, report
+
+    def _batches(self, stocks):
+        return [stocks[i:i + self.stock_batch_size] for i in range(0, len(stocks), self.stock_batch_size)]
+
+    def push(self, rows, force=False):
+        """
+        Отправляет изменившиеся цены и остатки и сохраняет успешно отправленные значения в снимок
+
+        Args:
+            rows (iterable): Строки таблицы (см. diff)
+            force (bool): Отправить все значения, не сравнивая со снимком
+
+        Returns:
+            dict: {item_id: {"price": статус, "quantity": статус, "error": текст ошибки}},
+                статус - "updated", "unchanged", "failed" или None, если значение не передано
+        """
+        prices, stocks, report = self.diff(rows, force=force)
+        batches = self._batches(stocks)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            stock_responses = executor.map(self.services.update_stocks, batches)
+            price_responses = executor.map(lambda change: self.services.update_price(*change), prices)
+            stock_responses, price_responses = list(stock_responses), list(price_responses)
+        return self._finish(report, prices, price_responses, batches, stock_responses)
+
+    def _finish(self, report, prices, price_responses, batches, stock_responses):
+        saved_prices, saved_quantities = [], []
+
+        for (item_id, price), response in zip(prices, price_responses):
+            error = self._error(response)
+            if error is None:
+                report[item_id]["price"] = UPDATED
+                saved_prices.append((item_id, price))
+            else:
+                report[item_id]["price"] = FAILED
+                report[item_id]["error"] = error
+
+        for batch, response in zip(batches, stock_responses):
+            for stock, error in self._stock_errors(batch, response):
+                item_id = stock["item_id"]
+                if error is None:
+                    report[item_id]["quantity"] = UPDATED
+                    saved_quantities.append((item_id, stock["quantity"]))
+                else:
+                    report[item_id]["quantity"] = FAILED
+                    report[item_id]["error"] = error
+
+        self.snapshot.save(self.account, saved_prices, saved_quantities)
+
+        failed = sum(1 for result in report.values() if FAILED in (result["price"], result["quantity"]))
+        logger.info(
+            f"Массовое обновление: цен {len(saved_prices)}/{len(prices)}, "
+            f"остатков {len(saved_quantities)}/{sum(len(batch) for batch in batches)}, "
+            f"объявлений с ошибками {failed}"
+        )
+        return report
+
+    @staticmethod
+    def _error(response):
+        if isinstance(response, dict) and "error" in response:
+            return response["error"]
+        return None
+
+    @classmethod
+    def _stock_errors(cls, batch, response):
+        """
+        Результат по каждому остатку пачки: ответ содержит список stocks
+        с флагом success, ошибка запроса относится ко всей пачке.
+        Остаток, которого нет в ответе, считается не обновленным
+        """
+        error = cls._error(response)
+        if error is not None:
+            return [(stock, error) for stock in batch]
+
+        results = {}
+        for result in (response or {}).get("stocks") or []:
+            if result.get("item_id") is not None:
+                results[int(result["item_id"])] = result
+
+        pairs = []
+        for stock in batch:
+            result = results.get(stock["item_id"])
+            if result is None:
+                pairs.append((stock, "Нет результата в ответе API"))
+            elif result.get("success", True):
+                pairs.append((stock, None))
+            else:
+                pairs.append((stock, "; ".join(str(e) for e in result.get("errors") or []) or "Остаток не обновлен"))
+        return pairs
+
+
+class AsyncBulkUpdater(BulkUpdater):
+    """
+    Асинхронная версия BulkUpdater для AsyncServicesClient
+    """
+
+    async def push(self, rows, force=False):
+        prices, stocks, report = self.diff(rows, force=force)
+        batches = self._batches(stocks)
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+
+        stock_responses, price_responses = await asyncio.gather(
+            asyncio.gather(*[bounded(self.services.update_stocks(batch)) for batch in batches]),
+            asyncio.gather(*[bounded(self.services.update_price(*change)) for change in prices]),
+        )
+        return self._finish(report, prices, price_responses, batches, stock_responses)
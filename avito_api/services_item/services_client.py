@@ -1,12 +1,9 @@
 # /default/default_client.py
 
-from ..utils.request_handler import RequestHandler
+from ..utils.base_client import BaseClient, AsyncBaseClient
 from ..config.settings import API_BASE_URL
 
-class ServicesClient:
-    def __init__(self, auth):
-        self.auth = auth
-
+class ServicesClient(BaseClient):
     def update_price(self, item_id, price):
         """
         Обновление цены объявления по его идентификатору (item_id).
@@ -23,8 +20,7 @@ class ServicesClient:
         }
 
         # Выполнение запроса
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="POST", headers=headers, data=data)
+        return self._send(url, method="POST", data=data)
     
     def update_quantity(self, avito_id, quantity):
         """
@@ -48,5 +44,33 @@ class ServicesClient:
         }
 
         # Выполнение запроса
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="PUT", headers=headers, data=data)
\ No newline at end of file
+        return self._send(url, method="PUT", data=data)
+
+    def update_stocks(self, stocks):
+        """
+        Обновление остатков нескольких объявлений одним запросом.
+        [
+            {
+                "external_id": "AB123456",
+                "item_id": 123321,
+                "quantity": 500
+            }
+        ]
+        :param stocks: Список остатков (не больше STOCK_BATCH_SIZE элементов)
+        :return: Результат обновления по каждому объявлению или словарь с ошибкой
+        """
+        url = f"{API_BASE_URL}/stock-management/1/stocks"
+
+        # Тело запроса
+        data = {
+            "stocks": stocks
+        }
+
+        # Выполнение запроса
+        return self._send(url, method="PUT", data=data)
+
+
+class AsyncServicesClient(AsyncBaseClient, ServicesClient):
+    """
+    Асинхронная версия ServicesClient: те же методы, возвращающие корутины
+    """
@@ -1,12 +1,9 @@
 # /user/user_client.py
 
-from ..utils.request_handler import RequestHandler
+from ..utils.base_client import BaseClient, AsyncBaseClient
 from ..config.settings import API_BASE_URL
 
-class UserClient:
-    def __init__(self, auth):
-        self.auth = auth
-
+class UserClient(BaseClient):
     # def для core/v1/accounts/operations_history/ POST
     def get_operations_history(self, date_from, date_to):
         """
@@ -16,12 +13,11 @@ class UserClient:
         :return: История операций или None в случае ошибки
         """
         url = f"{API_BASE_URL}/core/v1/accounts/operations_history/"
-        headers = self.auth.get_headers()
         data = {
             "dateTimeFrom": date_from,
             "dateTimeTo": date_to
         }
-        return RequestHandler.send_request(url, method="POST", headers=headers, data=data)
+        return self._send(url, method="POST", data=data, retry=True)
 
     # def для core/v1/accounts/self GET
     def get_user_info(self):
@@ -30,8 +26,7 @@ class UserClient:
         :return: Информация о пользователе или None в случае ошибки
         """
         url = f"{API_BASE_URL}/core/v1/accounts/self"
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="GET", headers=headers)
+        return self._send(url, method="GET")
 
     # def для core/v1/accounts/{user_id}/balance/ GET
     def get_user_balance(self, user_id):
@@ -41,5 +36,10 @@ class UserClient:
         :return: Баланс пользователя или None в случае ошибки
         """
         url = f"{API_BASE_URL}/core/v1/accounts/{user_id}/balance/"
-        headers = self.auth.get_headers()
-        return RequestHandler.send_request(url, method="GET", headers=headers)
\ No newline at end of file
+        return self._send(url, method="GET")
+
+
+class AsyncUserClient(AsyncBaseClient, UserClient):
+    """
+    Асинхронная версия UserClient: те же методы, возвращающие корутины
+    """
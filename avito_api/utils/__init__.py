@@ -1,3 +1,37 @@
-from .request_handler import RequestHandler
+import importlib
 
-__all__ = ['RequestHandler']
+# Модули загружаются при первом обращении к имени (PEP 562), чтобы импорт одного
+# модуля пакета не загружал requests и aiohttp
+_LAZY = {
+    'RequestHandler': '.request_handler',
+    'create_session': '.request_handler',
+    'default_handler': '.request_handler',
+    'AsyncRequestHandler': '.async_request_handler',
+    'RateLimiter': '.rate_limiter',
+    'TokenBucket': '.rate_limiter',
+    'RetryPolicy': '.retry',
+    'ResponseCache': '.response_cache',
+    'RequestHooks': '.hooks',
+    'MetricsCollector': '.metrics',
+    'MultipartBody': '.multipart',
+    'RequestCoalescer': '.coalescing',
+    'PageError': '.pagination',
+}
+
+__all__ = [
+    'RequestHandler', 'AsyncRequestHandler', 'create_session', 'default_handler', 'RateLimiter', 'TokenBucket',
+    'RetryPolicy', 'ResponseCache', 'RequestHooks', 'MetricsCollector', 'MultipartBody',
+    'RequestCoalescer', 'PageError'
+]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,336 @@
+# /utils/async_request_handler.py
+import asyncio
+import json
+import logging
+import time
+from .rate_limiter import parse_retry_after
+from .retry import DEFAULT_RETRY_POLICY, resolve_retry, CONNECTION_ERROR, TIMEOUT_ERROR
+from .hooks import call_hooks
+from .endpoints import endpoint_template
+from .multipart import MultipartBody, can_resend
+from .coalescing import RequestCoalescer
+from ..config.settings import API_BASE_URL, TIMEOUT, ASYNC_POOL_LIMIT, ASYNC_MAX_CONCURRENCY
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp нужен только для асинхронного клиента
+    aiohttp = None
+
+# Настройка логирования
+logger = logging.getLogger('avito_api')
+
+
+class AsyncRequestHandler:
+    def __init__(self, session=None, limit=ASYNC_POOL_LIMIT, limit_per_host=0, keep_alive=True,
+                 max_concurrency=ASYNC_MAX_CONCURRENCY, timeout=TIMEOUT, rate_limiter=None,
+                 retry_policy=DEFAULT_RETRY_POLICY, cache=None, hooks=None, coalesce=True):
+        """
+        Инициализация асинхронного обработчика запросов
+
+        Args:
+            session (aiohttp.ClientSession): Готовая сессия (например, общая для нескольких клиентов)
+            limit (int): Общее количество соединений в пуле
+            limit_per_host (int): Максимальное количество соединений с одним хостом (0 - без ограничения)
+            keep_alive (bool): Переиспользовать соединения между запросами
+            max_concurrency (int): Максимальное количество одновременно выполняемых запросов
+            timeout (int): Таймаут запроса в секундах
+            rate_limiter (RateLimiter): Ограничение частоты запросов по аккаунтам и группам методов
+            retry_policy (RetryPolicy): Политика повтора запросов (None - без повторов)
+            cache (ResponseCache): Кеш ответов для методов, данные которых редко меняются
+            hooks (list): Обработчики событий запросов (RequestHooks, например MetricsCollector)
+            coalesce (bool): Объединять одинаковые одновременные GET-запросы в один (см. RequestCoalescer)
+        """
+        if aiohttp is None:
+            raise ImportError("Для асинхронного клиента требуется aiohttp: pip install aiohttp")
+        self.session = session
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keep_alive = keep_alive
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.cache = cache
+        self.hooks = list(hooks or [])
+        self.coalescer = RequestCoalescer() if coalesce else None
+        # Семафор создается при первом запросе, внутри работающего цикла событий
+        self._semaphore = None
+
+    def get_session(self):
+        """
+        Возвращает сессию aiohttp, создавая ее при первом обращении
+
+        Returns:
+            aiohttp.ClientSession: Сессия с пулом соединений
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                force_close=not self.keep_alive
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self.session
+
+    def _get_semaphore(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def warm_up(self, connections=1, url=API_BASE_URL):
+        """
+        Заранее открывает соединения с API
+
+        Args:
+            connections (int): Количество соединений для открытия
+            url (str): URL, к которому открываются соединения
+
+        Returns:
+            int: Количество успешно открытых соединений
+        """
+        session = self.get_session()
+
+        async def _open():
+            try:
+                async with session.head(url) as response:
+                    await response.read()
+                return True
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Warm-up Error: {str(e)}")
+                return False
+
+        results = await asyncio.gather(*[_open() for _ in range(connections)])
+        return sum(results)
+
+    async def close(self):
+        """
+        Закрывает сессию и все открытые соединения
+        """
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @staticmethod
+    def _build_form(files):
+        # Поддерживаем тот же формат files, что и requests: объект файла или кортеж (имя, файл[, тип])
+        form = aiohttp.FormData()
+        for name, value in files.items():
+            if isinstance(value, tuple):
+                filename, fileobj = value[0], value[1]
+                content_type = value[2] if len(value) > 2 else None
+                form.add_field(name, fileobj, filename=filename, content_type=content_type)
+            else:
+                form.add_field(name, value)
+        return form
+
+    async def _perform(self, url, method, headers, data, params, files, account, attempt=0):
+        """
+        Выполняет запрос с учетом лимита одновременных запросов и ограничения частоты.
+        Запрос, получивший 429, повторяется после паузы из Retry-After.
+
+        Returns:
+            tuple: (код ответа, текст статуса, заголовки ответа, тело ответа)
+        """
+        session = self.get_session()
+        requeues = 0
+        while True:
+            waited = 0.0
+            if self.rate_limiter is not None:
+                waited = await self.rate_limiter.acquire_async(url, account)
+
+            kwargs = {}
+            if isinstance(files, MultipartBody):
+                # Тело multipart читается частями во время отправки
+                kwargs["data"] = files
+                headers = {**(headers or {}), **files.headers}
+            elif files:
+                kwargs["data"] = self._build_form(files)
+            elif method in ["POST", "PUT", "PATCH"]:
+                kwargs["json"] = data
+
+            info = None
+            if self.hooks:
+                info = {
+                    "method": method, "url": url, "endpoint": endpoint_template(url), "account": account,
+                    "attempt": attempt, "requeue": requeues, "rate_limit_wait": waited,
+                    # Размер тела известен заранее только для JSON и MultipartBody
+                    "bytes_out": len(json.dumps(data).encode()) if "json" in kwargs and data is not None
+                    else len(files) if isinstance(files, MultipartBody) else 0
+                }
+                call_hooks(self.hooks, "on_request", info)
+
+            async with self._get_semaphore():
+                started = time.perf_counter()
+                try:
+                    async with session.request(method, url, headers=headers, params=params, **kwargs) as response:
+                        content = await response.read()
+                        status, reason, response_headers = response.status, response.reason, response.headers
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if info is not None:
+                        info.update(elapsed=time.perf_counter() - started, error=str(e), error_type=self._error_type(e))
+                        call_hooks(self.hooks, "on_error", info)
+                    raise
+
+            if info is not None:
+                info.update(status=status, elapsed=time.perf_counter() - started, bytes_in=len(content))
+                call_hooks(self.hooks, "on_response", info)
+
+            if self.rate_limiter is None:
+                return status, reason, response_headers, content
+            self.rate_limiter.feedback(url, account, status, response_headers)
+
+            # Файлы уже прочитаны при отправке, поэтому такие запросы не повторяем (кроме MultipartBody)
+            if status != 429 or not can_resend(files) or requeues >= self.rate_limiter.max_requeues:
+                return status, reason, response_headers, content
+            requeues += 1
+            logger.warning(f"429 Too Many Requests, повтор {requeues} для {method} {url}")
+
+    @staticmethod
+    def _error_type(error):
+        if isinstance(error, asyncio.TimeoutError):
+            return TIMEOUT_ERROR
+        if isinstance(error, aiohttp.ClientConnectionError):
+            return CONNECTION_ERROR
+        return "request"
+
+    async def send_request(self, url, method="GET", headers=None, data=None, params=None, files=None, account=None,
+                           retry=None):
+        """
+        Отправляет HTTP запрос и обрабатывает ответ (асинхронная версия RequestHandler.send_request)
+
+        Args:
+            url (str): URL для отправки запроса
+            method (str): HTTP метод (GET, POST, PUT, DELETE)
+            headers (dict): Заголовки запроса
+            data (dict): Данные для отправки в теле запроса
+            params (dict): Параметры запроса для URL
+            files (dict): Файлы для загрузки
+            account: Ключ аккаунта для ограничения частоты запросов (например, client_id)
+            retry: Политика повтора для этого вызова (см. RequestHandler.send_request)
+
+        Returns:
+            dict: Данные ответа в формате JSON или словарь с ошибкой.
+                Если были повторы, в словаре есть ключ "retries" с их количеством
+        """
+        cache_key = stale = None
+        if self.cache is not None:
+            cache_key, cached, stale = self.cache.lookup(method, url, params, data, account)
+            if cached is not None:
+                return cached
+            if stale is not None:
+                headers = {**(headers or {}), **stale.validators}
+
+        if self.coalescer is not None and method == "GET":
+            return await self.coalescer.run_async(
+                self.coalescer.key(method, url, params, account, headers),
+                lambda: self._send_with_retries(url, method, headers, data, params, files, account, retry,
+                                                cache_key, stale)
+            )
+        return await self._send_with_retries(url, method, headers, data, params, files, account, retry,
+                                             cache_key, stale)
+
+    async def _send_with_retries(self, url, method, headers, data, params, files, account, retry, cache_key,
+                                 stale):
+        policy, force = resolve_retry(self.retry_policy, retry)
+        retries = 0
+        while True:
+            result, reason, retry_after = await self._send_once(
+                url, method, headers, data, params, files, account, cache_key, stale, retries
+            )
+
+            # Файлы уже прочитаны при отправке, поэтому такие запросы не повторяем (кроме MultipartBody)
+            can_retry = retries + 1 < policy.max_attempts and can_resend(files)
+            # С ограничителем частоты 429 повторяет только _perform (не больше max_requeues раз)
+            if reason == 429 and self.rate_limiter is not None:
+                can_retry = False
+            if not (can_retry and policy.is_retryable(method, reason, force)):
+                break
+            retries += 1
+            delay = policy.get_delay(retries, retry_after)
+            logger.warning(f"Повтор {retries} для {method} {url} через {delay:.2f} с")
+            await asyncio.sleep(delay)
+
+        if retries and isinstance(result, dict):
+            result["retries"] = retries
+        if self.cache is not None and cache_key is None:
+            self.cache.invalidate_related(method, url, account)
+        return result
+
+    async def _send_once(self, url, method, headers, data, params, files, account, cache_key=None, stale=None,
+                         attempt=0):
+        """
+        Одна попытка запроса
+
+        Returns:
+            tuple: (результат, причина для повтора или None, задержка из Retry-After)
+        """
+        try:
+            # Добавляем информацию о запросе в лог для отладки
+            logger.debug(f"Sending {method} request to {url}")
+            if params:
+                logger.debug(f"Params: {json.dumps(params, ensure_ascii=False)}")
+            if data:
+                logger.debug(f"Data: {json.dumps(data, ensure_ascii=False)}")
+
+            status, reason, response_headers, content = await self._perform(
+                url, method, headers, data, params, files, account, attempt
+            )
+
+            # Ошибки HTTP (4xx, 5xx)
+            if status >= 400:
+                retry_after = parse_retry_after(response_headers.get("Retry-After"))
+                error_msg = f"HTTP Error: {status} - {reason}"
+                logger.error(error_msg)
+
+                # Пытаемся получить детали ошибки из тела ответа
+                try:
+                    error_details = json.loads(content)
+                    logger.error(f"Error details: {json.dumps(error_details, ensure_ascii=False)}")
+                    return {"error": error_msg, "details": error_details, "status_code": status}, status, retry_after
+                except ValueError:
+                    return {"error": error_msg, "status_code": status}, status, retry_after
+
+            # Данные не изменились с момента сохранения в кеш
+            if status == 304 and stale is not None:
+                return self.cache.revalidate(cache_key, stale, url, response_headers), None, None
+
+            # Возвращаем данные в формате JSON
+            if content:
+                result = json.loads(content)
+                if cache_key is not None:
+                    self.cache.store(cache_key, url, result, response_headers)
+                return result, None, None
+            else:
+                return {"status": "success"}, None, None
+
+        except asyncio.TimeoutError as e:
+            # Таймаут запроса
+            error_msg = f"Timeout Error: {str(e)}"
+            logger.error(error_msg)
+            return {"error": error_msg}, TIMEOUT_ERROR, None
+
+        except aiohttp.ClientConnectionError as e:
+            # Ошибки соединения
+            error_msg = f"Connection Error: {str(e)}"
+            logger.error(error_msg)
+            return {"error": error_msg}, CONNECTION_ERROR, None
+
+        except aiohttp.ClientError as e:
+            # Другие ошибки запросов
+            error_msg = f"Request Error: {str(e)}"
+            logger.error(error_msg)
+            return {"error": error_msg}, None, None
+
+        except Exception as e:
+            # Непредвиденные ошибки
+            error_msg = f"Unexpected Error: {str(e)}"
+            logger.error(error_msg)
+            return {"error": error_msg}, None, None
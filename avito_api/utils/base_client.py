@@ -0,0 +1,89 @@
+# /utils/base_client.py
+
+import importlib
+from .request_handler import RequestHandler
+
+
+class BaseClient:
+    def __init__(self, auth, request_handler=None):
+        """
+        Базовый класс для блоков методов API
+
+        Args:
+            auth (Authentication): Объект аутентификации
+            request_handler (RequestHandler): Обработчик запросов (общий пул соединений)
+        """
+        self.auth = auth
+        self.request_handler = request_handler or RequestHandler()
+
+    def _send(self, url, method="GET", data=None, params=None, files=None, retry=None):
+        """
+        Отправляет запрос с заголовками авторизации
+
+        Args:
+            url (str): URL для отправки запроса
+            method (str): HTTP метод (GET, POST, PUT, DELETE)
+            data (dict): Данные для отправки в теле запроса
+            params (dict): Параметры запроса для URL
+            files (dict): Файлы для загрузки
+            retry: Политика повтора для этого вызова (True - повторять POST-метод, который только читает данные)
+
+        Returns:
+            dict: Данные ответа в формате JSON или словарь с ошибкой
+        """
+        headers = self.auth.get_headers()
+        return self.request_handler.send_request(
+            url, method=method, headers=headers, data=data, params=params, files=files,
+            account=self.auth.account, retry=retry
+        )
+
+
+class AsyncBaseClient:
+    """
+    Примесь для асинхронных версий блоков методов.
+
+    Асинхронный клиент наследуется от синхронного (например,
+    class AsyncItemClient(AsyncBaseClient, ItemClient)) и переопределяет только _send,
+    поэтому методы, которые возвращают результат _send, возвращают корутину.
+    Методы с постраничной загрузкой переопределяются отдельно.
+    """
+
+    def __init__(self, auth, request_handler=None):
+        """
+        Args:
+            auth (AsyncAuthentication): Объект асинхронной аутентификации
+            request_handler (AsyncRequestHandler): Асинхронный обработчик запросов
+        """
+        if request_handler is None:
+            from .async_request_handler import AsyncRequestHandler
+            request_handler = AsyncRequestHandler()
+        self.auth = auth
+        self.request_handler = request_handler
+
+    async def _send(self, url, method="GET", data=None, params=None, files=None, retry=None):
+        headers = await self.auth.get_headers()
+        return await self.request_handler.send_request(
+            url, method=method, headers=headers, data=data, params=params, files=files,
+            account=self.auth.account, retry=retry
+        )
+
+
+class LazySubClientsMixin:
+    """
+    Примесь для клиентов API: блоки методов (autoload, item, ...) создаются при первом обращении.
+
+    Класс задает SUB_CLIENTS = {"имя": ("модуль", "класс")}; модуль импортируется относительно
+    пакета avito_api, а созданный блок сохраняется в атрибут экземпляра, поэтому следующие
+    обращения не проходят через __getattr__. Ожидает атрибуты auth и request_handler.
+    """
+
+    SUB_CLIENTS = {}
+
+    def __getattr__(self, name):
+        spec = type(self).SUB_CLIENTS.get(name)
+        if spec is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        module, class_name = spec
+        client_class = getattr(importlib.import_module(module, "avito_api"), class_name)
+        # setdefault: при одновременном первом обращении из нескольких потоков все получат один объект
+        return self.__dict__.setdefault(name, client_class(self.auth, self.request_handler))
@@ -0,0 +1,135 @@
+# /utils/chunking.py
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+
+def chunked(items, size):
+    """
+    Делит список на части не больше size элементов
+
+    Args:
+        items (iterable): Элементы
+        size (int): Максимальный размер части
+
+    Returns:
+        list: Список частей
+    """
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _period_start(day, grouping):
+    if grouping == "week":
+        return day - timedelta(days=day.weekday())
+    if grouping == "month":
+        return day.replace(day=1)
+    return day
+
+
+def split_date_range(date_from, date_to, max_days, grouping="day"):
+    """
+    Делит период на отрезки не длиннее max_days дней (границы включительно).
+
+    При группировке по неделям или месяцам отрезки по возможности заканчиваются
+    на границе недели или месяца, чтобы один период не разбивался между запросами.
+
+    Args:
+        date_from: Начальная дата (YYYY-MM-DD, date или datetime)
+        date_to: Конечная дата
+        max_days (int): Максимальная длина отрезка в днях
+        grouping (str): Группировка статистики: "day", "week" или "month"
+
+    Returns:
+        list: [(дата начала, дата конца)] в формате YYYY-MM-DD
+    """
+    start, end = _to_date(date_from), _to_date(date_to)
+    spans = []
+    while start <= end:
+        stop = min(end, start + timedelta(days=max_days - 1))
+        if stop < end and grouping != "day":
+            aligned = _period_start(stop + timedelta(days=1), grouping) - timedelta(days=1)
+            if aligned >= start:
+                stop = aligned
+        spans.append((start.isoformat(), stop.isoformat()))
+        start = stop + timedelta(days=1)
+    return spans
+
+
+def map_concurrently(func, args_list, max_workers=1):
+    """
+    Вызывает func(*args) для каждого набора аргументов и возвращает результаты в исходном порядке
+
+    Args:
+        func (callable): Функция запроса
+        args_list (list): Список кортежей аргументов
+        max_workers (int): Максимальное количество одновременных запросов
+
+    Returns:
+        list: Результаты в порядке args_list
+    """
+    if max_workers <= 1 or len(args_list) <= 1:
+        return [func(*args) for args in args_list]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(args_list))) as executor:
+        return list(executor.map(lambda args: func(*args), args_list))
+
+
+async def async_map_concurrently(func, args_list, max_workers=1):
+    """
+    Асинхронная версия map_concurrently: func(*args) должна возвращать корутину
+    """
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def _call(args):
+        async with semaphore:
+            return await func(*args)
+
+    return await asyncio.gather(*[_call(args) for args in args_list])
+
+
+def merge_item_stats(responses, chunks, rows_key):
+    """
+    Собирает ответы по частям в один ответ того же формата, что и у API:
+    {"result": {"items": [{"itemId": ..., rows_key: [...]}]}}.
+    Строки каждого объявления сортируются по дате, части с ошибкой попадают в "errors".
+
+    Args:
+        responses (list): Ответы API по частям
+        chunks (list): Аргументы частей (для отчета об ошибках)
+        rows_key (str): Ключ списка строк объявления ("stats" или "days")
+
+    Returns:
+        dict: Объединенный ответ
+    """
+    merged = {}
+    errors = []
+    for chunk, response in zip(chunks, responses):
+        if not isinstance(response, dict) or "error" in response:
+            logger.error(f"Ошибка при загрузке части статистики: {response}")
+            errors.append({"chunk": chunk, "response": response})
+            continue
+        for item in (response.get("result") or {}).get("items") or []:
+            rows = merged.setdefault(item.get("itemId"), {})
+            for row in item.get(rows_key) or []:
+                rows[row.get("date")] = row
+
+    items = [
+        {"itemId": item_id, rows_key: [rows[day] for day in sorted(rows, key=str)]}
+        for item_id, rows in merged.items()
+    ]
+    result = {"result": {"items": items}}
+    if errors:
+        result["errors"] = errors
+    return result
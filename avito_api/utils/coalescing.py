@@ -0,0 +1,113 @@
+# /utils/coalescing.py
+import asyncio
+import copy
+import hashlib
+import threading
+import logging
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "followers")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class RequestCoalescer:
+    def __init__(self):
+        """
+        Объединение одинаковых одновременных запросов.
+
+        Пока выполняется запрос, такие же запросы (метод, URL, параметры, аккаунт и заголовки,
+        в том числе токен авторизации) не отправляются, а ждут его результата. Каждый ожидающий получает свою копию ответа, поэтому изменение
+        ответа одним вызывающим не влияет на других. Это не кеш: завершенный запрос не запоминается.
+        """
+        self.executed = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(method, url, params=None, account=None, headers=None):
+        """
+        Returns:
+            tuple: Ключ запроса; заголовки входят в него хешем, чтобы запросы с разными токенами
+                не объединялись, даже если аккаунт неизвестен (account=None)
+        """
+        digest = hashlib.sha256(repr(sorted((headers or {}).items())).encode()).hexdigest()
+        return account, method, url, tuple(sorted((k, str(v)) for k, v in (params or {}).items())), digest
+
+    def run(self, key, func):
+        """
+        Выполняет func() или ждет результата такого же выполняющегося запроса
+
+        Args:
+            key: Ключ запроса (см. key)
+            func (callable): Функция, отправляющая запрос
+
+        Returns:
+            Результат func()
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+            else:
+                call.followers += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # После удаления ключа новые вызовы не присоединяются, и количество ожидающих окончательно
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        if call.followers:
+            logger.debug(f"Запрос выполнен один раз для {call.followers + 1} вызовов: {key[1]} {key[2]}")
+            return copy.deepcopy(call.result)
+        return call.result
+
+    async def run_async(self, key, func):
+        """
+        Асинхронная версия run: func() возвращает корутину.
+
+        Запрос выполняется в отдельной задаче, поэтому отмена одного из ожидающих не отменяет запрос для остальных.
+        """
+        entry = self._tasks.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(func())
+            entry = self._tasks[key] = [task, 0]
+            # Ключ удаляется до того, как ожидающие получат результат
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self.executed += 1
+            leader = True
+        else:
+            task = entry[0]
+            entry[1] += 1
+            self.coalesced += 1
+            leader = False
+
+        result = await asyncio.shield(task)
+        if leader and not entry[1]:
+            return result
+        return copy.deepcopy(result)
@@ -0,0 +1,122 @@
+# /utils/endpoints.py
+import re
+from urllib.parse import urlsplit
+
+# Группы методов API по префиксу пути: у каждой группы свои лимиты запросов
+ENDPOINT_GROUPS = [
+    ("/messenger/", "messenger"),
+    ("/stats/", "stats"),
+    ("/autoload/", "autoload"),
+    ("/stock-management/", "stock-management"),
+    ("/core/", "core"),
+]
+
+# Шаблоны путей методов API. Пути без параметров стоят раньше шаблонов с параметрами,
+# чтобы /autoload/v2/reports/items не совпадал с /autoload/v2/reports/{report_id}
+ENDPOINT_TEMPLATES = [
+    "/token/",
+    "/core/v1/items",
+    "/core/v1/accounts/self",
+    "/core/v1/accounts/operations_history/",
+    "/core/v1/accounts/{user_id}/balance/",
+    "/core/v1/accounts/{user_id}/vas/prices",
+    "/core/v1/accounts/{user_id}/calls/stats/",
+    "/core/v1/accounts/{user_id}/items/{item_id}/",
+    "/core/v1/items/{item_id}/update_price",
+    "/core/v2/accounts/{user_id}/items/{item_id}/vas_packages",
+    "/core/v2/items/{item_id}/vas/",
+    "/stats/v1/accounts/{user_id}/items",
+    "/stock-management/1/stocks",
+    "/autoload/v1/profile",
+    "/autoload/v1/upload",
+    "/autoload/v2/items/ad_ids",
+    "/autoload/v2/items/avito_ids",
+    "/autoload/v2/reports",
+    "/autoload/v2/reports/items",
+    "/autoload/v2/reports/last_completed_report",
+    "/autoload/v2/reports/{report_id}",
+    "/autoload/v2/reports/{report_id}/items",
+    "/autoload/v2/reports/{report_id}/items/fees",
+    "/messenger/v1/subscriptions",
+    "/messenger/v3/webhook",
+    "/messenger/v1/webhook/unsubscribe",
+    "/messenger/v2/accounts/{user_id}/chats",
+    "/messenger/v2/accounts/{user_id}/chats/{chat_id}",
+    "/messenger/v3/accounts/{user_id}/chats/{chat_id}/messages/",
+    "/messenger/v1/accounts/{user_id}/chats/{chat_id}/messages",
+    "/messenger/v1/accounts/{user_id}/chats/{chat_id}/messages/image",
+    "/messenger/v1/accounts/{user_id}/chats/{chat_id}/messages/{message_id}",
+    "/messenger/v1/accounts/{user_id}/chats/{chat_id}/read",
+    "/messenger/v1/accounts/{user_id}/uploadImages",
+    "/messenger/v1/accounts/{user_id}/getVoiceFiles",
+]
+
+
+def _compile_template(template):
+    pattern = re.sub(r"\\{(\w+)\\}", r"(?P<\1>[^/]+)", re.escape(template.rstrip("/")))
+    return re.compile("^" + pattern + "/?$")
+
+
+_COMPILED_TEMPLATES = [(template, _compile_template(template)) for template in ENDPOINT_TEMPLATES]
+
+
+def endpoint_path(url):
+    """
+    Возвращает путь URL без схемы, хоста и параметров
+
+    Args:
+        url (str): Полный URL запроса
+
+    Returns:
+        str: Путь, например /core/v1/items
+    """
+    return urlsplit(url).path or "/"
+
+
+def endpoint_group(url):
+    """
+    Определяет группу метода API по URL
+
+    Args:
+        url (str): Полный URL запроса
+
+    Returns:
+        str: messenger, stats, autoload, stock-management, core или default
+    """
+    path = endpoint_path(url)
+    for prefix, group in ENDPOINT_GROUPS:
+        if path.startswith(prefix):
+            return group
+    return "default"
+
+
+def match_endpoint(url):
+    """
+    Находит шаблон метода API для URL
+
+    Args:
+        url (str): Полный URL запроса
+
+    Returns:
+        tuple: (шаблон, {параметр: значение}). Для неизвестных путей числовые сегменты
+            заменяются на {id}
+    """
+    path = endpoint_path(url)
+    for template, regex in _COMPILED_TEMPLATES:
+        match = regex.match(path)
+        if match:
+            return template, match.groupdict()
+    return re.sub(r"/\d+(?=/|$)", "/{id}", path), {}
+
+
+def endpoint_template(url):
+    """
+    Возвращает шаблон метода API, например /core/v1/accounts/{user_id}/items/{item_id}/
+
+    Args:
+        url (str): Полный URL запроса
+
+    Returns:
+        str: Шаблон пути
+    """
+    return match_endpoint(url)[0]
@@ -0,0 +1,57 @@
+# /utils/hooks.py
+import logging
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+
+class RequestHooks:
+    """
+    Обработчики событий запросов. Достаточно унаследоваться и переопределить нужные методы
+    (или передать любой объект с частью этих методов).
+
+    Каждый метод получает словарь info:
+        method, url, endpoint (шаблон метода API), account, attempt (номер повтора),
+        requeue (номер повтора после 429), rate_limit_wait (ожидание слота, секунды);
+        после ответа - status, elapsed (секунды), bytes_in, bytes_out;
+        при ошибке - elapsed, error (текст) и error_type (connection, timeout или request).
+    """
+
+    def on_request(self, info):
+        """
+        Перед отправкой запроса
+        """
+
+    def on_response(self, info):
+        """
+        После получения ответа (с любым кодом)
+        """
+
+    def on_error(self, info):
+        """
+        При ошибке соединения или таймауте
+        """
+
+    def on_auth_refresh(self, info):
+        """
+        После обновления токена: account, elapsed (секунды), waited (ждали чужое обновление), error
+        """
+
+
+def call_hooks(hooks, name, info):
+    """
+    Вызывает метод name у всех обработчиков. Ошибка обработчика не влияет на запрос.
+
+    Args:
+        hooks (list): Обработчики событий
+        name (str): Имя метода (on_request, on_response, on_error, on_auth_refresh)
+        info (dict): Данные события
+    """
+    for hook in hooks:
+        method = getattr(hook, name, None)
+        if method is None:
+            continue
+        try:
+            method(info)
+        except Exception as e:
+            logger.error(f"Ошибка в обработчике {name}: {str(e)}")
@@ -0,0 +1,206 @@
+# /utils/metrics.py
+import bisect
+import threading
+from .hooks import RequestHooks
+from ..config.settings import METRICS_LATENCY_BUCKETS
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        # Значения для Prometheus: количество наблюдений <= границы, последнее - +Inf
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": self.sum / self.count if self.count else 0.0,
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.cumulative())),
+        }
+
+
+class _EndpointStats:
+    def __init__(self, buckets):
+        self.latency = _Histogram(buckets)
+        self.statuses = {}
+        self.errors = {}
+        self.retries = 0
+        self.requeues = 0
+        self.rate_limit_wait = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class MetricsCollector(RequestHooks):
+    def __init__(self, buckets=METRICS_LATENCY_BUCKETS, prefix="avito_api"):
+        """
+        Метрики запросов по шаблонам методов API: гистограмма времени ответа, коды ответа,
+        ошибки, повторы, ожидание ограничения частоты, объем данных и время обновления токена.
+
+        Подключается как обработчик событий: AvitoAPIClient(hooks=[MetricsCollector()]).
+
+        Args:
+            buckets (tuple): Границы гистограммы времени ответа в секундах
+            prefix (str): Префикс имен метрик Prometheus
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._endpoints = {}
+        self._auth = _Histogram(self.buckets)
+        self._auth_waits = _Histogram(self.buckets)
+        self._auth_errors = 0
+        self._lock = threading.Lock()
+
+    def _stats(self, info):
+        key = (info["method"], info["endpoint"])
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = _EndpointStats(self.buckets)
+        return stats
+
+    def on_request(self, info):
+        with self._lock:
+            stats = self._stats(info)
+            if info.get("attempt"):
+                stats.retries += 1
+            if info.get("requeue"):
+                stats.requeues += 1
+            stats.rate_limit_wait += info.get("rate_limit_wait") or 0.0
+
+    def on_response(self, info):
+        with self._lock:
+            stats = self._stats(info)
+            stats.latency.observe(info["elapsed"])
+            stats.statuses[info["status"]] = stats.statuses.get(info["status"], 0) + 1
+            stats.bytes_in += info.get("bytes_in") or 0
+            stats.bytes_out += info.get("bytes_out") or 0
+
+    def on_error(self, info):
+        error = info.get("error_type") or "error"
+        with self._lock:
+            stats = self._stats(info)
+            stats.latency.observe(info["elapsed"])
+            stats.errors[error] = stats.errors.get(error, 0) + 1
+            stats.bytes_out += info.get("bytes_out") or 0
+
+    def on_auth_refresh(self, info):
+        with self._lock:
+            (self._auth_waits if info.get("waited") else self._auth).observe(info["elapsed"])
+            if info.get("error"):
+                self._auth_errors += 1
+
+    def reset(self):
+        """
+        Сбрасывает накопленные метрики
+        """
+        with self._lock:
+            self._endpoints = {}
+            self._auth = _Histogram(self.buckets)
+            self._auth_waits = _Histogram(self.buckets)
+            self._auth_errors = 0
+
+    def snapshot(self):
+        """
+        Возвращает текущие метрики
+
+        Returns:
+            dict: {"endpoints": {"GET /core/v1/items": {...}}, "auth": {...}}
+        """
+        with self._lock:
+            endpoints = {
+                f"{method} {endpoint}": {
+                    "latency": stats.latency.snapshot(),
+                    "statuses": dict(stats.statuses),
+                    "errors": dict(stats.errors),
+                    "retries": stats.retries,
+                    "requeues": stats.requeues,
+                    "rate_limit_wait": stats.rate_limit_wait,
+                    "bytes_in": stats.bytes_in,
+                    "bytes_out": stats.bytes_out,
+                }
+                for (method, endpoint), stats in sorted(self._endpoints.items())
+            }
+            auth = {
+                "refresh": self._auth.snapshot(),
+                "wait": self._auth_waits.snapshot(),
+                "errors": self._auth_errors,
+            }
+        return {"endpoints": endpoints, "auth": auth}
+
+    def to_prometheus(self):
+        """
+        Возвращает метрики в текстовом формате Prometheus
+
+        Returns:
+            str: Текст для ответа на /metrics
+        """
+        p = self.prefix
+        lines = []
+
+        def histogram(name, help_text, items):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in items:
+                bounds = [*map(str, self.buckets), "+Inf"]
+                for bound, count in zip(bounds, hist.cumulative()):
+                    lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {count}")
+                lines.append(f"{name}_sum{_labels(**labels)} {hist.sum}")
+                lines.append(f"{name}_count{_labels(**labels)} {hist.count}")
+
+        def counter(name, help_text, items):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in items:
+                lines.append(f"{name}{_labels(**labels)} {value}")
+
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            labelled = [({"method": method, "endpoint": endpoint}, stats) for (method, endpoint), stats in endpoints]
+
+            histogram(f"{p}_request_duration_seconds", "Время ответа API",
+                      [(labels, stats.latency) for labels, stats in labelled])
+            counter(f"{p}_responses_total", "Ответы API по кодам",
+                    [({**labels, "status": status}, count)
+                     for labels, stats in labelled for status, count in sorted(stats.statuses.items())])
+            counter(f"{p}_request_errors_total", "Ошибки соединения и таймауты",
+                    [({**labels, "error": error}, count)
+                     for labels, stats in labelled for error, count in sorted(stats.errors.items())])
+            counter(f"{p}_retries_total", "Повторы запросов",
+                    [(labels, stats.retries) for labels, stats in labelled])
+            counter(f"{p}_requeues_total", "Повторы после 429",
+                    [(labels, stats.requeues) for labels, stats in labelled])
+            counter(f"{p}_rate_limit_wait_seconds_total", "Ожидание ограничения частоты",
+                    [(labels, stats.rate_limit_wait) for labels, stats in labelled])
+            counter(f"{p}_response_bytes_total", "Получено байт",
+                    [(labels, stats.bytes_in) for labels, stats in labelled])
+            counter(f"{p}_request_bytes_total", "Отправлено байт",
+                    [(labels, stats.bytes_out) for labels, stats in labelled])
+            histogram(f"{p}_auth_refresh_duration_seconds", "Время обновления токена",
+                      [({"role": "refresh"}, self._auth), ({"role": "wait"}, self._auth_waits)])
+            counter(f"{p}_auth_refresh_errors_total", "Ошибки обновления токена", [({}, self._auth_errors)])
+        return "\n".join(lines) + "\n"
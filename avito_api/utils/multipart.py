@@ -0,0 +1,205 @@
+# /utils/multipart.py
+
+import os
+import uuid
+import asyncio
+import hashlib
+import mimetypes
+from ..config.settings import MULTIPART_CHUNK_SIZE
+
+# Сигнатуры форматов изображений для данных без имени файла
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image.jpg", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image.png", "image/png"),
+    (b"GIF8", "image.gif", "image/gif"),
+    (b"RIFF", "image.webp", "image/webp"),
+)
+
+
+class FileSource:
+    """
+    Содержимое файла для multipart: путь, буфер (bytes, bytearray, memoryview) или открытый бинарный файл.
+    Буфер отдается срезами memoryview без копирования, файл читается частями при отправке.
+    """
+
+    def __init__(self, value):
+        self.path = self.buffer = self.file = None
+        if isinstance(value, (str, os.PathLike)):
+            self.path = os.fspath(value)
+            self.size = os.path.getsize(self.path)
+            self.name = os.path.basename(self.path)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            self.buffer = memoryview(value).cast("B")
+            self.size = len(self.buffer)
+            self.name = None
+        else:
+            self.file = value
+            self.name = os.path.basename(value.name) if isinstance(getattr(value, "name", None), str) else None
+            try:
+                self.offset = value.tell()
+                self.size = os.fstat(value.fileno()).st_size - self.offset
+            except (AttributeError, OSError, ValueError):
+                # Размер файла неизвестен (поток без fileno) - читаем его целиком один раз
+                self.file = None
+                self.buffer = memoryview(value.read())
+                self.size = len(self.buffer)
+
+    def guess_type(self, filename):
+        if filename is None and self.buffer is not None:
+            head = bytes(self.buffer[:8])
+            for signature, name, content_type in _SIGNATURES:
+                if head.startswith(signature):
+                    return name, content_type
+        filename = filename or self.name or "file"
+        return filename, mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    def _open(self):
+        if self.path is not None:
+            return open(self.path, "rb"), True
+        self.file.seek(self.offset)
+        return self.file, False
+
+    def chunks(self, chunk_size):
+        if self.buffer is not None:
+            for start in range(0, self.size, chunk_size):
+                yield self.buffer[start:start + chunk_size]
+            return
+        fileobj, owned = self._open()
+        try:
+            left = self.size
+            while left > 0:
+                chunk = fileobj.read(min(chunk_size, left))
+                if not chunk:
+                    raise IOError("Файл изменился во время отправки: прочитано меньше заявленного размера")
+                left -= len(chunk)
+                yield chunk
+        finally:
+            if owned:
+                fileobj.close()
+
+    def digest(self, chunk_size):
+        """
+        Returns:
+            str: SHA-256 содержимого (файл читается в один переиспользуемый буфер)
+        """
+        hasher = hashlib.sha256()
+        if self.buffer is not None:
+            hasher.update(self.buffer)
+            return hasher.hexdigest()
+        fileobj, owned = self._open()
+        try:
+            buffer = bytearray(chunk_size)
+            view = memoryview(buffer)
+            left = self.size
+            while left > 0:
+                read = fileobj.readinto(view[:min(chunk_size, left)])
+                if not read:
+                    break
+                hasher.update(view[:read])
+                left -= read
+        finally:
+            if owned:
+                fileobj.close()
+            else:
+                self.file.seek(self.offset)
+        return hasher.hexdigest()
+
+
+class MultipartBody:
+    def __init__(self, files, boundary=None, chunk_size=MULTIPART_CHUNK_SIZE):
+        """
+        Тело multipart/form-data, которое читается частями во время отправки.
+
+        В отличие от files= в requests, тело не собирается в памяти целиком: заголовки частей
+        отдаются как есть, буферы - срезами memoryview, файлы читаются с диска по chunk_size.
+        Тело можно отправить повторно (например, после 429): каждая отправка читает его с начала.
+
+        Args:
+            files (dict): {имя поля: источник или (имя файла, источник[, тип содержимого])},
+                источник - путь к файлу, bytes/bytearray/memoryview или открытый бинарный файл
+            boundary (str): Разделитель частей (по умолчанию случайный)
+            chunk_size (int): Размер читаемой части файла в байтах
+        """
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.sources = []
+        self._parts = []
+        for field, value in files.items():
+            filename, content_type = None, None
+            if isinstance(value, tuple):
+                filename, content_type = value[0], value[2] if len(value) > 2 else None
+                value = value[1]
+            source = value if isinstance(value, FileSource) else FileSource(value)
+            guessed_name, guessed_type = source.guess_type(filename)
+            header = (
+                f'--{self.boundary}\r\n'
+                f'Content-Disposition: form-data; name="{field}"; filename="{guessed_name}"\r\n'
+                f'Content-Type: {content_type or guessed_type}\r\n\r\n'
+            ).encode()
+            self.sources.append(source)
+            self._parts += [header, source, b"\r\n"]
+        self._parts.append(f"--{self.boundary}--\r\n".encode())
+        self.length = sum(part.size if isinstance(part, FileSource) else len(part) for part in self._parts)
+        self._reader = None
+        self._pending = None
+
+    @property
+    def headers(self):
+        return {
+            "Content-Type": f"multipart/form-data; boundary={self.boundary}",
+            "Content-Length": str(self.length),
+        }
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for part in self._parts:
+            if isinstance(part, FileSource):
+                yield from part.chunks(self.chunk_size)
+            else:
+                yield part
+
+    def rewind(self):
+        """
+        Начинает чтение тела с начала (перед каждой отправкой)
+        """
+        if self._reader is not None:
+            self._reader.close()
+        self._reader = None
+        self._pending = None
+        return self
+
+    def read(self, size=-1):
+        """
+        Возвращает следующую часть тела не длиннее size байт (пустой результат - конец тела)
+        """
+        if self._reader is None:
+            self._reader = iter(self)
+        chunk = self._pending
+        self._pending = None
+        if chunk is None:
+            chunk = next(self._reader, b"")
+        if 0 < size < len(chunk):
+            chunk, self._pending = chunk[:size], chunk[size:]
+        return chunk
+
+    async def __aiter__(self):
+        # Файлы читаются в пуле потоков, чтобы не блокировать цикл событий
+        loop = asyncio.get_running_loop()
+        reader = iter(self)
+        try:
+            while True:
+                chunk = await loop.run_in_executor(None, next, reader, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            reader.close()
+
+
+def can_resend(files):
+    """
+    Можно ли отправить запрос повторно: обычные файлы уже прочитаны при отправке, а MultipartBody читается заново
+    """
+    return not files or isinstance(files, MultipartBody)
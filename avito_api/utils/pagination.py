@@ -0,0 +1,195 @@
+# /utils/pagination.py
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+
+class PageError(Exception):
+    def __init__(self, page, response):
+        """
+        Страница не загрузилась: итератор по страницам остановлен, полученные элементы неполные
+
+        Args:
+            page (int): Номер страницы, которая не загрузилась
+            response: Ответ API на запрос этой страницы
+        """
+        super().__init__(f"Не удалось загрузить страницу {page}: {response}")
+        self.page = page
+        self.response = response
+
+    @property
+    def error(self):
+        """
+        Returns:
+            dict: Ошибка в формате page_error
+        """
+        return {"error": f"Не удалось загрузить страницу {self.page}", "page": self.page, "details": self.response}
+
+
+def fetch_pages(fetch_page, pages, is_valid, start=1, max_workers=1):
+    """
+    Загружает страницы с номерами start..pages-1 и возвращает ответы в порядке страниц.
+
+    При max_workers > 1 страницы загружаются параллельно пулом потоков указанного размера.
+    Если страница не загрузилась (в том числе после всех повторов), возвращается ошибка,
+    а не ответы до этой страницы: неполный список нельзя отличить от полного.
+
+    Args:
+        fetch_page (callable): Функция fetch_page(page) -> ответ API
+        pages (int): Общее количество страниц (из meta.pages первого ответа)
+        is_valid (callable): Функция is_valid(response) -> bool, проверяющая ответ
+        start (int): Номер первой загружаемой страницы
+        max_workers (int): Максимальное количество одновременных запросов
+
+    Returns:
+        list: Ответы в порядке страниц или dict: ошибка первой неудачной страницы (см. page_error)
+    """
+    page_numbers = range(start, pages)
+    if max_workers <= 1 or len(page_numbers) <= 1:
+        responses = []
+        for page in page_numbers:
+            response = fetch_page(page)
+            if not is_valid(response):
+                return page_error(page, response)
+            responses.append(response)
+        return responses
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(page_numbers))) as executor:
+        # map возвращает результаты в порядке страниц, независимо от порядка завершения
+        responses = list(executor.map(fetch_page, page_numbers))
+    return _first_error(responses, is_valid, start)
+
+
+async def async_fetch_pages(fetch_page, pages, is_valid, start=1, max_workers=1):
+    """
+    Асинхронная версия fetch_pages: fetch_page(page) должна возвращать корутину
+    """
+    page_numbers = range(start, pages)
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def _fetch(page):
+        async with semaphore:
+            return await fetch_page(page)
+
+    responses = await asyncio.gather(*[_fetch(page) for page in page_numbers])
+    return _first_error(responses, is_valid, start)
+
+
+def page_error(page, response):
+    """
+    Ошибка постраничной загрузки
+
+    Args:
+        page (int): Номер страницы, которая не загрузилась
+        response: Ответ API на запрос этой страницы
+
+    Returns:
+        dict: {"error": текст, "page": номер страницы, "details": ответ API}
+    """
+    logger.error(f"Постраничная загрузка прервана на странице {page}: {response}")
+    return PageError(page, response).error
+
+
+def _first_error(responses, is_valid, start=1):
+    for index, response in enumerate(responses):
+        if not is_valid(response):
+            return page_error(start + index, response)
+    return list(responses)
+
+
+def iter_pages(fetch_page, get_items, has_next=None, start=0, prefetch=True):
+    """
+    Постранично отдает элементы, загружая следующую страницу в фоне, пока обрабатывается текущая.
+
+    В памяти одновременно находятся не более двух страниц: текущая и загружаемая.
+    Итерация заканчивается на пустой странице или когда has_next вернул False.
+    Страница с ошибкой прерывает итерацию исключением PageError, чтобы неполный результат
+    нельзя было принять за полный.
+
+    Args:
+        fetch_page (callable): Функция fetch_page(page) -> ответ API
+        get_items (callable): Функция get_items(response) -> список элементов или None при ошибке
+        has_next (callable): Функция has_next(response, page) -> bool (по умолчанию - до пустой страницы)
+        start (int): Номер первой страницы
+        prefetch (bool): Загружать следующую страницу в фоновом потоке
+
+    Yields:
+        dict: Элементы страниц в порядке страниц
+
+    Raises:
+        PageError: Если страница вернулась с ошибкой
+    """
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+
+    def _request(page):
+        # Без предзагрузки страница запрашивается только когда понадобится
+        if executor is None:
+            return _Deferred(fetch_page, page)
+        return executor.submit(fetch_page, page)
+
+    try:
+        page = start
+        pending = _request(page)
+        while pending is not None:
+            response = pending.result()
+            pending = None
+            items = get_items(response)
+            if items is None:
+                logger.error(f"Постраничная загрузка прервана на странице {page}: {response}")
+                raise PageError(page, response)
+            if not items:
+                return
+            if has_next is None or has_next(response, page):
+                page += 1
+                pending = _request(page)
+            yield from items
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+async def async_iter_pages(fetch_page, get_items, has_next=None, start=0, prefetch=True):
+    """
+    Асинхронная версия iter_pages: fetch_page(page) должна возвращать корутину
+    """
+    def _request(page):
+        # Без предзагрузки корутина запускается только при await
+        if prefetch:
+            return asyncio.ensure_future(fetch_page(page))
+        return fetch_page(page)
+
+    page = start
+    pending = _request(page)
+    try:
+        while pending is not None:
+            response = await pending
+            pending = None
+            items = get_items(response)
+            if items is None:
+                logger.error(f"Постраничная загрузка прервана на странице {page}: {response}")
+                raise PageError(page, response)
+            if not items:
+                return
+            if has_next is None or has_next(response, page):
+                page += 1
+                pending = _request(page)
+            for item in items:
+                yield item
+    finally:
+        if isinstance(pending, asyncio.Future):
+            pending.cancel()
+        elif asyncio.iscoroutine(pending):
+            pending.close()
+
+
+class _Deferred:
+    # Отложенный запрос страницы с интерфейсом Future.result()
+    def __init__(self, fetch_page, page):
+        self._fetch_page = fetch_page
+        self._page = page
+
+    def result(self):
+        return self._fetch_page(self._page)
@@ -0,0 +1,196 @@
+# /utils/rate_limiter.py
+import asyncio
+import threading
+import time
+import logging
+from email.utils import parsedate_to_datetime
+from .endpoints import endpoint_group
+from ..config.settings import RATE_LIMITS, RATE_LIMIT_MAX_REQUEUES
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+
+def parse_retry_after(value):
+    """
+    Разбирает заголовок Retry-After (секунды или HTTP-дата)
+
+    Args:
+        value (str): Значение заголовка
+
+    Returns:
+        float: Количество секунд ожидания или None
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None, adaptive=False):
+        """
+        Корзина токенов: rate запросов в секунду с пачками до capacity запросов
+
+        Args:
+            rate (float): Скорость пополнения (запросов в секунду)
+            capacity (int): Максимальное количество накопленных токенов
+            adaptive (bool): Снижать скорость после 429 и постепенно возвращать после успешных ответов
+        """
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = self.max_rate / 4
+        self.capacity = float(capacity or max(1, rate))
+        self.adaptive = adaptive
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """
+        Занимает слот и возвращает, сколько нужно подождать до его наступления.
+        Токены могут уходить в минус - так ожидающие выстраиваются в очередь.
+
+        Returns:
+            float: Время ожидания в секундах
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(0.0, self.blocked_until - now)
+            if self.tokens < 0:
+                wait += -self.tokens / self.rate
+            return wait
+
+    def penalize(self, seconds=None):
+        """
+        Реакция на 429: приостанавливает выдачу слотов и (в адаптивном режиме) снижает скорость
+
+        Args:
+            seconds (float): Пауза из Retry-After (по умолчанию - время одного слота)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Несколько 429 из одной пачки запросов снижают скорость только один раз
+            if self.adaptive and now >= self.blocked_until:
+                self.rate = max(self.min_rate, self.rate / 2)
+            pause = seconds if seconds is not None else 1.0 / self.rate
+            self.blocked_until = max(self.blocked_until, now + pause)
+            self.tokens = min(self.tokens, 0.0)
+
+    def drain(self):
+        """
+        Сервер сообщил, что лимит исчерпан: накопленные токены больше не используются
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, 0.0)
+
+    def recover(self):
+        """
+        Успешный ответ: постепенно возвращает скорость к исходной
+        """
+        if self.adaptive and self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class RateLimiter:
+    def __init__(self, limits=None, adaptive=False, max_requeues=RATE_LIMIT_MAX_REQUEUES):
+        """
+        Ограничение частоты запросов по аккаунтам и группам методов API.
+
+        Для каждой пары (аккаунт, группа) создается своя корзина токенов.
+        Запросы ждут свободный слот, а получившие 429 повторяются после паузы из Retry-After.
+        Повтором 429 управляет только ограничитель: политика повтора обработчика такие ответы не повторяет.
+
+        Args:
+            limits (dict): {группа: (запросов в секунду, размер пачки)}, дополняет RATE_LIMITS
+            adaptive (bool): Дополнительно снижать скорость после 429 (если лимиты группы неизвестны)
+            max_requeues (int): Сколько раз повторять запрос после 429
+        """
+        self.limits = dict(RATE_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.adaptive = adaptive
+        self.max_requeues = max_requeues
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url, account=None):
+        """
+        Возвращает корзину токенов для аккаунта и группы метода
+
+        Args:
+            url (str): URL запроса
+            account: Ключ аккаунта (например, client_id)
+
+        Returns:
+            TokenBucket: Корзина токенов
+        """
+        group = endpoint_group(url)
+        key = (account, group)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    rate, capacity = self.limits.get(group, self.limits["default"])
+                    bucket = self._buckets[key] = TokenBucket(rate, capacity, adaptive=self.adaptive)
+        return bucket
+
+    def acquire(self, url, account=None):
+        """
+        Ждет свободный слот для запроса
+
+        Returns:
+            float: Время ожидания в секундах
+        """
+        wait = self.bucket(url, account).reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url, account=None):
+        """
+        Асинхронная версия acquire: ждет слот, не блокируя цикл событий
+        """
+        wait = self.bucket(url, account).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def feedback(self, url, account, status_code, headers):
+        """
+        Подстраивает корзину по ответу сервера (429, Retry-After, X-RateLimit-Remaining)
+
+        Args:
+            url (str): URL запроса
+            account: Ключ аккаунта
+            status_code (int): Код ответа
+            headers (dict): Заголовки ответа
+        """
+        bucket = self.bucket(url, account)
+        if status_code == 429:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            logger.warning(f"Rate limit ({endpoint_group(url)}): пауза {retry_after if retry_after is not None else 'по умолчанию'} с")
+            bucket.penalize(retry_after)
+            return
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.strip() == "0":
+            bucket.drain()
+        if status_code < 400:
+            bucket.recover()
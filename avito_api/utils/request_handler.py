@@ -2,16 +2,233 @@
 import requests
 import json
 import logging
-from ..config.settings import TIMEOUT
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from .rate_limiter import parse_retry_after
+from .retry import DEFAULT_RETRY_POLICY, resolve_retry, CONNECTION_ERROR, TIMEOUT_ERROR
+from .hooks import call_hooks
+from .endpoints import endpoint_template
+from .multipart import MultipartBody, can_resend
+from .coalescing import RequestCoalescer
+from ..config.settings import API_BASE_URL, TIMEOUT, POOL_CONNECTIONS, POOL_MAXSIZE
 
 # Настройка логирования
 logger = logging.getLogger('avito_api')
 
+
+def create_session(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, pool_block=False, keep_alive=True):
+    """
+    Создает сессию requests с пулом keep-alive соединений
+
+    Args:
+        pool_connections (int): Количество хостов, для которых кешируются пулы соединений
+        pool_maxsize (int): Максимальное количество соединений с одним хостом
+        pool_block (bool): Ждать освобождения соединения вместо открытия нового сверх pool_maxsize
+        keep_alive (bool): Переиспользовать соединения между запросами
+
+    Returns:
+        requests.Session: Настроенная сессия
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+# Общий обработчик для вызовов send_request на классе (см. default_handler)
+_default_handler = None
+_default_handler_lock = threading.Lock()
+
+
+def default_handler():
+    """
+    Общий обработчик запросов модуля, создается при первом обращении.
+
+    Раньше send_request был статическим методом, и код вызывал RequestHandler.send_request(url, ...)
+    без экземпляра. Такие вызовы выполняются через этот обработчик и его пул соединений.
+
+    Returns:
+        RequestHandler: Общий обработчик
+    """
+    global _default_handler
+    if _default_handler is None:
+        with _default_handler_lock:
+            if _default_handler is None:
+                _default_handler = RequestHandler()
+    return _default_handler
+
+
+class _InstanceOrDefault:
+    """
+    Метод экземпляра, который при обращении через класс привязывается к default_handler()
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+        self.__name__ = func.__name__
+
+    def __get__(self, instance, owner=None):
+        return self.func.__get__(default_handler() if instance is None else instance, owner)
+
+
 class RequestHandler:
+    def __init__(self, session=None, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                 pool_block=False, keep_alive=True, timeout=TIMEOUT, max_concurrency=None, rate_limiter=None,
+                 retry_policy=DEFAULT_RETRY_POLICY, cache=None, hooks=None, coalesce=True):
+        """
+        Инициализация обработчика запросов
+
+        Args:
+            session (requests.Session): Готовая сессия (например, общая для нескольких клиентов)
+            pool_connections (int): Количество хостов, для которых кешируются пулы соединений
+            pool_maxsize (int): Максимальное количество соединений с одним хостом
+            pool_block (bool): Ждать освобождения соединения вместо открытия нового сверх pool_maxsize
+            keep_alive (bool): Переиспользовать соединения между запросами
+            timeout (int): Таймаут запроса в секундах
+            max_concurrency (int): Максимальное количество одновременно выполняемых запросов
+                через этот обработчик (None - без ограничения)
+            rate_limiter (RateLimiter): Ограничение частоты запросов по аккаунтам и группам методов
+            retry_policy (RetryPolicy): Политика повтора запросов (None - без повторов)
+            cache (ResponseCache): Кеш ответов для методов, данные которых редко меняются
+            hooks (list): Обработчики событий запросов (RequestHooks, например MetricsCollector)
+            coalesce (bool): Объединять одинаковые одновременные GET-запросы в один (см. RequestCoalescer)
+        """
+        self.session = session or create_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive
+        )
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.cache = cache
+        self.hooks = list(hooks or [])
+        self.coalescer = RequestCoalescer() if coalesce else None
+
+    def warm_up(self, connections=1, url=API_BASE_URL):
+        """
+        Заранее открывает соединения с API, чтобы первые запросы не тратили время на TCP/TLS рукопожатие
+
+        Args:
+            connections (int): Количество соединений для открытия
+            url (str): URL, к которому открываются соединения
+
+        Returns:
+            int: Количество успешно открытых соединений
+        """
+        def _open(_):
+            try:
+                self.session.head(url, timeout=self.timeout)
+                return True
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Warm-up Error: {str(e)}")
+                return False
+
+        if connections <= 1:
+            return int(_open(0))
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            return sum(executor.map(_open, range(connections)))
+
+    def close(self):
+        """
+        Закрывает сессию и все открытые соединения
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _perform(self, url, method, headers, data, params, files, account, attempt=0):
+        """
+        Выполняет запрос с учетом общего лимита одновременных запросов и ограничения частоты.
+        Запрос, получивший 429, повторяется после паузы из Retry-After.
+        """
+        requeues = 0
+        while True:
+            waited = 0.0
+            if self.rate_limiter is not None:
+                waited = self.rate_limiter.acquire(url, account)
+
+            info = None
+            if self.hooks:
+                info = {
+                    "method": method, "url": url, "endpoint": endpoint_template(url), "account": account,
+                    "attempt": attempt, "requeue": requeues, "rate_limit_wait": waited
+                }
+                call_hooks(self.hooks, "on_request", info)
+
+            if isinstance(files, MultipartBody):
+                # Тело multipart читается частями во время отправки
+                body = {"data": files.rewind(), "headers": {**(headers or {}), **files.headers}}
+            else:
+                body = {
+                    "json": data if method in ["POST", "PUT", "PATCH"] and not files else None,
+                    "files": files, "headers": headers
+                }
+
+            with self._semaphore or nullcontext():
+                started = time.perf_counter()
+                try:
+                    response = self.session.request(
+                        method=method,
+                        url=url,
+                        params=params if method == "GET" or params else None,
+                        timeout=self.timeout,
+                        **body
+                    )
+                except requests.exceptions.RequestException as e:
+                    if info is not None:
+                        info.update(elapsed=time.perf_counter() - started, error=str(e), error_type=self._error_type(e))
+                        call_hooks(self.hooks, "on_error", info)
+                    raise
+
+            if info is not None:
+                body = response.request.body
+                info.update(
+                    status=response.status_code,
+                    elapsed=time.perf_counter() - started,
+                    bytes_in=len(response.content),
+                    bytes_out=len(body) if isinstance(body, (bytes, str, MultipartBody)) else 0
+                )
+                call_hooks(self.hooks, "on_response", info)
+
+            if self.rate_limiter is None:
+                return response
+            self.rate_limiter.feedback(url, account, response.status_code, response.headers)
+
+            # Файлы уже прочитаны при отправке, поэтому такие запросы не повторяем (кроме MultipartBody)
+            if response.status_code != 429 or not can_resend(files) or requeues >= self.rate_limiter.max_requeues:
+                return response
+            requeues += 1
+            logger.warning(f"429 Too Many Requests, повтор {requeues} для {method} {url}")
+
     @staticmethod
-    def send_request(url, method="GET", headers=None, data=None, params=None, files=None):
+    def _error_type(error):
+        if isinstance(error, requests.exceptions.Timeout):
+            return TIMEOUT_ERROR
+        if isinstance(error, requests.exceptions.ConnectionError):
+            return CONNECTION_ERROR
+        return "request"
+
+    @_InstanceOrDefault
+    def send_request(self, url, method="GET", headers=None, data=None, params=None, files=None, account=None,
+                     retry=None):
         """
-        Отправляет HTTP запрос и обрабатывает ответ
+        Отправляет HTTP запрос и обрабатывает ответ.
+        Вызов на классе (RequestHandler.send_request(url, ...)) выполняется через default_handler()
         
         Args:
             url (str): URL для отправки запроса
@@ -20,9 +237,63 @@ class RequestHandler:
             data (dict): Данные для отправки в теле запроса
             params (dict): Параметры запроса для URL
             files (dict): Файлы для загрузки
+            account: Ключ аккаунта для ограничения частоты запросов (например, client_id)
+            retry: Политика повтора для этого вызова: None - по умолчанию, False - без повторов,
+                True - повторять независимо от метода, int - количество попыток, RetryPolicy
             
         Returns:
-            dict: Данные ответа в формате JSON или None в случае ошибки
+            dict: Данные ответа в формате JSON или None в случае ошибки.
+                Если были повторы, в словаре есть ключ "retries" с их количеством
+        """
+        cache_key = stale = None
+        if self.cache is not None:
+            cache_key, cached, stale = self.cache.lookup(method, url, params, data, account)
+            if cached is not None:
+                return cached
+            if stale is not None:
+                headers = {**(headers or {}), **stale.validators}
+
+        if self.coalescer is not None and method == "GET":
+            return self.coalescer.run(
+                self.coalescer.key(method, url, params, account, headers),
+                lambda: self._send_with_retries(url, method, headers, data, params, files, account, retry,
+                                                cache_key, stale)
+            )
+        return self._send_with_retries(url, method, headers, data, params, files, account, retry, cache_key, stale)
+
+    def _send_with_retries(self, url, method, headers, data, params, files, account, retry, cache_key, stale):
+        policy, force = resolve_retry(self.retry_policy, retry)
+        retries = 0
+        while True:
+            result, reason, retry_after = self._send_once(
+                url, method, headers, data, params, files, account, cache_key, stale, retries
+            )
+
+            # Файлы уже прочитаны при отправке, поэтому такие запросы не повторяем (кроме MultipartBody)
+            can_retry = retries + 1 < policy.max_attempts and can_resend(files)
+            # С ограничителем частоты 429 повторяет только _perform (не больше max_requeues раз)
+            if reason == 429 and self.rate_limiter is not None:
+                can_retry = False
+            if not (can_retry and policy.is_retryable(method, reason, force)):
+                break
+            retries += 1
+            delay = policy.get_delay(retries, retry_after)
+            logger.warning(f"Повтор {retries} для {method} {url} через {delay:.2f} с")
+            time.sleep(delay)
+
+        if retries and isinstance(result, dict):
+            result["retries"] = retries
+        if self.cache is not None and cache_key is None:
+            self.cache.invalidate_related(method, url, account)
+        return result
+
+    def _send_once(self, url, method, headers, data, params, files, account, cache_key=None, stale=None,
+                   attempt=0):
+        """
+        Одна попытка запроса
+
+        Returns:
+            tuple: (результат, причина для повтора или None, задержка из Retry-After)
         """
         try:
             # Добавляем информацию о запросе в лог для отладки
@@ -33,58 +304,59 @@ class RequestHandler:
                 logger.debug(f"Data: {json.dumps(data, ensure_ascii=False)}")
             
             # Выполняем запрос
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=data if method in ["POST", "PUT", "PATCH"] and not files else None,
-                params=params if method == "GET" or params else None,
-                files=files,
-                timeout=TIMEOUT
-            )
+            response = self._perform(url, method, headers, data, params, files, account, attempt)
             
             # Проверяем статус ответа
             response.raise_for_status()
             
+            # Данные не изменились с момента сохранения в кеш
+            if response.status_code == 304 and stale is not None:
+                return self.cache.revalidate(cache_key, stale, url, response.headers), None, None
+
             # Возвращаем данные в формате JSON
             if response.content:
-                return response.json()
+                result = response.json()
+                if cache_key is not None:
+                    self.cache.store(cache_key, url, result, response.headers)
+                return result, None, None
             else:
-                return {"status": "success"}
+                return {"status": "success"}, None, None
                 
         except requests.exceptions.HTTPError as e:
             # Ошибки HTTP (4xx, 5xx)
-            error_msg = f"HTTP Error: {e.response.status_code} - {e.response.reason}"
+            status_code = e.response.status_code
+            retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+            error_msg = f"HTTP Error: {status_code} - {e.response.reason}"
             logger.error(error_msg)
             
             # Пытаемся получить детали ошибки из тела ответа
             try:
                 error_details = e.response.json()
                 logger.error(f"Error details: {json.dumps(error_details, ensure_ascii=False)}")
-                return {"error": error_msg, "details": error_details, "status_code": e.response.status_code}
+                return {"error": error_msg, "details": error_details, "status_code": status_code}, status_code, retry_after
             except:
-                return {"error": error_msg, "status_code": e.response.status_code}
+                return {"error": error_msg, "status_code": status_code}, status_code, retry_after
                 
         except requests.exceptions.ConnectionError as e:
             # Ошибки соединения
             error_msg = f"Connection Error: {str(e)}"
             logger.error(error_msg)
-            return {"error": error_msg}
+            return {"error": error_msg}, CONNECTION_ERROR, None
             
         except requests.exceptions.Timeout as e:
             # Таймаут запроса
             error_msg = f"Timeout Error: {str(e)}"
             logger.error(error_msg)
-            return {"error": error_msg}
+            return {"error": error_msg}, TIMEOUT_ERROR, None
             
         except requests.exceptions.RequestException as e:
             # Другие ошибки запросов
             error_msg = f"Request Error: {str(e)}"
             logger.error(error_msg)
-            return {"error": error_msg}
+            return {"error": error_msg}, None, None
             
         except Exception as e:
             # Непредвиденные ошибки
             error_msg = f"Unexpected Error: {str(e)}"
             logger.error(error_msg)
-            return {"error": error_msg}
\ No newline at end of file
+            return {"error": error_msg}, None, None
@@ -0,0 +1,251 @@
+# /utils/response_cache.py
+import copy
+import json
+import threading
+import time
+import logging
+from collections import OrderedDict
+from .endpoints import match_endpoint, endpoint_path
+from ..config.settings import CACHE_TTLS, CACHE_MAXSIZE
+
+# Получаем логгер
+logger = logging.getLogger('avito_api')
+
+# POST-методы, которые только читают данные: их ответы можно кешировать по телу запроса
+READ_ONLY_POST_TEMPLATES = (
+    "/core/v1/accounts/{user_id}/vas/prices",
+)
+
+# Параметр пути, общий для всех ресурсов аккаунта: по нему кеш не сбрасывается
+ACCOUNT_PARAMS = ("user_id",)
+
+
+def _report_is_completed(response):
+    # Отчет выгрузки перестает меняться после завершения обработки
+    status = response.get("status")
+    return bool(status) and status != "processing"
+
+
+# Дополнительные условия кеширования ответа по шаблонам методов
+CACHE_CONDITIONS = {
+    "/autoload/v2/reports/{report_id}": _report_is_completed,
+}
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "etag", "last_modified", "path", "resource_ids")
+
+    def __init__(self, value, expires_at, etag, last_modified, path, resource_ids):
+        self.value = value
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.path = path
+        self.resource_ids = resource_ids
+
+    @property
+    def validators(self):
+        # Заголовки условного запроса: сервер ответит 304, если данные не изменились
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def _resource_ids(params):
+    return frozenset(value for name, value in params.items() if name not in ACCOUNT_PARAMS)
+
+
+class ResponseCache:
+    def __init__(self, ttls=None, maxsize=CACHE_MAXSIZE):
+        """
+        Кеш ответов для методов, данные которых редко меняются.
+
+        Время жизни задается по шаблонам методов (см. ENDPOINT_TEMPLATES), методы без
+        времени жизни не кешируются. Устаревшая запись с ETag или Last-Modified
+        проверяется условным запросом, и при ответе 304 используется снова.
+        Изменяющий запрос (POST, PUT, DELETE) к тому же ресурсу удаляет записи из кеша.
+        Записи разделены по аккаунтам; запрос без ключа аккаунта не кешируется, чтобы
+        ответ одного аккаунта не достался другому.
+
+        Args:
+            ttls (dict): {шаблон метода: время жизни в секундах}, дополняет CACHE_TTLS
+            maxsize (int): Максимальное количество записей (вытесняются давно не использованные)
+        """
+        self.ttls = dict(CACHE_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _is_cacheable(self, method, template):
+        if not self.ttls.get(template):
+            return False
+        return method == "GET" or (method == "POST" and template in READ_ONLY_POST_TEMPLATES)
+
+    def lookup(self, method, url, params=None, data=None, account=None):
+        """
+        Ищет ответ в кеше
+
+        Args:
+            method (str): HTTP метод
+            url (str): URL запроса
+            params (dict): Параметры запроса
+            data (dict): Тело запроса (для POST-методов, которые только читают данные)
+            account: Ключ аккаунта (client_id или хеш токена, см. Authentication.account)
+
+        Returns:
+            tuple: (ключ или None, если метод не кешируется или аккаунт неизвестен;
+                    копия ответа, если запись актуальна;
+                    устаревшая запись для условного запроса или None)
+        """
+        if account is None:
+            return None, None, None
+        template, _ = match_endpoint(url)
+        if not self._is_cacheable(method, template):
+            return None, None, None
+
+        key = (
+            account,
+            method,
+            url,
+            tuple(sorted((k, str(v)) for k, v in (params or {}).items())),
+            json.dumps(data, sort_keys=True, ensure_ascii=False) if data else None,
+        )
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return key, None, None
+            if entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return key, copy.deepcopy(entry.value), None
+            self.misses += 1
+            if not entry.validators:
+                del self._entries[key]
+                return key, None, None
+        return key, None, entry
+
+    def store(self, key, url, value, headers):
+        """
+        Сохраняет успешный ответ
+
+        Args:
+            key: Ключ из lookup
+            url (str): URL запроса
+            value (dict): Ответ в формате JSON
+            headers (dict): Заголовки ответа (ETag, Last-Modified, Cache-Control)
+        """
+        template, path_params = match_endpoint(url)
+        condition = CACHE_CONDITIONS.get(template)
+        if not isinstance(value, dict) or (condition is not None and not condition(value)):
+            return
+        if "no-store" in (headers.get("Cache-Control") or ""):
+            return
+
+        entry = _Entry(
+            copy.deepcopy(value),
+            time.monotonic() + self.ttls[template],
+            headers.get("ETag"),
+            headers.get("Last-Modified"),
+            endpoint_path(url),
+            _resource_ids(path_params),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def revalidate(self, key, entry, url, headers):
+        """
+        Сервер ответил 304: данные не изменились, запись снова актуальна
+
+        Args:
+            key: Ключ из lookup
+            entry: Устаревшая запись из lookup
+            url (str): URL запроса
+            headers (dict): Заголовки ответа 304
+
+        Returns:
+            dict: Копия сохраненного ответа
+        """
+        template, _ = match_endpoint(url)
+        with self._lock:
+            entry.expires_at = time.monotonic() + self.ttls[template]
+            entry.etag = headers.get("ETag") or entry.etag
+            entry.last_modified = headers.get("Last-Modified") or entry.last_modified
+            # Запись могла быть вытеснена, пока шел запрос
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            self.revalidations += 1
+            return copy.deepcopy(entry.value)
+
+    def invalidate_related(self, method, url, account=None):
+        """
+        Удаляет записи, которые мог изменить запрос: тот же путь или тот же ресурс
+        (например, update_price объявления сбрасывает get_item_info этого объявления)
+
+        Args:
+            method (str): HTTP метод
+            url (str): URL изменяющего запроса
+            account: Ключ аккаунта
+
+        Returns:
+            int: Количество удаленных записей
+        """
+        if method in ("GET", "HEAD", "OPTIONS"):
+            return 0
+        path = endpoint_path(url)
+        _, path_params = match_endpoint(url)
+        ids = _resource_ids(path_params)
+        with self._lock:
+            keys = [
+                key for key, entry in self._entries.items()
+                if key[0] == account and (entry.path == path or entry.resource_ids & ids)
+            ]
+            for key in keys:
+                del self._entries[key]
+        if keys:
+            logger.debug(f"Кеш: {method} {path} удалил {len(keys)} записей")
+        return len(keys)
+
+    def invalidate(self, account=None, template=None):
+        """
+        Удаляет записи аккаунта и/или метода
+
+        Args:
+            account: Ключ аккаунта (None - все аккаунты)
+            template (str): Шаблон метода (None - все методы)
+
+        Returns:
+            int: Количество удаленных записей
+        """
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if (account is None or key[0] == account)
+                and (template is None or match_endpoint(key[2])[0] == template)
+            ]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        """
+        Очищает кеш
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,109 @@
+# /utils/retry.py
+import random
+from ..config.settings import RETRY_MAX_ATTEMPTS, RETRY_BACKOFF_FACTOR, RETRY_MAX_BACKOFF
+
+# Причины повтора, не связанные с кодом ответа
+CONNECTION_ERROR = "connection"
+TIMEOUT_ERROR = "timeout"
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts=RETRY_MAX_ATTEMPTS, backoff_factor=RETRY_BACKOFF_FACTOR,
+                 max_backoff=RETRY_MAX_BACKOFF, jitter=True,
+                 retry_methods=("GET", "HEAD", "PUT", "DELETE", "OPTIONS"),
+                 retry_statuses=(429, 500, 502, 503, 504)):
+        """
+        Политика повтора запросов: экспоненциальная задержка со случайным разбросом.
+
+        По умолчанию повторяются только идемпотентные методы. Ответ 429 повторяется для любого метода,
+        так как сервер не выполнял такой запрос. Если у обработчика есть RateLimiter, 429 повторяет
+        только он (max_requeues), и политика такие ответы не повторяет.
+
+        Args:
+            max_attempts (int): Общее количество попыток (1 - без повторов)
+            backoff_factor (float): Базовая задержка: backoff_factor * 2 ** (номер повтора - 1)
+            max_backoff (float): Максимальная задержка в секундах
+            jitter (bool): Случайная задержка от 0 до расчетной (full jitter)
+            retry_methods (tuple): Методы, которые можно повторять
+            retry_statuses (tuple): Коды ответа, после которых запрос повторяется
+        """
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_methods = tuple(m.upper() for m in retry_methods)
+        self.retry_statuses = tuple(retry_statuses)
+
+    def is_retryable(self, method, reason, force=False):
+        """
+        Проверяет, можно ли повторить запрос
+
+        Args:
+            method (str): HTTP метод
+            reason: Код ответа, CONNECTION_ERROR, TIMEOUT_ERROR или None
+            force (bool): Повторять независимо от метода (для POST-методов, которые только читают данные)
+
+        Returns:
+            bool: True если запрос можно повторить
+        """
+        if reason is None:
+            return False
+        if reason == 429:
+            return 429 in self.retry_statuses
+        if not force and method.upper() not in self.retry_methods:
+            return False
+        return reason in (CONNECTION_ERROR, TIMEOUT_ERROR) or reason in self.retry_statuses
+
+    def get_delay(self, retry_number, retry_after=None):
+        """
+        Рассчитывает задержку перед повтором
+
+        Args:
+            retry_number (int): Номер повтора, начиная с 1
+            retry_after (float): Задержка из заголовка Retry-After
+
+        Returns:
+            float: Задержка в секундах
+        """
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** (retry_number - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
+
+
+# Политика по умолчанию для обработчиков запросов и политика без повторов
+DEFAULT_RETRY_POLICY = RetryPolicy()
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def resolve_retry(default_policy, retry):
+    """
+    Определяет политику повтора для конкретного вызова
+
+    Args:
+        default_policy (RetryPolicy): Политика обработчика запросов
+        retry: None - политика по умолчанию, False - без повторов, True - повторять независимо от метода,
+            int - количество попыток, RetryPolicy - своя политика
+
+    Returns:
+        tuple: (RetryPolicy, force)
+    """
+    if retry is None:
+        return default_policy or NO_RETRY, False
+    if retry is False:
+        return NO_RETRY, False
+    if retry is True:
+        return default_policy or RetryPolicy(), True
+    if isinstance(retry, int):
+        base = default_policy or RetryPolicy()
+        return RetryPolicy(
+            max_attempts=retry,
+            backoff_factor=base.backoff_factor,
+            max_backoff=base.max_backoff,
+            jitter=base.jitter,
+            retry_methods=base.retry_methods,
+            retry_statuses=base.retry_statuses
+        ), False
+    return retry, False
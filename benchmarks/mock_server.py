@@ -0,0 +1,419 @@
+# /benchmarks/mock_server.py
+"""
+Локальный mock-сервер API Авито для бенчмарков.
+
+Имитирует методы, которые используют AutoloadClient, ItemClient, ServicesClient,
+MessengerClient и Authentication: постраничную выдачу с meta, задержку ответа,
+ответы 429 с Retry-After и ответы 5xx.
+
+Запуск отдельно: python benchmarks/mock_server.py --port 8000 --latency 0.02
+"""
+
+import argparse
+import json
+import random
+import re
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+
+class MockState:
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit=0, items=1000, chats=50,
+                 messages_per_chat=30, voice_size=256 * 1024, voice_cut=0, upload_duration=0.5, seed=0):
+        """
+        Настройки и счетчики mock-сервера
+
+        Args:
+            latency (float): Задержка каждого ответа в секундах
+            jitter (float): Случайная добавка к задержке (от 0 до jitter секунд)
+            error_rate (float): Доля ответов 503 (от 0 до 1)
+            rate_limit (int): Запросов в секунду, после которых сервер отвечает 429 (0 - без ограничения)
+            items (int): Количество объявлений в выдаче и в отчетах
+            chats (int): Количество чатов
+            messages_per_chat (int): Количество сообщений в каждом чате
+            voice_size (int): Размер файла голосового сообщения в байтах
+            voice_cut (int): Обрывать первую загрузку каждого голосового сообщения после стольких байт (0 - не обрывать)
+            upload_duration (float): Сколько секунд обрабатывается выгрузка после upload
+            seed (int): Начальное значение генератора случайных чисел
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.items = items
+        self.chats = chats
+        self.messages_per_chat = messages_per_chat
+        self.voice_size = voice_size
+        self.voice_cut = voice_cut
+        self.voices_cut = set()
+        self.upload_duration = upload_duration
+        # Выгрузки: (ID отчета, время запуска); отчет 1 уже завершен
+        self.uploads = [(1, time.time() - 3600 - upload_duration)]
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Сбрасывает счетчики запросов
+        """
+        with self.lock:
+            self.requests = 0
+            self.by_path = {}
+            self.statuses = {}
+            self.token_requests = 0
+            self._window = []
+
+    def count(self, method, template):
+        with self.lock:
+            self.requests += 1
+            key = f"{method} {template}"
+            self.by_path[key] = self.by_path.get(key, 0) + 1
+            if template == "/token/":
+                self.token_requests += 1
+
+    def record_status(self, status):
+        with self.lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def delay(self):
+        with self.lock:
+            extra = self.random.uniform(0, self.jitter) if self.jitter else 0.0
+        return self.latency + extra
+
+    def fail(self):
+        """
+        Решает, ответить ли 503 или 429
+
+        Returns:
+            tuple: (код ответа или None, заголовки)
+        """
+        now = time.monotonic()
+        with self.lock:
+            if self.rate_limit:
+                self._window = [t for t in self._window if now - t < 1.0]
+                if len(self._window) >= self.rate_limit:
+                    retry_after = max(0.05, 1.0 - (now - self._window[0]))
+                    return 429, {"Retry-After": f"{retry_after:.2f}"}
+                self._window.append(now)
+            if self.error_rate and self.random.random() < self.error_rate:
+                return 503, {}
+        return None, {}
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "token_requests": self.token_requests,
+                "statuses": dict(self.statuses),
+                "by_path": dict(self.by_path),
+            }
+
+
+def _page(total, page, per_page):
+    start = page * per_page
+    return range(start, min(total, start + per_page)), max(1, -(-total // per_page))
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None
+
+    # (метод, регулярное выражение пути, имя обработчика, шаблон для счетчиков)
+    routes = []
+
+    def setup(self):
+        super().setup()
+        # Без задержки Нагла: заголовки и тело ответа отправляются отдельными записями
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, payload=None, headers=None):
+        body = json.dumps(payload if payload is not None else {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.state.record_status(status)
+
+    def _handle(self):
+        url = urlsplit(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        for method, regex, handler, template in self.routes:
+            match = regex.match(url.path)
+            if method == self.command and match:
+                break
+        else:
+            self.state.count(self.command, url.path)
+            return self._reply(404, {"error": {"message": "not found"}})
+
+        self.state.count(self.command, template)
+        delay = self.state.delay()
+        if delay:
+            time.sleep(delay)
+        if template != "/token/":
+            status, headers = self.state.fail()
+            if status is not None:
+                return self._reply(status, {"error": {"code": status}}, headers)
+
+        try:
+            body = json.loads(raw) if raw and self.headers.get("Content-Type", "").startswith("application/json") else {}
+        except ValueError:
+            return self._reply(400, {"error": {"message": "bad json"}})
+        result = getattr(self, handler)(query, body, **match.groupdict())
+        # Обработчики файлов отправляют ответ сами и возвращают None
+        if result is not None:
+            self._reply(*result)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    # Обработчики методов: возвращают (код ответа, тело)
+
+    def token(self, query, body):
+        return 200, {"access_token": f"mock-{time.time_ns()}", "expires_in": 86400, "token_type": "Bearer"}
+
+    def self_info(self, query, body):
+        return 200, {"id": 1, "name": "Mock", "email": "mock@example.com"}
+
+    def items(self, query, body):
+        per_page = int(query.get("per_page", 25))
+        # iter_all_items начинает с page=0
+        ids, _ = _page(self.state.items, int(query.get("page", 0)), per_page)
+        return 200, {"meta": {"page": int(query.get("page", 0)), "per_page": per_page},
+                     "resources": [{"id": i, "status": "active", "title": f"Item {i}", "price": 1000 + i,
+                                    "category": {"id": 9, "name": "Телефоны"}} for i in ids]}
+
+    def item_info(self, query, body, user_id, item_id):
+        return 200, {"status": "active", "url": f"https://avito.ru/{item_id}", "autoload_item_id": f"AD{item_id}"}
+
+    def update_price(self, query, body, item_id):
+        return 200, {"result": {"success": True}}
+
+    def stocks(self, query, body):
+        return 200, {"stocks": [{"item_id": s.get("item_id"), "success": True, "errors": []}
+                                for s in body.get("stocks", [])]}
+
+    def items_stats(self, query, body, user_id):
+        return 200, {"result": {"items": [
+            {"itemId": item_id, "stats": [{"date": body.get("dateFrom"), "uniqViews": 10, "uniqContacts": 1}]}
+            for item_id in body.get("itemIds", [])
+        ]}}
+
+    def _report(self, report_id, started):
+        finished = started + self.state.upload_duration
+        done = finished <= time.time()
+        report = {"report_id": report_id, "status": "success" if done else "processing",
+                  "started_at": datetime.fromtimestamp(started, timezone.utc).isoformat()}
+        if done:
+            report["finished_at"] = datetime.fromtimestamp(finished, timezone.utc).isoformat()
+        return report
+
+    def upload(self, query, body):
+        with self.state.lock:
+            self.state.uploads.append((self.state.uploads[-1][0] + 1, time.time()))
+        return 200, {}
+
+    def report(self, query, body, report_id):
+        started = dict(self.state.uploads).get(int(report_id), time.time() - 3600)
+        return 200, self._report(int(report_id), started)
+
+    def last_report(self, query, body):
+        with self.state.lock:
+            uploads = list(self.state.uploads)
+        for report_id, started in reversed(uploads):
+            report = self._report(report_id, started)
+            if report["status"] != "processing":
+                return 200, report
+        return 404, {"error": {"message": "no completed reports"}}
+
+    def report_items(self, query, body, report_id):
+        ids, pages = _page(self.state.items, int(query.get("page", 0)), int(query.get("per_page", 50)))
+        return 200, {"meta": {"page": int(query.get("page", 0)), "pages": pages, "total": self.state.items},
+                     "items": [{"ad_id": f"AD{i}", "avito_id": 100000 + i, "section": {"slug": "success"}} for i in ids]}
+
+    def report_fees(self, query, body, report_id):
+        ids, pages = _page(self.state.items, int(query.get("page", 0)), int(query.get("per_page", 100)))
+        return 200, {"meta": {"page": int(query.get("page", 0)), "pages": pages, "total": self.state.items},
+                     "fees": [{"ad_id": f"AD{i}", "avito_id": 100000 + i, "amount": 10} for i in ids]}
+
+    def profile(self, query, body):
+        return 200, {"autoload_enabled": True, "upload_url": "https://example.com/feed.xml"}
+
+    def id_mapping(self, query, body):
+        ids = [i for i in query.get("query", "").replace("|", ",").split(",") if i]
+        return 200, {"items": [{"ad_id": f"AD{i}" if i.isdigit() else i,
+                                "avito_id": int(i) if i.isdigit() else 100000 + int(i[2:] or 0)} for i in ids]}
+
+    def chats(self, query, body, user_id):
+        offset, limit = int(query.get("offset", 0)), int(query.get("limit", 100))
+        chats = [{"id": f"chat-{i}", "updated": 1700000000 + self.state.chats - i,
+                  "last_message": {"id": f"chat-{i}-m{self.state.messages_per_chat - 1}"}}
+                 for i in range(offset, min(self.state.chats, offset + limit))]
+        return 200, {"chats": chats}
+
+    def messages(self, query, body, user_id, chat_id):
+        offset, limit = int(query.get("offset", 0)), int(query.get("limit", 100))
+        total = self.state.messages_per_chat
+        # Сообщения отдаются от новых к старым
+        numbers = range(total - 1 - offset, max(-1, total - 1 - offset - limit), -1)
+        return 200, {"messages": [{"id": f"{chat_id}-m{n}", "created": 1700000000 + n, "type": "text",
+                                   "content": {"text": f"message {n}"}} for n in numbers]}
+
+    def upload_images(self, query, body, user_id):
+        # Тело multipart не разбирается: ID изображения - номер загрузки
+        image_id = f"{self.state.requests}.{time.time_ns()}"
+        return 200, {image_id: {"1280x960": f"https://example.com/{image_id}.jpg"}}
+
+    def voice_files(self, query, body, user_id):
+        base = f"http://{self.headers.get('Host')}/files/voice"
+        ids = [i for i in query.get("voice_ids", "").split(",") if i]
+        return 200, {"voices_urls": {i: f"{base}/{i}.m4a" for i in ids}}
+
+    def voice_file(self, query, body, voice_id):
+        # Файл отдается с поддержкой Range; первая загрузка может обрываться (voice_cut)
+        size, start = self.state.voice_size, 0
+        match = re.match(r"bytes=(\d+)-", self.headers.get("Range") or "")
+        if match:
+            start = int(match.group(1))
+            if start >= size:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+        payload = bytes(i % 251 for i in range(start, size))
+        self.send_response(206 if match else 200)
+        self.send_header("Content-Type", "audio/mp4")
+        self.send_header("Content-Length", str(len(payload)))
+        if match:
+            self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+        self.end_headers()
+        with self.state.lock:
+            cut = self.state.voice_cut and voice_id not in self.state.voices_cut
+            self.state.voices_cut.add(voice_id)
+        if cut:
+            self.wfile.write(payload[:self.state.voice_cut])
+            self.wfile.flush()
+            self.close_connection = True
+            try:
+                self.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            return None
+        self.wfile.write(payload)
+        self.state.record_status(206 if match else 200)
+        return None
+
+    def image_message(self, query, body, user_id, chat_id):
+        return 200, {"id": f"{chat_id}-img", "type": "image", "content": {"image": {"id": body.get("image_id")}}}
+
+
+def _route(method, template, handler):
+    pattern = re.sub(r"\\\{(\w+)\\\}", r"(?P<\1>[^/]+)", re.escape(template.rstrip("/")))
+    return method, re.compile("^" + pattern + "/?$"), handler, template
+
+
+MockHandler.routes = [
+    _route("POST", "/token/", "token"),
+    _route("GET", "/core/v1/accounts/self", "self_info"),
+    _route("GET", "/core/v1/items", "items"),
+    _route("GET", "/core/v1/accounts/{user_id}/items/{item_id}/", "item_info"),
+    _route("POST", "/core/v1/items/{item_id}/update_price", "update_price"),
+    _route("PUT", "/stock-management/1/stocks", "stocks"),
+    _route("POST", "/stats/v1/accounts/{user_id}/items", "items_stats"),
+    _route("GET", "/autoload/v1/profile", "profile"),
+    _route("POST", "/autoload/v1/upload", "upload"),
+    _route("GET", "/autoload/v2/items/ad_ids", "id_mapping"),
+    _route("GET", "/autoload/v2/items/avito_ids", "id_mapping"),
+    _route("GET", "/autoload/v2/reports/last_completed_report", "last_report"),
+    _route("GET", "/autoload/v2/reports/{report_id}", "report"),
+    _route("GET", "/autoload/v2/reports/{report_id}/items", "report_items"),
+    _route("GET", "/autoload/v2/reports/{report_id}/items/fees", "report_fees"),
+    _route("GET", "/messenger/v2/accounts/{user_id}/chats", "chats"),
+    _route("GET", "/messenger/v3/accounts/{user_id}/chats/{chat_id}/messages/", "messages"),
+    _route("POST", "/messenger/v1/accounts/{user_id}/uploadImages", "upload_images"),
+    _route("GET", "/messenger/v1/accounts/{user_id}/getVoiceFiles", "voice_files"),
+    _route("GET", "/files/voice/{voice_id}", "voice_file"),
+    _route("POST", "/messenger/v1/accounts/{user_id}/chats/{chat_id}/messages/image", "image_message"),
+]
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Очередь входящих соединений по умолчанию - 5: при десятках одновременных клиентов
+    # лишние SYN отбрасываются, и клиент повторяет соединение через секунду
+    request_queue_size = 128
+
+
+class MockServer:
+    def __init__(self, host="127.0.0.1", port=0, **options):
+        """
+        Mock-сервер в фоновом потоке
+
+        Args:
+            host (str): Адрес
+            port (int): Порт (0 - любой свободный)
+            **options: Настройки MockState (latency, error_rate, rate_limit, items, ...)
+        """
+        self.state = MockState(**options)
+        handler = type("BoundMockHandler", (MockHandler,), {"state": self.state})
+        self.httpd = _HTTPServer((host, port), handler)
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="avito-mock", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock-сервер API Авито")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=0)
+    parser.add_argument("--items", type=int, default=1000)
+    args = parser.parse_args()
+
+    server = MockServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, rate_limit=args.rate_limit, items=args.items)
+    print(f"Mock API: {server.url} (AVITO_API_BASE_URL={server.url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
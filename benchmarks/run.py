@@ -0,0 +1,348 @@
+# /benchmarks/run.py
+"""
+Бенчмарки клиента на локальном mock-сервере API Авито.
+
+Сценарии: запуск клиента, постраничная загрузка (последовательно и параллельно, с предзагрузкой
+и без), массовое обновление цен и остатков, обновление токена при одновременных запросах,
+обработка 429 и 5xx, одинаковые одновременные GET-запросы (с объединением и без),
+асинхронный клиент (если установлен aiohttp).
+
+Результат - JSON: для каждого сценария количество операций, время, пропускная способность
+и перцентили задержки. С --baseline результат сравнивается с предыдущим запуском,
+и при падении пропускной способности больше чем на --threshold скрипт завершается с кодом 1.
+
+    python benchmarks/run.py --latency 0.02 --output results.json
+    python benchmarks/run.py --baseline results.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import MockServer  # noqa: E402
+
+CLIENT_ID = "bench-client"
+CLIENT_SECRET = "bench-secret"
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(percent / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def measure(name, func, repeat, units=None, **extra):
+    """
+    Выполняет func() repeat раз и собирает задержку каждой операции
+
+    Args:
+        name (str): Название сценария
+        func (callable): Операция; может вернуть количество обработанных единиц (объявлений, строк)
+        repeat (int): Количество повторов
+        units (str): Название единиц для пропускной способности по единицам
+
+    Returns:
+        dict: Результат сценария
+    """
+    latencies, processed = [], 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        op_started = time.perf_counter()
+        result = func()
+        latencies.append(time.perf_counter() - op_started)
+        if isinstance(result, int):
+            processed += result
+    return _result(name, latencies, time.perf_counter() - started, processed, units, **extra)
+
+
+async def async_measure(name, func, repeat, units=None, **extra):
+    latencies, processed = [], 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        op_started = time.perf_counter()
+        result = await func()
+        latencies.append(time.perf_counter() - op_started)
+        if isinstance(result, int):
+            processed += result
+    return _result(name, latencies, time.perf_counter() - started, processed, units, **extra)
+
+
+def _result(name, latencies, seconds, processed, units, **extra):
+    result = {
+        "name": name,
+        "ops": len(latencies),
+        "seconds": round(seconds, 4),
+        "ops_per_sec": round(len(latencies) / seconds, 2) if seconds else 0.0,
+        "latency": {
+            "mean": round(sum(latencies) / len(latencies), 5) if latencies else 0.0,
+            "p50": round(_percentile(latencies, 50), 5),
+            "p95": round(_percentile(latencies, 95), 5),
+            "p99": round(_percentile(latencies, 99), 5),
+        },
+    }
+    if units:
+        result[units] = processed
+        result[f"{units}_per_sec"] = round(processed / seconds, 2) if seconds else 0.0
+    result.update(extra)
+    return result
+
+
+def bench_startup(api, server, repeat):
+    results = []
+    for lazy_auth in (False, True):
+        def run():
+            client = api.AvitoAPIClient(client_id=CLIENT_ID, client_secret=CLIENT_SECRET, lazy_auth=lazy_auth)
+            client.close()
+        results.append(measure("client_startup_lazy" if lazy_auth else "client_startup", run, repeat,
+                               lazy_auth=lazy_auth))
+    return results
+
+
+def bench_pagination(api, client, server, repeat):
+    results = []
+    for workers in (1, 8):
+        results.append(measure(
+            f"report_items_workers_{workers}",
+            lambda: len(client.autoload.get_report_items(1, per_page=50, max_workers=workers)),
+            repeat, units="items", max_workers=workers,
+        ))
+    for prefetch in (False, True):
+        results.append(measure(
+            f"iter_all_items_prefetch_{'on' if prefetch else 'off'}",
+            lambda: sum(1 for _ in client.autoload.iter_all_items(per_page=100, prefetch=prefetch)),
+            repeat, units="items", prefetch=prefetch,
+        ))
+    return results
+
+
+def bench_bulk_update(api, client, server, repeat, rows):
+    from avito_api.services_item import BulkUpdater
+    with tempfile.TemporaryDirectory() as directory:
+        updater = BulkUpdater(client.services, os.path.join(directory, "snapshot.db"))
+        table = [{"item_id": i, "price": 1000 + i, "quantity": i % 10} for i in range(rows)]
+
+        def run():
+            report = updater.push(table, force=True)
+            return sum(1 for result in report.values() if result["price"] == "updated")
+        return measure("bulk_update_push", run, repeat, units="rows",
+                       rows=rows, max_workers=updater.max_workers, stock_batch_size=updater.stock_batch_size)
+
+
+def bench_token_refresh(api, client, server, repeat, threads):
+    token_requests = []
+
+    def run():
+        # Токен считается истекшим: все потоки одновременно запрашивают заголовки
+        client.auth.token_expires_at = 1
+        before = server.state.snapshot()["token_requests"]
+        barrier = threading.Barrier(threads)
+
+        def worker():
+            barrier.wait()
+            client.auth.get_headers()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        token_requests.append(server.state.snapshot()["token_requests"] - before)
+
+    result = measure("token_refresh_concurrent", run, repeat, threads=threads)
+    result["token_requests_per_refresh"] = max(token_requests) if token_requests else 0
+    return result
+
+
+def bench_coalescing(api, server, repeat, threads):
+    results = []
+    for name, coalesce in (("duplicate_gets_coalesced", True), ("duplicate_gets_uncoalesced", False)):
+        client = api.AvitoAPIClient(client_id=CLIENT_ID, client_secret=CLIENT_SECRET, pool_maxsize=threads,
+                                    coalesce=coalesce)
+        server_requests = []
+
+        def run():
+            # Все потоки одновременно запрашивают одно и то же объявление
+            before = server.state.snapshot()["requests"]
+            barrier = threading.Barrier(threads)
+
+            def worker():
+                barrier.wait()
+                client.item.get_item_info(1, 42)
+
+            workers = [threading.Thread(target=worker) for _ in range(threads)]
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            server_requests.append(server.state.snapshot()["requests"] - before)
+            return threads
+
+        try:
+            result = measure(name, run, repeat, units="calls", threads=threads)
+        finally:
+            client.close()
+        result["server_requests_per_burst"] = max(server_requests) if server_requests else 0
+        results.append(result)
+    return results
+
+
+def bench_errors(api, server, repeat, error_rate, rate_limit):
+    from avito_api.utils.retry import RetryPolicy
+    results = []
+    client = api.AvitoAPIClient(
+        client_id=CLIENT_ID, client_secret=CLIENT_SECRET,
+        retry_policy=RetryPolicy(max_attempts=5, backoff_factor=0.01, max_backoff=0.1),
+    )
+    try:
+        for name, options in (("errors_5xx", {"error_rate": error_rate}), ("errors_429", {"rate_limit": rate_limit})):
+            server.state.error_rate = options.get("error_rate", 0.0)
+            server.state.rate_limit = options.get("rate_limit", 0)
+            server.state.reset()
+
+            def run():
+                response = client.autoload.get_profile()
+                return 0 if "error" in response else 1
+
+            result = measure(name, run, repeat, units="succeeded", **options)
+            result["server"] = {"requests": server.state.snapshot()["requests"],
+                                "statuses": server.state.snapshot()["statuses"]}
+            results.append(result)
+    finally:
+        server.state.error_rate = 0.0
+        server.state.rate_limit = 0
+        client.close()
+    return results
+
+
+def bench_async(api, server, repeat):
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        return []
+
+    async def run():
+        async with api.AsyncAvitoAPIClient(client_id=CLIENT_ID, client_secret=CLIENT_SECRET) as client:
+            async def fetch():
+                return len(await client.autoload.get_report_items(1, per_page=50, max_workers=8))
+            return [await async_measure("async_report_items_workers_8", fetch, repeat, units="items", max_workers=8)]
+
+    return asyncio.run(run())
+
+
+def compare(results, baseline, threshold):
+    """
+    Сравнивает пропускную способность с предыдущим запуском
+
+    Returns:
+        list: Сценарии, где ops_per_sec упал больше чем на threshold
+    """
+    previous = {result["name"]: result for result in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        before = previous.get(result["name"])
+        if not before or not before.get("ops_per_sec"):
+            continue
+        change = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        result["change"] = round(change, 4)
+        if change < -threshold:
+            regressions.append({"name": result["name"], "before": before["ops_per_sec"],
+                                "after": result["ops_per_sec"], "change": round(change, 4)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки avito_api на mock-сервере")
+    parser.add_argument("--latency", type=float, default=0.01, help="Задержка ответа mock-сервера, с")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Случайная добавка к задержке, с")
+    parser.add_argument("--items", type=int, default=1000, help="Объявлений в выдаче и отчетах")
+    parser.add_argument("--repeat", type=int, default=5, help="Повторов каждого сценария")
+    parser.add_argument("--rows", type=int, default=500, help="Строк для массового обновления")
+    parser.add_argument("--threads", type=int, default=32, help="Потоков в сценарии обновления токена")
+    parser.add_argument("--error-rate", type=float, default=0.2, help="Доля ответов 503 в сценарии errors_5xx")
+    parser.add_argument("--rate-limit", type=int, default=20, help="Запросов в секунду до 429 в сценарии errors_429")
+    parser.add_argument("--scenarios", default="startup,pagination,bulk,token,coalesce,errors,async",
+                        help="Сценарии через запятую")
+    parser.add_argument("--output", help="Файл для результата (по умолчанию stdout)")
+    parser.add_argument("--baseline", help="Предыдущий результат для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Допустимое падение ops_per_sec (0.2 = 20%%)")
+    parser.add_argument("--verbose", action="store_true", help="Показывать логи клиента")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    scenarios = set(args.scenarios.split(","))
+
+    server = MockServer(latency=args.latency, jitter=args.jitter, items=args.items).start()
+    # Адрес API читается из окружения при импорте настроек
+    os.environ["AVITO_API_BASE_URL"] = server.url
+    import avito_api as api
+    logging.getLogger("avito_api").setLevel(logging.INFO if args.verbose else logging.CRITICAL)
+
+    results = []
+    try:
+        if "startup" in scenarios:
+            results.extend(bench_startup(api, server, args.repeat))
+
+        client = api.AvitoAPIClient(client_id=CLIENT_ID, client_secret=CLIENT_SECRET, pool_maxsize=max(10, args.threads))
+        try:
+            if "pagination" in scenarios:
+                results.extend(bench_pagination(api, client, server, args.repeat))
+            if "bulk" in scenarios:
+                results.append(bench_bulk_update(api, client, server, args.repeat, args.rows))
+            if "token" in scenarios:
+                results.append(bench_token_refresh(api, client, server, args.repeat, args.threads))
+        finally:
+            client.close()
+
+        if "coalesce" in scenarios:
+            results.extend(bench_coalescing(api, server, args.repeat, args.threads))
+        if "errors" in scenarios:
+            results.extend(bench_errors(api, server, args.repeat * 10, args.error_rate, args.rate_limit))
+        if "async" in scenarios:
+            results.extend(bench_async(api, server, args.repeat))
+    finally:
+        server.stop()
+
+    report = {
+        "meta": {
+            "timestamp": int(time.time()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "items": args.items,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        report["regressions"] = regressions
+        exit_code = 1 if regressions else 0
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
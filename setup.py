@@ -5,10 +5,14 @@ from setuptools import setup, find_packages
 setup(
     name="avito_api",
     version="1.0.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests", "tests.*"]),
     install_requires=[
         "requests",  # Указываем минимальную версию для совместимости
     ],
+    extras_require={
+        "async": ["aiohttp"],  # Для AsyncAvitoAPIClient
+        "parquet": ["pyarrow", "numpy"],  # Для выгрузки в Parquet (avito_api.export)
+    },
     author="vukeep",
     author_email="vukeep@gmail.com",
     description="API клиент для работы с Avito API",
@@ -0,0 +1,16 @@
+# tests/conftest.py
+# Адрес API задается до импорта avito_api: модули читают его при загрузке настроек
+
+import os
+import pytest
+from tests.server import TestServer
+
+SERVER = TestServer().start()
+os.environ["AVITO_API_BASE_URL"] = SERVER.url
+
+
+@pytest.fixture
+def server():
+    SERVER.reset()
+    yield SERVER
+    SERVER.reset()
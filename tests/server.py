@@ -0,0 +1,132 @@
+# tests/server.py
+# Локальный HTTP-сервер для тестов: ответы задаются функциями по методу и пути
+
+import sys
+import json
+import threading
+from urllib.parse import urlsplit, parse_qsl
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class Request:
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+    @property
+    def token(self):
+        return self.headers.get("Authorization")
+
+    def json(self):
+        return json.loads(self.body) if self.body else None
+
+
+def echo(request):
+    """
+    Ответ по умолчанию: заголовок авторизации и путь запроса
+    """
+    return 200, {"who": request.token, "path": request.path}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address):
+        # Клиент закрыл соединение раньше (отмена предзагрузки, таймаут) - это не ошибка теста
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class TestServer:
+    __test__ = False
+
+    def __init__(self):
+        """
+        Сервер на свободном порту локального адреса.
+
+        Ответ на маршрут задается функцией func(request), которая возвращает
+        (статус, тело) или (статус, тело, заголовки); тело - dict/list (JSON), bytes, None или
+        итератор частей bytes (отправляются по мере получения; если частей меньше Content-Length,
+        соединение обрывается).
+        Для маршрута без функции отвечает echo.
+        """
+        self.routes = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        handler = self._handler_class()
+        self._httpd = _Server(("127.0.0.1", 0), handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def route(self, method, path, func):
+        self.routes[(method, path)] = func
+
+    def reset(self):
+        with self._lock:
+            self.routes.clear()
+            self.requests.clear()
+
+    def count(self, method=None, path=None):
+        with self._lock:
+            return sum(1 for r in self.requests if (method is None or r.method == method)
+                       and (path is None or r.path == path))
+
+    def _handle(self, request):
+        with self._lock:
+            self.requests.append(request)
+        func = self.routes.get((request.method, request.path), echo)
+        result = func(request)
+        status, body = result[0], result[1]
+        headers = dict(result[2]) if len(result) > 2 else {}
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+            headers.setdefault("Content-Type", "application/json")
+        if body is None:
+            body = b""
+        return status, body, headers
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                request = Request(self.command, parts.path, dict(parse_qsl(parts.query)), self.headers, body)
+                status, payload, headers = server._handle(request)
+                self.send_response(status)
+                if isinstance(payload, bytes):
+                    headers["Content-Length"] = str(len(payload))
+                    payload = [payload]
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                written = 0
+                for chunk in payload:
+                    self.wfile.write(chunk)
+                    self.wfile.flush()
+                    written += len(chunk)
+                if written < int(headers.get("Content-Length", written)):
+                    self.close_connection = True
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _serve
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
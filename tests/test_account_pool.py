@@ -0,0 +1,47 @@
+# tests/test_account_pool.py
+
+from avito_api import AccountPool
+from avito_api.utils.response_cache import ResponseCache
+
+
+def make_pool(**options):
+    pool = AccountPool(lazy_auth=True, **options)
+    pool.add("a", access_token="TOKEN_A")
+    pool.add("b", access_token="TOKEN_B")
+    return pool
+
+
+def test_token_only_accounts_have_distinct_keys(server):
+    with make_pool() as pool:
+        assert pool["a"].auth.account != pool["b"].auth.account
+        assert "TOKEN_A" not in pool["a"].auth.account
+
+
+def test_client_id_is_account_key(server):
+    with AccountPool(lazy_auth=True) as pool:
+        pool.add("a", client_id="id-a", access_token="TOKEN_A", token_expires_at=2 ** 40)
+        assert pool["a"].auth.account == "id-a"
+
+
+def test_token_only_accounts_share_cache_without_leaking(server):
+    with make_pool(cache=ResponseCache()) as pool:
+        assert pool["a"].user.get_user_info()["who"] == "Bearer TOKEN_A"
+        assert pool["b"].user.get_user_info()["who"] == "Bearer TOKEN_B"
+        # Повторные запросы отвечаются из кеша своего аккаунта
+        assert pool["a"].user.get_user_info()["who"] == "Bearer TOKEN_A"
+        assert pool["b"].user.get_user_info()["who"] == "Bearer TOKEN_B"
+
+
+def test_map_returns_each_accounts_own_data(server):
+    with make_pool() as pool:
+        results = pool.map(lambda client: client.user.get_user_balance(1))
+    assert results["a"] == {"result": {"who": "Bearer TOKEN_A", "path": "/core/v1/accounts/1/balance/"},
+                            "error": None}
+    assert results["b"]["result"]["who"] == "Bearer TOKEN_B"
+
+
+def test_map_collects_errors(server):
+    with make_pool() as pool:
+        results = pool.map(lambda client: 1 / 0, keys=["a"])
+    assert results["a"]["result"] is None
+    assert "division" in results["a"]["error"]
@@ -0,0 +1,100 @@
+# tests/test_authentication.py
+
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from avito_api.auth.authentication import Authentication
+from avito_api.auth.async_authentication import AsyncAuthentication
+from avito_api.auth.token_store import FileTokenStore
+from avito_api.utils.async_request_handler import AsyncRequestHandler
+
+
+def token_route(server, status=200, delay=0.2):
+    issued = []
+    lock = threading.Lock()
+
+    def handle(request):
+        time.sleep(delay)
+        if status != 200:
+            return status, {"error": "invalid_client"}
+        with lock:
+            issued.append(f"NEW{len(issued) + 1}")
+            return 200, {"access_token": issued[-1], "expires_in": 86400}
+
+    server.route("POST", "/token/", handle)
+    return issued
+
+
+def expired_auth(**options):
+    return Authentication(client_id="id", client_secret="secret", access_token="OLD",
+                          token_expires_at=int(time.time()) - 10, lazy=True, **options)
+
+
+def test_concurrent_refresh_requests_one_token(server):
+    token_route(server)
+    auth = expired_auth()
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        headers = list(executor.map(lambda _: auth.get_headers(), range(16)))
+    assert server.count("POST", "/token/") == 1
+    assert {h["Authorization"] for h in headers} == {"Bearer NEW1"}
+
+
+def test_refresh_error_reaches_all_waiters(server):
+    token_route(server, status=400)
+    auth = expired_auth()
+
+    def call(_):
+        try:
+            auth.get_headers()
+        except Exception as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        errors = list(executor.map(call, range(8)))
+    assert all(error and "400" in error for error in errors)
+    assert server.count("POST", "/token/") == 1
+
+
+def test_fresh_token_is_not_refreshed(server):
+    token_route(server)
+    auth = Authentication(client_id="id", client_secret="secret", access_token="VALID",
+                          token_expires_at=int(time.time()) + 3600, lazy=True)
+    assert auth.get_headers() == {"Authorization": "Bearer VALID"}
+    assert server.count("POST", "/token/") == 0
+
+
+def test_token_store_shares_refreshed_token(server, tmp_path):
+    token_route(server, delay=0)
+    store = FileTokenStore(str(tmp_path / "tokens.json"))
+    assert expired_auth(token_store=store).get_headers() == {"Authorization": "Bearer NEW1"}
+    # Второй процесс берет сохраненный токен без запроса к API
+    assert expired_auth(token_store=store).get_headers() == {"Authorization": "Bearer NEW1"}
+    assert server.count("POST", "/token/") == 1
+
+
+def test_async_concurrent_refresh_requests_one_token(server):
+    token_route(server)
+
+    async def main():
+        handler = AsyncRequestHandler()
+        try:
+            auth = AsyncAuthentication(client_id="id", client_secret="secret", access_token="OLD",
+                                       token_expires_at=int(time.time()) - 10, request_handler=handler)
+            return await asyncio.gather(*[auth.get_headers() for _ in range(16)])
+        finally:
+            await handler.close()
+
+    headers = asyncio.run(main())
+    assert server.count("POST", "/token/") == 1
+    assert {h["Authorization"] for h in headers} == {"Bearer NEW1"}
+
+
+@pytest.mark.parametrize("client_id, token, expected", [
+    ("id", "TOKEN", "id"),
+    (None, None, None),
+])
+def test_account_key(client_id, token, expected):
+    auth = Authentication(client_id=client_id, access_token=token, lazy=True)
+    assert auth.account == expected
@@ -0,0 +1,118 @@
+# tests/test_bulk_updater.py
+
+import asyncio
+from avito_api import AvitoAPIClient, AsyncAvitoAPIClient
+from avito_api.services_item import BulkUpdater, AsyncBulkUpdater
+from avito_api.services_item.bulk_updater import PushSnapshot, UPDATED, UNCHANGED, FAILED
+from avito_api.utils.retry import RetryPolicy
+
+STOCKS_PATH = "/stock-management/1/stocks"
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def client(token="TOKEN"):
+    return AvitoAPIClient(access_token=token, lazy_auth=True, retry_policy=NO_RETRY, coalesce=False)
+
+
+def stocks_route(server, rejected=(), dropped=()):
+    """
+    Ответ update_stocks: остатки из rejected - с ошибкой, из dropped - отсутствуют в ответе
+    """
+    batches = []
+
+    def handle(request):
+        stocks = request.json()["stocks"]
+        batches.append([stock["item_id"] for stock in stocks])
+        results = [
+            {"item_id": stock["item_id"], "success": stock["item_id"] not in rejected,
+             "errors": ["bad quantity"] if stock["item_id"] in rejected else []}
+            for stock in stocks if stock["item_id"] not in dropped
+        ]
+        return 200, {"stocks": results}
+
+    server.route("PUT", STOCKS_PATH, handle)
+    return batches
+
+
+def price_route(server, item_id, status=200):
+    server.route("POST", f"/core/v1/items/{item_id}/update_price", lambda request: (status, {"result": {}}))
+
+
+def test_diff_sends_only_changes(tmp_path):
+    updater = BulkUpdater(client().services, str(tmp_path / "pushed.db"))
+    updater.snapshot.save(updater.account, prices=[(1, 100)], quantities=[(1, 5), (2, 7)])
+
+    prices, stocks, report = updater.diff([
+        {"item_id": 1, "price": 100, "quantity": 6},
+        {"item_id": 2, "price": 200, "quantity": 7, "external_id": "AB"},
+        {"item_id": 3, "quantity": 1, "external_id": "CD"},
+    ])
+    assert prices == [(2, 200)]
+    assert stocks == [{"item_id": 1, "quantity": 6}, {"item_id": 3, "quantity": 1, "external_id": "CD"}]
+    assert report[1] == {"price": UNCHANGED, "quantity": None}
+    assert report[2] == {"price": None, "quantity": UNCHANGED}
+    assert report[3] == {"price": None, "quantity": None}
+
+    prices, stocks, _ = updater.diff([{"item_id": 1, "price": 100, "quantity": 5}], force=True)
+    assert prices == [(1, 100)] and len(stocks) == 1
+
+
+def test_stocks_are_sent_in_batches(server, tmp_path):
+    batches = stocks_route(server)
+    updater = BulkUpdater(client().services, str(tmp_path / "pushed.db"), stock_batch_size=2, max_workers=1)
+    report = updater.push([{"item_id": i, "quantity": i} for i in range(1, 6)])
+    assert batches == [[1, 2], [3, 4], [5]]
+    assert all(result["quantity"] == UPDATED for result in report.values())
+
+
+def test_snapshot_keeps_only_successful_values(server, tmp_path):
+    stocks_route(server, rejected={2}, dropped={3})
+    price_route(server, 1)
+    price_route(server, 2, status=400)
+    price_route(server, 3)
+    updater = BulkUpdater(client().services, str(tmp_path / "pushed.db"))
+
+    rows = [{"item_id": i, "price": 100 * i, "quantity": i} for i in (1, 2, 3)]
+    report = updater.push(rows)
+    assert report[1] == {"price": UPDATED, "quantity": UPDATED}
+    assert report[2]["price"] == FAILED and report[2]["quantity"] == FAILED
+    # Остаток без результата в ответе не считается обновленным
+    assert report[3]["quantity"] == FAILED and report[3]["error"]
+    assert updater.snapshot.load(updater.account) == {1: (100, 1), 3: (300, None)}
+
+    # Повторная отправка передает только то, что не удалось в прошлый раз
+    server.reset()
+    batches = stocks_route(server)
+    price_route(server, 2)
+    report = updater.push(rows)
+    assert batches == [[2, 3]]
+    assert report[1] == {"price": UNCHANGED, "quantity": UNCHANGED}
+    assert report[3]["price"] == UNCHANGED
+    assert server.count("POST") == 1
+
+
+def test_snapshot_is_scoped_by_account(server, tmp_path):
+    stocks_route(server)
+    path = str(tmp_path / "pushed.db")
+    rows = [{"item_id": 1, "quantity": 3}]
+
+    first = BulkUpdater(client("FIRST").services, path)
+    second = BulkUpdater(client("SECOND").services, path)
+    assert first.account != second.account
+    first.push(rows)
+    assert second.push(rows)[1]["quantity"] == UPDATED
+    assert first.push(rows)[1]["quantity"] == UNCHANGED
+    assert PushSnapshot(path).load(first.account) == {1: (None, 3)}
+
+
+def test_async_push(server, tmp_path):
+    stocks_route(server, dropped={2})
+
+    async def push():
+        async with AsyncAvitoAPIClient(access_token="TOKEN", retry_policy=NO_RETRY) as api:
+            updater = AsyncBulkUpdater(api.services, str(tmp_path / "pushed.db"))
+            return await updater.push([{"item_id": 1, "quantity": 1}, {"item_id": 2, "quantity": 2}])
+
+    report = asyncio.run(push())
+    assert report[1]["quantity"] == UPDATED
+    assert report[2]["quantity"] == FAILED
@@ -0,0 +1,128 @@
+# tests/test_catalog.py
+
+import time
+import pytest
+from avito_api import AvitoAPIClient
+from avito_api.item import CatalogMirror
+from avito_api.utils.retry import RetryPolicy
+
+ITEMS_PATH = "/core/v1/items"
+PER_PAGE = 2
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Сдвиг часов: синхронизации в одном тесте должны начинаться в разные секунды
+    """
+    shift = [0]
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + shift[0])
+    return shift
+
+
+def client(token="TOKEN"):
+    return AvitoAPIClient(access_token=token, lazy_auth=True, retry_policy=RetryPolicy(max_attempts=1),
+                          coalesce=False)
+
+
+def items_route(server, catalog, failing_page=None):
+    """
+    Выдача core/v1/items; catalog - {токен: [ID объявлений]}, список можно менять между синхронизациями
+    """
+    def handle(request):
+        page = int(request.query["page"])
+        if page == failing_page:
+            return 500, {"error": {"message": "internal"}}
+        ids = catalog[request.token.split()[-1]]
+        part = ids[(page - 1) * PER_PAGE:page * PER_PAGE]
+        resources = [{"id": item_id, "status": "active", "category": {"id": 9}} for item_id in part]
+        return 200, {"meta": {"page": page, "per_page": PER_PAGE}, "resources": resources}
+
+    server.route("GET", ITEMS_PATH, handle)
+
+
+def mirror(path, token="TOKEN"):
+    return CatalogMirror(client(token).item, path, per_page=PER_PAGE)
+
+
+def test_delta_sync_requests_only_updates(server, tmp_path, clock):
+    items_route(server, {"TOKEN": [1, 2, 3]})
+    catalog = mirror(str(tmp_path / "catalog.db"))
+    assert catalog.sync() == {"mode": "full", "updated": 3, "removed": 0, "error": None}
+    assert [item["id"] for item in catalog.find(status="active", category_id=9)] == [1, 2, 3]
+
+    clock[0] += 10
+    server.reset()
+    items_route(server, {"TOKEN": [3]})
+    assert catalog.sync()["mode"] == "delta"
+    assert server.requests[0].query.get("updatedAtFrom")
+
+
+def test_item_is_removed_after_two_full_syncs(server, tmp_path, clock):
+    ids = {"TOKEN": [1, 2, 3, 4]}
+    items_route(server, ids)
+    catalog = mirror(str(tmp_path / "catalog.db"))
+    catalog.sync(full=True)
+
+    # Объявление 2 не попало на страницы (например, из-за сдвига списка): пока не удаляется
+    ids["TOKEN"] = [1, 3, 4]
+    clock[0] += 10
+    assert catalog.sync(full=True)["removed"] == 0
+    assert catalog.status(2) == "active"
+
+    clock[0] += 10
+    assert catalog.sync(full=True)["removed"] == 1
+    assert catalog.status(2) is None
+
+
+def test_item_seen_again_is_kept(server, tmp_path, clock):
+    ids = {"TOKEN": [1, 2, 3]}
+    items_route(server, ids)
+    catalog = mirror(str(tmp_path / "catalog.db"))
+    catalog.sync(full=True)
+
+    ids["TOKEN"] = [1, 3]
+    clock[0] += 10
+    catalog.sync(full=True)
+    ids["TOKEN"] = [1, 2, 3]
+    clock[0] += 10
+    catalog.sync(full=True)
+    ids["TOKEN"] = [1, 3]
+    clock[0] += 10
+    assert catalog.sync(full=True)["removed"] == 0
+    assert catalog.status(2) == "active"
+
+
+def test_failed_sync_removes_nothing(server, tmp_path, clock):
+    ids = {"TOKEN": [1, 2, 3, 4, 5]}
+    items_route(server, ids)
+    catalog = mirror(str(tmp_path / "catalog.db"))
+    catalog.sync(full=True)
+    state = catalog.store.get_state(catalog.account)
+
+    for _ in range(2):
+        clock[0] += 10
+        items_route(server, ids, failing_page=2)
+        result = catalog.sync(full=True)
+        assert result["error"]["status_code"] == 500
+        assert result["removed"] == 0
+    assert catalog.counts() == {"active": 5}
+    assert catalog.store.get_state(catalog.account) == state
+
+
+def test_catalog_is_scoped_by_account(server, tmp_path, clock):
+    items_route(server, {"FIRST": [1, 2], "SECOND": [3]})
+    path = str(tmp_path / "catalog.db")
+    first, second = mirror(path, "FIRST"), mirror(path, "SECOND")
+    first.sync()
+    second.sync()
+    assert first.account != second.account
+    assert sorted(first.get_many([1, 2, 3])) == [1, 2]
+    assert second.counts() == {"active": 1}
+
+    # Полная синхронизация одного аккаунта не удаляет объявления другого
+    for _ in range(2):
+        clock[0] += 10
+        second.sync(full=True)
+    assert first.counts() == {"active": 2}
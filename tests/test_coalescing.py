@@ -0,0 +1,150 @@
+# tests/test_coalescing.py
+
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from avito_api import AvitoAPIClient, AsyncAvitoAPIClient
+from avito_api.utils.coalescing import RequestCoalescer
+from avito_api.utils.request_handler import RequestHandler
+from avito_api.utils.async_request_handler import AsyncRequestHandler
+
+BALANCE = "/core/v1/accounts/1/balance/"
+
+
+def slow_route(server, path=BALANCE, delay=0.2):
+    def handle(request):
+        time.sleep(delay)
+        return 200, {"who": request.token}
+
+    server.route("GET", path, handle)
+
+
+def burst(func, count=8):
+    barrier = threading.Barrier(count)
+
+    def call(_):
+        barrier.wait()
+        return func()
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(call, range(count)))
+
+
+def test_concurrent_calls_run_once_and_get_copies():
+    coalescer = RequestCoalescer()
+    results = burst(lambda: coalescer.run("key", lambda: time.sleep(0.2) or {"value": []}))
+    assert coalescer.executed == 1
+    assert coalescer.coalesced == 7
+    results[0]["value"].append(1)
+    assert all(result == {"value": []} for result in results[1:])
+
+
+def test_error_reaches_all_waiters():
+    coalescer = RequestCoalescer()
+
+    def fail():
+        time.sleep(0.2)
+        raise RuntimeError("boom")
+
+    def call():
+        with pytest.raises(RuntimeError):
+            coalescer.run("key", fail)
+        return True
+
+    assert all(burst(call))
+    assert coalescer.executed == 1
+
+
+def test_key_depends_on_headers():
+    key = RequestCoalescer.key
+    assert key("GET", "u", {"a": 1}, None, {"Authorization": "Bearer A"}) != \
+        key("GET", "u", {"a": 1}, None, {"Authorization": "Bearer B"})
+    assert key("GET", "u", {"a": 1}, "acc", {"Authorization": "Bearer A"}) == \
+        key("GET", "u", {"a": "1"}, "acc", {"Authorization": "Bearer A"})
+    assert "Bearer A" not in repr(key("GET", "u", None, None, {"Authorization": "Bearer A"}))
+
+
+def test_same_account_burst_sends_one_request(server):
+    slow_route(server)
+    client = AvitoAPIClient(access_token="TOKEN", lazy_auth=True, request_handler=RequestHandler())
+    client.auth.initialize()
+    results = burst(lambda: client.user.get_user_balance(1))
+    assert {result["who"] for result in results} == {"Bearer TOKEN"}
+    assert server.count("GET", BALANCE) == 1
+
+
+def test_token_only_accounts_on_one_handler_are_not_merged(server):
+    slow_route(server)
+    handler = RequestHandler()
+    clients = [AvitoAPIClient(access_token=token, lazy_auth=True, request_handler=handler)
+               for token in ("TOKEN_A", "TOKEN_B")]
+    for client in clients:
+        client.auth.initialize()
+    order = clients * 4
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            client = order.pop()
+        return client.auth.access_token, client.user.get_user_balance(1)["who"]
+
+    results = burst(call)
+    assert all(who == f"Bearer {token}" for token, who in results)
+    assert server.count("GET", BALANCE) == 2
+
+
+def test_requests_without_account_are_split_by_token(server):
+    slow_route(server)
+    handler = RequestHandler()
+    url = server.url + BALANCE
+    tokens = ["Bearer A", "Bearer B"] * 4
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            token = tokens.pop()
+        return token, handler.send_request(url, headers={"Authorization": token})["who"]
+
+    results = burst(call)
+    assert all(token == who for token, who in results)
+    assert server.count("GET", BALANCE) == 2
+
+
+def test_async_token_only_accounts_are_not_merged(server):
+    slow_route(server)
+
+    async def main():
+        handler = AsyncRequestHandler()
+        try:
+            a, b = [AsyncAvitoAPIClient(access_token=token, request_handler=handler) for token in ("A", "B")]
+            await a.auth.initialize()
+            await b.auth.initialize()
+            return await asyncio.gather(*[client.user.get_user_balance(1) for client in (a, b, a, b)])
+        finally:
+            await handler.close()
+
+    results = asyncio.run(main())
+    assert [result["who"] for result in results] == ["Bearer A", "Bearer B", "Bearer A", "Bearer B"]
+    assert server.count("GET", BALANCE) == 2
+
+
+def test_async_cancelled_waiter_does_not_cancel_request():
+    coalescer = RequestCoalescer()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return {"ok": True}
+
+    async def main():
+        first = asyncio.ensure_future(coalescer.run_async("key", fetch))
+        second = asyncio.ensure_future(coalescer.run_async("key", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == {"ok": True}
+    assert len(calls) == 1
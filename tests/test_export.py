@@ -0,0 +1,83 @@
+# tests/test_export.py
+
+import csv
+from datetime import date, timedelta
+from avito_api import AvitoAPIClient
+from avito_api.item.item_client import ItemClient
+from avito_api.export import export_items_stats, export_report_items
+from avito_api.utils.retry import RetryPolicy
+
+STATS_PATH = "/stats/v1/accounts/1/items"
+
+
+def stats_route(server, fail_item=None):
+    def handle(request):
+        body = request.json()
+        if fail_item in body["itemIds"]:
+            return 400, {"error": {"message": "bad item"}}
+        start, stop = date.fromisoformat(body["dateFrom"]), date.fromisoformat(body["dateTo"])
+        days = [(start + timedelta(days=n)).isoformat() for n in range((stop - start).days + 1)]
+        items = [{"itemId": item_id, "stats": [{"date": day, "uniqViews": item_id} for day in days]}
+                 for item_id in body["itemIds"]]
+        return 200, {"result": {"items": items}}
+
+    server.route("POST", STATS_PATH, handle)
+
+
+def test_stats_chunks_cover_items_and_period():
+    chunks = ItemClient.stats_chunks(list(range(5)), "2024-01-01", "2024-01-10", chunk_size=2, max_days=4)
+    assert [chunk["item_ids"] for chunk in chunks[::3]] == [[0, 1], [2, 3], [4]]
+    assert [(c["date_from"], c["date_to"]) for c in chunks[:3]] == [
+        ("2024-01-01", "2024-01-04"), ("2024-01-05", "2024-01-08"), ("2024-01-09", "2024-01-10")
+    ]
+
+
+def test_export_items_stats_to_csv(server, tmp_path):
+    stats_route(server)
+    client = AvitoAPIClient(access_token="TOKEN", lazy_auth=True)
+    path = tmp_path / "stats.csv"
+    result = export_items_stats(client.item, str(path), 1, "2024-01-01", "2024-01-10", [1, 2, 3],
+                                chunk_size=2, max_days=4, max_workers=2)
+    assert result == {"rows": 30, "errors": []}
+    with open(path, newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert len(rows) == 30
+    assert rows[0]["item_id"] == "1" and rows[0]["date"] == "2024-01-01" and rows[0]["uniq_views"] == "1"
+
+
+def test_export_items_stats_reports_failed_chunks(server, tmp_path):
+    stats_route(server, fail_item=3)
+    client = AvitoAPIClient(access_token="TOKEN", lazy_auth=True)
+    result = export_items_stats(client.item, str(tmp_path / "stats.csv"), 1, "2024-01-01", "2024-01-10", [1, 2, 3],
+                                chunk_size=2, max_days=4)
+    assert result["rows"] == 20
+    assert len(result["errors"]) == 3
+    assert all(error["chunk"]["item_ids"] == [3] for error in result["errors"])
+
+
+def report_route(server, failing_page=None):
+    def handle(request):
+        page = int(request.query.get("page", 0))
+        if page == failing_page:
+            return 500, {"error": {"message": "internal"}}
+        items = [{"ad_id": f"{page}-{i}", "avito_id": page * 10 + i} for i in range(2)]
+        return 200, {"items": items, "meta": {"page": page, "pages": 3, "per_page": 2}}
+
+    server.route("GET", "/autoload/v2/reports/1/items", handle)
+
+
+def test_export_report_items(server, tmp_path):
+    report_route(server)
+    client = AvitoAPIClient(access_token="TOKEN", lazy_auth=True)
+    path = tmp_path / "report.csv"
+    assert export_report_items(client.autoload, str(path), 1, per_page=2) == {"rows": 6, "errors": []}
+    with open(path, newline="", encoding="utf-8") as handle:
+        assert [row["ad_id"] for row in csv.DictReader(handle)] == ["0-0", "0-1", "1-0", "1-1", "2-0", "2-1"]
+
+
+def test_export_report_items_reports_failed_page(server, tmp_path):
+    report_route(server, failing_page=1)
+    client = AvitoAPIClient(access_token="TOKEN", lazy_auth=True, retry_policy=RetryPolicy(max_attempts=1))
+    result = export_report_items(client.autoload, str(tmp_path / "report.csv"), 1, per_page=2)
+    assert result["rows"] == 2
+    assert [error["page"] for error in result["errors"]] == [1]
@@ -0,0 +1,118 @@
+# tests/test_hooks_metrics.py
+
+import asyncio
+import time
+from avito_api import AvitoAPIClient
+from avito_api.auth.authentication import Authentication
+from avito_api.utils import MetricsCollector, RequestHooks, RetryPolicy
+from avito_api.utils.request_handler import RequestHandler
+from avito_api.utils.async_request_handler import AsyncRequestHandler
+
+ITEM_PATH = "/core/v1/accounts/1/items/2/"
+ITEM_TEMPLATE = "/core/v1/accounts/{user_id}/items/{item_id}/"
+FAST_RETRY = RetryPolicy(max_attempts=3, backoff_factor=0.01)
+
+
+class Recorder(RequestHooks):
+    def __init__(self):
+        self.events = []
+
+    def on_request(self, info):
+        self.events.append(("request", dict(info)))
+
+    def on_response(self, info):
+        self.events.append(("response", dict(info)))
+
+    def on_error(self, info):
+        self.events.append(("error", dict(info)))
+
+
+class Broken:
+    def on_response(self, info):
+        raise RuntimeError("hook failed")
+
+
+def failing_once():
+    calls = [0]
+
+    def handle(request):
+        calls[0] += 1
+        if calls[0] == 1:
+            return 503, {"error": "unavailable"}
+        return 200, {"id": 2}
+
+    return handle
+
+
+def test_hooks_receive_endpoint_template(server):
+    recorder = Recorder()
+    client = AvitoAPIClient(access_token="TOKEN", lazy_auth=True, hooks=[Broken(), recorder])
+    assert client.item.get_item_info(1, 2) == {"who": "Bearer TOKEN", "path": ITEM_PATH}
+
+    (kind, request), (_, response) = recorder.events
+    assert kind == "request"
+    assert request["endpoint"] == ITEM_TEMPLATE and request["method"] == "GET"
+    assert request["account"] == client.auth.account
+    assert response["status"] == 200
+    assert response["bytes_in"] > 0 and response["elapsed"] > 0
+
+
+def test_metrics_count_statuses_and_retries(server):
+    server.route("GET", ITEM_PATH, failing_once())
+    metrics = MetricsCollector()
+    client = AvitoAPIClient(access_token="TOKEN", lazy_auth=True, hooks=[metrics], retry_policy=FAST_RETRY)
+    client.item.get_item_info(1, 2)
+    client.item.get_item_info(1, 2)
+
+    stats = metrics.snapshot()["endpoints"][f"GET {ITEM_TEMPLATE}"]
+    assert stats["statuses"] == {503: 1, 200: 2}
+    assert stats["retries"] == 1
+    assert stats["latency"]["count"] == 3
+    assert stats["latency"]["buckets"]["+Inf"] == 3
+
+    text = metrics.to_prometheus()
+    assert f'avito_api_responses_total{{method="GET",endpoint="{ITEM_TEMPLATE}",status="503"}} 1' in text
+    assert f'avito_api_request_duration_seconds_count{{method="GET",endpoint="{ITEM_TEMPLATE}"}} 3' in text
+
+    metrics.reset()
+    assert metrics.snapshot()["endpoints"] == {}
+
+
+def test_metrics_count_connection_errors():
+    metrics = MetricsCollector()
+    handler = RequestHandler(hooks=[metrics], retry_policy=RetryPolicy(max_attempts=1), timeout=1)
+    # Порт 1 на локальном адресе не принимает соединения
+    result = handler.send_request("http://127.0.0.1:1/core/v1/items")
+    assert "Connection Error" in result["error"]
+    stats = metrics.snapshot()["endpoints"]["GET /core/v1/items"]
+    assert stats["errors"] == {"connection": 1}
+    assert stats["statuses"] == {}
+
+
+def test_metrics_record_auth_refresh(server):
+    server.route("POST", "/token/", lambda request: (200, {"access_token": "NEW", "expires_in": 86400}))
+    metrics = MetricsCollector()
+    auth = Authentication(client_id="id", client_secret="secret", access_token="OLD",
+                          token_expires_at=int(time.time()) - 10, lazy=True, hooks=[metrics])
+    assert auth.get_headers()["Authorization"] == "Bearer NEW"
+    snapshot = metrics.snapshot()["auth"]
+    assert snapshot["refresh"]["count"] == 1
+    assert snapshot["errors"] == 0
+    assert 'avito_api_auth_refresh_duration_seconds_count{role="refresh"} 1' in metrics.to_prometheus()
+
+
+def test_async_handler_calls_hooks(server):
+    server.route("GET", ITEM_PATH, failing_once())
+    metrics = MetricsCollector()
+
+    async def send():
+        handler = AsyncRequestHandler(hooks=[metrics], retry_policy=FAST_RETRY)
+        try:
+            return await handler.send_request(server.url + ITEM_PATH)
+        finally:
+            await handler.close()
+
+    assert asyncio.run(send()) == {"id": 2, "retries": 1}
+    stats = metrics.snapshot()["endpoints"][f"GET {ITEM_TEMPLATE}"]
+    assert stats["statuses"] == {503: 1, 200: 1}
+    assert stats["retries"] == 1
@@ -0,0 +1,99 @@
+# tests/test_id_index.py
+
+import asyncio
+from avito_api import AvitoAPIClient, AsyncAvitoAPIClient
+from avito_api.autoload import IdResolver, AsyncIdResolver
+from avito_api.utils.retry import RetryPolicy
+
+FAST_RETRY = RetryPolicy(max_attempts=2, backoff_factor=0.01)
+PAGES = 3
+
+
+def client(token="TOKEN"):
+    return AvitoAPIClient(access_token=token, lazy_auth=True, retry_policy=FAST_RETRY, coalesce=False)
+
+
+def avito_ids_route(server, failing=()):
+    """
+    Сопоставление ad_id -> avito_id (avito_id = 1000 + ad_id); запрос с ID из failing отвечает 500
+    """
+    def handle(request):
+        ad_ids = request.query["query"].split(",")
+        if set(ad_ids) & set(failing):
+            return 500, {"error": {"message": "internal"}}
+        return 200, {"items": [{"ad_id": ad_id, "avito_id": 1000 + int(ad_id)} for ad_id in ad_ids]}
+
+    server.route("GET", "/autoload/v2/items/avito_ids", handle)
+
+
+def report_route(server, failing_page=None):
+    def handle(request):
+        page = int(request.query.get("page", 0))
+        if page == failing_page:
+            return 500, {"error": {"message": "internal"}}
+        items = [{"ad_id": str(page), "avito_id": 1000 + page}]
+        return 200, {"items": items, "meta": {"page": page, "pages": PAGES, "per_page": 1}}
+
+    server.route("GET", "/autoload/v2/reports/7/items", handle)
+
+
+def test_failed_chunk_is_not_reported_as_absent(server, tmp_path):
+    avito_ids_route(server, failing={"3"})
+    resolver = IdResolver(client().autoload, str(tmp_path / "ids.db"), chunk_size=2)
+
+    result = resolver.avito_ids(["1", "2", "3", "4", "5"])
+    assert result == {"1": 1001, "2": 1002, "5": 1005}
+    assert sorted(result.failed) == ["3", "4"]
+
+    # Найденные ID берутся из индекса, повторно запрашиваются только ID из части с ошибкой
+    server.reset()
+    avito_ids_route(server)
+    result = resolver.avito_ids(["1", "2", "3", "4", "5"])
+    assert result == {str(i): 1000 + i for i in range(1, 6)}
+    assert result.failed == []
+    assert server.count("GET", "/autoload/v2/items/avito_ids") == 1
+
+
+def test_get_all_ids_returns_errors_with_ids(server):
+    avito_ids_route(server, failing={"2"})
+    result = client().autoload.get_all_avito_ids_by_ad_ids(["1", "2", "3"], chunk_size=1)
+    assert [item["ad_id"] for item in result["items"]] == ["1", "3"]
+    assert [error["ids"] for error in result["errors"]] == [["2"]]
+    assert result["errors"][0]["response"]["status_code"] == 500
+
+
+def test_index_is_scoped_by_account(server, tmp_path):
+    avito_ids_route(server)
+    path = str(tmp_path / "ids.db")
+    IdResolver(client("FIRST").autoload, path).avito_ids(["1"])
+    IdResolver(client("SECOND").autoload, path).avito_ids(["1"])
+    assert server.count("GET", "/autoload/v2/items/avito_ids") == 2
+
+
+def test_report_with_failed_page_is_not_marked_imported(server, tmp_path):
+    report_route(server, failing_page=1)
+    resolver = IdResolver(client().autoload, str(tmp_path / "ids.db"))
+
+    error = resolver.refresh_from_report(7, per_page=1)
+    assert error["page"] == 1
+    assert not resolver.index.is_imported(resolver.account, 7)
+    # Сопоставления с прочитанных страниц сохранены
+    assert resolver.index.avito_ids(resolver.account, ["0"]) == {"0": 1000}
+
+    report_route(server)
+    assert resolver.refresh_from_report(7, per_page=1) == PAGES
+    assert resolver.index.is_imported(resolver.account, 7)
+    assert resolver.refresh_from_report(7, per_page=1) == 0
+
+
+def test_async_report_with_failed_page_is_not_marked_imported(server, tmp_path):
+    report_route(server, failing_page=2)
+
+    async def refresh():
+        async with AsyncAvitoAPIClient(access_token="TOKEN", retry_policy=FAST_RETRY) as api:
+            resolver = AsyncIdResolver(api.autoload, str(tmp_path / "ids.db"))
+            return await resolver.refresh_from_report(7, per_page=1), resolver
+
+    error, resolver = asyncio.run(refresh())
+    assert error["page"] == 2
+    assert not resolver.index.is_imported(resolver.account, 7)
@@ -0,0 +1,125 @@
+# tests/test_images.py
+
+import asyncio
+import threading
+from avito_api import AvitoAPIClient, AsyncAvitoAPIClient
+from avito_api.messenger import ImageUploader, AsyncImageUploader
+from avito_api.messenger.images import ImageCache
+from avito_api.utils.retry import RetryPolicy
+
+UPLOAD_PATH = "/messenger/v1/accounts/1/uploadImages"
+SEND_PATH = "/messenger/v1/accounts/1/chats/C1/messages/image"
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+# Маленький PNG: сигнатура и заголовок достаточны для определения формата
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+OTHER_PNG = b"\x89PNG\r\n\x1a\n" + b"\x01" * 64
+
+
+def client():
+    return AvitoAPIClient(access_token="TOKEN", lazy_auth=True, retry_policy=NO_RETRY, coalesce=False)
+
+
+def upload_route(server, fail=False):
+    """
+    Ответ uploadImages: ID изображения - номер загрузки; загруженные тела сохраняются в список
+    """
+    bodies = []
+    lock = threading.Lock()
+
+    def handle(request):
+        if fail:
+            return 500, {"error": {"message": "internal"}}
+        with lock:
+            bodies.append(request.body)
+            image_id = f"img-{len(bodies)}"
+        return 200, {image_id: {"140x105": f"https://example.com/{image_id}.jpg"}}
+
+    server.route("POST", UPLOAD_PATH, handle)
+    return bodies
+
+
+def send_route(server, rejected=()):
+    def handle(request):
+        if request.json()["image_id"] in rejected:
+            return 404, {"error": {"message": "image not found"}}
+        return 200, {"id": "M1", "image_id": request.json()["image_id"]}
+
+    server.route("POST", SEND_PATH, handle)
+
+
+def test_upload_streams_file_from_disk(server, tmp_path):
+    bodies = upload_route(server)
+    path = tmp_path / "photo.png"
+    path.write_bytes(PNG)
+    assert ImageUploader(client().messenger, 1).upload(str(path)) == "img-1"
+    assert PNG in bodies[0]
+    assert b'filename="photo.png"' in bodies[0]
+    assert b"Content-Type: image/png" in bodies[0]
+
+
+def test_same_content_is_uploaded_once(server, tmp_path):
+    bodies = upload_route(server)
+    path = tmp_path / "photo.png"
+    path.write_bytes(PNG)
+    uploader = ImageUploader(client().messenger, 1, max_workers=4)
+
+    result = uploader.upload_many([PNG, str(path), memoryview(OTHER_PNG), bytearray(PNG)])
+    assert len(bodies) == 2
+    assert result[0] == result[1] == result[3]
+    assert result[2] != result[0]
+
+    # Повторный вызов берет ID из кеша
+    assert uploader.upload_many([OTHER_PNG, PNG]) == [result[2], result[0]]
+    assert len(bodies) == 2
+
+
+def test_sqlite_cache_survives_restart(server, tmp_path):
+    bodies = upload_route(server)
+    path = str(tmp_path / "images.db")
+    uploader = ImageUploader(client().messenger, 1, cache=path)
+    image_id = uploader.upload(PNG)
+    assert ImageUploader(client().messenger, 1, cache=path).upload(PNG) == image_id
+    assert len(bodies) == 1
+    # Кеш разделен по пользователям
+    _, digest = uploader._digest(PNG)
+    assert ImageCache(path).get(1, digest) == image_id
+    assert ImageCache(path).get(2, digest) is None
+
+
+def test_failed_upload_is_not_cached(server):
+    upload_route(server, fail=True)
+    uploader = ImageUploader(client().messenger, 1)
+    error = uploader.upload(PNG)
+    assert error["status_code"] == 500
+    bodies = upload_route(server)
+    assert uploader.upload(PNG) == "img-1"
+    assert len(bodies) == 1
+
+
+def test_send_images_reuploads_rejected_image(server):
+    bodies = upload_route(server)
+    uploader = ImageUploader(client().messenger, 1)
+    assert uploader.upload(PNG) == "img-1"
+
+    # Сохраненный ID больше не принимается: изображение загружается заново и отправляется с новым ID
+    send_route(server, rejected={"img-1"})
+    responses = uploader.send_images("C1", [PNG, PNG])
+    assert [response["image_id"] for response in responses] == ["img-2", "img-2"]
+    assert len(bodies) == 2
+
+
+def test_async_uploader(server):
+    bodies = upload_route(server)
+    send_route(server)
+
+    async def send():
+        async with AsyncAvitoAPIClient(access_token="TOKEN", retry_policy=NO_RETRY) as api:
+            uploader = AsyncImageUploader(api.messenger, 1)
+            ids = await uploader.upload_many([PNG, PNG, OTHER_PNG])
+            return ids, await uploader.send_image("C1", PNG)
+
+    ids, response = asyncio.run(send())
+    assert ids[0] == ids[1] != ids[2]
+    assert response["image_id"] == ids[0]
+    assert len(bodies) == 2
@@ -0,0 +1,130 @@
+# tests/test_messenger_sync.py
+
+import asyncio
+import threading
+from avito_api.messenger.sync import MessengerStore, MessengerSync, AsyncMessengerSync
+
+USER_ID = 1
+
+
+class FakeMessenger:
+    """
+    Мессенджер в памяти: чаты от недавно обновленных, сообщения от новых к старым
+    """
+
+    def __init__(self):
+        self.chats = {}
+        self.messages = {}
+        self.failing = set()
+        self.calls = {"get_chats": 0, "get_messages": 0}
+        self._clock = 1000
+        self._lock = threading.Lock()
+
+    def post(self, chat_id, count=1):
+        for _ in range(count):
+            self._clock += 1
+            message = {"id": f"{chat_id}-{self._clock}", "created": self._clock}
+            self.messages.setdefault(chat_id, []).insert(0, message)
+            self.chats[chat_id] = {"id": chat_id, "updated": self._clock, "last_message": message}
+
+    def get_chats(self, user_id, chat_types=None, limit=100, offset=0):
+        with self._lock:
+            self.calls["get_chats"] += 1
+        chats = sorted(self.chats.values(), key=lambda chat: -chat["updated"])
+        return {"chats": [dict(chat) for chat in chats[offset:offset + limit]]}
+
+    def get_messages(self, user_id, chat_id, limit=100, offset=0):
+        with self._lock:
+            self.calls["get_messages"] += 1
+        if chat_id in self.failing:
+            return {"error": "HTTP Error: 500", "status_code": 500}
+        return {"messages": self.messages.get(chat_id, [])[offset:offset + limit]}
+
+
+class AsyncFakeMessenger(FakeMessenger):
+    async def get_chats(self, *args, **kwargs):
+        return FakeMessenger.get_chats(self, *args, **kwargs)
+
+    async def get_messages(self, *args, **kwargs):
+        return FakeMessenger.get_messages(self, *args, **kwargs)
+
+
+def make_sync(tmp_path, messenger, sync_class=MessengerSync):
+    return sync_class(messenger, USER_ID, str(tmp_path / "messenger.db"), max_workers=4)
+
+
+def test_first_sync_stores_all_pages(tmp_path):
+    messenger = FakeMessenger()
+    messenger.post("a", 250)
+    messenger.post("b", 3)
+    sync = make_sync(tmp_path, messenger)
+    result = sync.sync()
+    assert sorted(result["chats"]) == ["a", "b"]
+    assert result["messages"] == 253
+    assert result["errors"] == {}
+    assert len(sync.store.get_messages(USER_ID, "a")) == 250
+
+
+def test_unchanged_chats_cost_one_request(tmp_path):
+    messenger = FakeMessenger()
+    for chat_id in "abc":
+        messenger.post(chat_id, 2)
+    sync = make_sync(tmp_path, messenger)
+    sync.sync()
+    messenger.calls = {"get_chats": 0, "get_messages": 0}
+    assert sync.sync() == {"chats": [], "messages": 0, "errors": {}}
+    assert messenger.calls == {"get_chats": 1, "get_messages": 0}
+
+
+def test_only_new_messages_of_changed_chats_are_fetched(tmp_path):
+    messenger = FakeMessenger()
+    for chat_id in "abc":
+        messenger.post(chat_id, 150)
+    sync = make_sync(tmp_path, messenger)
+    sync.sync()
+    messenger.calls = {"get_chats": 0, "get_messages": 0}
+    messenger.post("b", 5)
+    result = sync.sync()
+    assert result["chats"] == ["b"]
+    assert result["messages"] == 5
+    assert messenger.calls["get_messages"] == 1
+    assert len(sync.store.get_messages(USER_ID, "b")) == 155
+
+
+def test_failed_chat_keeps_cursor_and_is_retried(tmp_path):
+    messenger = FakeMessenger()
+    messenger.post("a", 2)
+    messenger.post("b", 2)
+    sync = make_sync(tmp_path, messenger)
+    sync.sync()
+    messenger.post("a")
+    messenger.post("b")
+    messenger.failing.add("b")
+    result = sync.sync()
+    assert list(result["errors"]) == ["b"]
+    assert result["messages"] == 1
+    # Курсор чатов не сдвинулся: чат "b" синхронизируется при следующем запуске
+    messenger.failing.clear()
+    result = sync.sync()
+    assert result["chats"] == ["b"]
+    assert result["messages"] == 1
+    assert len(sync.store.get_messages(USER_ID, "b")) == 3
+
+
+def test_store_is_per_user(tmp_path):
+    store = MessengerStore(str(tmp_path / "messenger.db"))
+    store.save_chats(1, [{"id": "a", "updated": 5}])
+    assert store.get_chats(2) == []
+    assert store.get_chats(1) == [{"id": "a", "updated": 5}]
+
+
+def test_async_sync_matches_sync(tmp_path):
+    messenger = AsyncFakeMessenger()
+    messenger.post("a", 120)
+    messenger.post("b", 1)
+    sync = make_sync(tmp_path, messenger, AsyncMessengerSync)
+    result = asyncio.run(sync.sync())
+    assert sorted(result["chats"]) == ["a", "b"]
+    assert result["messages"] == 121
+    messenger.post("a", 2)
+    assert asyncio.run(sync.sync())["messages"] == 2
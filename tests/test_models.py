@@ -0,0 +1,104 @@
+# tests/test_models.py
+
+import gc
+import json
+import tracemalloc
+import pytest
+from avito_api import AvitoAPIClient
+from avito_api.models import Item, ReportItem, Fee, Chat, ItemStatsRow
+
+REPORT_ITEM = {
+    "ad_id": "AB1", "avito_id": 101, "url": "https://avito.ru/101", "avito_status": "active",
+    "section": {"slug": "success", "title": "Опубликовано"},
+    "messages": [{"code": 1, "title": "Ок", "type": "info", "updated_at": "2024-01-01"}],
+    "unknown_field": {"x": 1},
+}
+
+
+def report_items(count):
+    return [dict(REPORT_ITEM, ad_id=f"AB{i}", avito_id=i, avito_status="active" if i % 2 else "blocked")
+            for i in range(count)]
+
+
+def test_to_dict_round_trip_keeps_unknown_fields():
+    item = ReportItem.from_dict(REPORT_ITEM)
+    assert item.to_dict() == REPORT_ITEM
+    assert item.extra == {"unknown_field": {"x": 1}}
+    assert not hasattr(item, "__dict__")
+
+
+def test_nested_fields_are_parsed_on_first_access():
+    fee = Fee.from_dict({"ad_id": "AB1", "fees": [{"type": "placement", "amount": 10}]})
+    assert type(fee._fees) is list
+    assert fee.fees[0].type == "placement"
+    assert fee._fees is fee.fees
+
+    chat = Chat.from_dict({"id": "c1", "last_message": {"id": "m1", "content": {"text": "привет"}}})
+    assert type(chat._last_message) is dict
+    assert chat.last_message.text == "привет"
+    assert type(chat._last_message) is not dict
+
+
+def test_strings_are_interned_and_small_objects_shared():
+    first, second = ReportItem.from_list(json.loads(json.dumps(report_items(3))))[1:]
+    assert first.section is second.section
+    blocked, active = ReportItem.from_list(json.loads(json.dumps(report_items(2))))
+    assert active.avito_status is first.avito_status
+    assert blocked.avito_status == "blocked"
+
+
+def test_dict_style_access():
+    item = Item.from_dict({"id": 1, "status": "active", "category": {"id": 9, "name": "Телефоны"}, "x": 2})
+    assert item["status"] == "active"
+    assert item["category"].name == "Телефоны"
+    assert item.get("price") is None
+    assert item["x"] == 2
+    assert "status" in item and "price" not in item
+    with pytest.raises(KeyError):
+        item["price"]
+
+
+def test_stats_rows_are_flattened():
+    response = {"result": {"items": [
+        {"itemId": 1, "stats": [{"date": "2024-01-01", "uniqViews": 5}, {"date": "2024-01-02", "uniqViews": 6}]},
+        {"itemId": 2, "stats": [{"date": "2024-01-01", "uniqContacts": 1}]},
+    ]}}
+    rows = ItemStatsRow.from_stats(response)
+    assert [(row.item_id, row.date, row.uniq_views) for row in rows] == [
+        (1, "2024-01-01", 5), (1, "2024-01-02", 6), (2, "2024-01-01", None)
+    ]
+    assert rows[2].to_dict() == {"itemId": 2, "date": "2024-01-01", "uniqContacts": 1}
+
+
+def test_models_use_less_memory_than_dicts():
+    payload = json.dumps([{"id": i, "title": f"Объявление {i}", "price": i, "status": "active",
+                           "url": f"https://avito.ru/{i}", "address": "Москва",
+                           "category": {"id": 9, "name": "Телефоны"}} for i in range(5000)])
+
+    def allocated(build):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = build()
+            gc.collect()
+            return tracemalloc.get_traced_memory()[0], result
+        finally:
+            tracemalloc.stop()
+
+    dict_size, _ = allocated(lambda: json.loads(payload))
+    model_size, items = allocated(lambda: Item.from_list(json.loads(payload)))
+    assert len(items) == 5000
+    assert model_size * 2 < dict_size
+
+
+def test_report_items_as_models(server):
+    def handle(request):
+        return 200, {"items": report_items(3), "meta": {"page": 0, "pages": 1, "per_page": 3}}
+
+    server.route("GET", "/autoload/v2/reports/1/items", handle)
+    client = AvitoAPIClient(access_token="TOKEN", lazy_auth=True)
+    items = client.autoload.get_report_items(1, as_models=True)
+    assert all(isinstance(item, ReportItem) for item in items)
+    assert [item["ad_id"] for item in items] == ["AB0", "AB1", "AB2"]
+    assert items[0].section.slug == "success"
+    assert client.autoload.get_report_items(1) == report_items(3)
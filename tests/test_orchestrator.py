@@ -0,0 +1,117 @@
+# tests/test_orchestrator.py
+
+import time
+import asyncio
+import threading
+from datetime import datetime, timezone
+from avito_api import AvitoAPIClient, AsyncAvitoAPIClient
+from avito_api.autoload.orchestrator import AutoloadOrchestrator, AsyncAutoloadOrchestrator, expected_duration
+
+LAST_REPORT = "/autoload/v2/reports/last_completed_report"
+
+
+def iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def autoload_routes(server, duration=0.3, fail_fees=False, upload_status=200):
+    """
+    Выгрузка завершается через duration секунд после upload
+    """
+    lock = threading.Lock()
+    reports = [(1, time.time() - 100)]
+
+    def upload(request):
+        if upload_status != 200:
+            return upload_status, {"error": {"message": "upload failed"}}
+        with lock:
+            reports.append((reports[-1][0] + 1, time.time()))
+        return 200, {}
+
+    def last_report(request):
+        with lock:
+            done = [(rid, started) for rid, started in reports if started + duration <= time.time()]
+        report_id, started = done[-1]
+        return 200, {"report_id": report_id, "status": "success",
+                     "started_at": iso(started), "finished_at": iso(started + duration)}
+
+    def page(key):
+        def handle(request):
+            if key == "fees" and fail_fees:
+                return 500, {"error": {"message": "internal"}}
+            return 200, {key: [{"ad_id": "a1"}, {"ad_id": "a2"}], "meta": {"page": 0, "pages": 1}}
+        return handle
+
+    server.route("POST", "/autoload/v1/upload", upload)
+    server.route("GET", LAST_REPORT, last_report)
+    for report_id in (1, 2, 3):
+        server.route("GET", f"/autoload/v2/reports/{report_id}/items", page("items"))
+        server.route("GET", f"/autoload/v2/reports/{report_id}/items/fees", page("fees"))
+
+
+def orchestrator(cls=AutoloadOrchestrator, **options):
+    options.setdefault("timeout", 5)
+    return cls(poll_min=0.05, poll_max=0.2, **options)
+
+
+def client(**options):
+    return AvitoAPIClient(access_token="TOKEN", lazy_auth=True, coalesce=False, **options)
+
+
+def test_expected_duration():
+    assert expected_duration({"started_at": iso(100), "finished_at": iso(130)}) == 30
+    assert expected_duration({"started_at": "2024-01-01T00:00:00"}) is None
+    assert expected_duration({"error": "x"}) is None
+
+
+def test_run_waits_for_new_report_and_fetches_results(server):
+    autoload_routes(server)
+    result = orchestrator().run(client().autoload)
+    assert result["errors"] == {}
+    assert result["baseline_report_id"] == 1
+    assert result["report_id"] == 2
+    assert len(result["items"]) == 2 and len(result["fees"]) == 2
+    assert server.count("POST", "/autoload/v1/upload") == 1
+
+
+def test_first_poll_waits_for_expected_duration(server):
+    autoload_routes(server, duration=0.5)
+    # Прошлая выгрузка длилась 0.5 с: первый опрос через 0.4 с, затем паузы от 0.05 с
+    result = orchestrator().run(client().autoload, fetch_items=False, fetch_fees=False)
+    assert result["report_id"] == 2
+    assert result["polls"] <= 4
+
+
+def test_timeout_is_reported(server):
+    autoload_routes(server, duration=60)
+    result = orchestrator(timeout=0.3).run(client().autoload)
+    assert "timeout" in result["errors"]
+    assert result["report_id"] is None
+
+
+def test_upload_error_stops_run(server):
+    autoload_routes(server, upload_status=403)
+    result = orchestrator().run(client().autoload)
+    assert result["errors"]["upload"]["status_code"] == 403
+    assert server.count("GET", LAST_REPORT) == 1
+
+
+def test_failed_page_is_reported_not_truncated(server):
+    autoload_routes(server, fail_fees=True)
+    result = orchestrator().run(client(retry_policy=None).autoload)
+    assert result["fees"] is None
+    assert result["errors"]["fees"]["page"] == 0
+    assert len(result["items"]) == 2
+
+
+def test_async_run(server):
+    autoload_routes(server)
+
+    async def main():
+        async with AsyncAvitoAPIClient(access_token="TOKEN") as api:
+            return await orchestrator(AsyncAutoloadOrchestrator).run_many({"a": api.autoload})
+
+    result = asyncio.run(main())["a"]
+    assert result["error"] is None
+    assert result["result"]["report_id"] == 2
+    assert len(result["result"]["fees"]) == 2
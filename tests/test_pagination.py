@@ -0,0 +1,150 @@
+# tests/test_pagination.py
+
+import asyncio
+import threading
+import pytest
+from avito_api import AvitoAPIClient, AsyncAvitoAPIClient
+from avito_api.utils.pagination import fetch_pages, async_fetch_pages, PageError
+from avito_api.utils.retry import RetryPolicy
+
+PAGES = 5
+PER_PAGE = 3
+FAST_RETRY = RetryPolicy(max_attempts=3, backoff_factor=0.01)
+
+
+def is_page(response):
+    return "error" not in response
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_fetch_pages_keeps_page_order(max_workers):
+    responses = fetch_pages(lambda page: {"page": page}, 6, is_page, max_workers=max_workers)
+    assert responses == [{"page": page} for page in range(1, 6)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_fetch_pages_reports_failed_page(max_workers):
+    def fetch_page(page):
+        return {"error": "HTTP Error: 500"} if page == 3 else {"page": page}
+
+    error = fetch_pages(fetch_page, 6, is_page, max_workers=max_workers)
+    assert error["page"] == 3
+    assert error["details"] == {"error": "HTTP Error: 500"}
+
+
+def test_async_fetch_pages_reports_failed_page():
+    async def fetch_page(page):
+        return {"error": "timeout"} if page == 2 else {"page": page}
+
+    error = asyncio.run(async_fetch_pages(fetch_page, 4, is_page, max_workers=3))
+    assert error["page"] == 2
+
+
+def report_items_route(server, failures):
+    """
+    Страницы отчета; failures - {номер страницы: сколько раз ответить 500}
+    """
+    lock = threading.Lock()
+
+    def handle(request):
+        page = int(request.query.get("page", 0))
+        with lock:
+            if failures.get(page):
+                failures[page] -= 1
+                return 500, {"error": {"message": "internal"}}
+        items = [{"ad_id": f"{page}-{i}"} for i in range(PER_PAGE)]
+        return 200, {"items": items, "meta": {"page": page, "pages": PAGES, "per_page": PER_PAGE}}
+
+    server.route("GET", "/autoload/v2/reports/1/items", handle)
+
+
+def client(**options):
+    return AvitoAPIClient(access_token="TOKEN", lazy_auth=True, retry_policy=FAST_RETRY, coalesce=False, **options)
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_report_items_retry_failed_page(server, max_workers):
+    report_items_route(server, {2: 2})
+    items = client().autoload.get_report_items(1, max_workers=max_workers)
+    assert [item["ad_id"] for item in items] == [f"{p}-{i}" for p in range(PAGES) for i in range(PER_PAGE)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_report_items_error_instead_of_partial_list(server, max_workers):
+    report_items_route(server, {3: 100})
+    result = client().autoload.get_report_items(1, max_workers=max_workers)
+    assert isinstance(result, dict)
+    assert result["page"] == 3
+    assert result["details"]["status_code"] == 500
+    assert result["details"]["retries"] == FAST_RETRY.max_attempts - 1
+
+
+def test_report_items_first_page_error(server):
+    report_items_route(server, {0: 100})
+    assert client().autoload.get_report_items(1)["page"] == 0
+
+
+def test_async_report_items_error_instead_of_partial_list(server):
+    report_items_route(server, {4: 100})
+
+    async def main():
+        async with AsyncAvitoAPIClient(access_token="TOKEN", retry_policy=FAST_RETRY) as api:
+            return await api.autoload.get_report_items(1, max_workers=3)
+
+    assert asyncio.run(main())["page"] == 4
+
+
+def all_items_route(server, fail_page=None, pages=3):
+    def handle(request):
+        page = int(request.query.get("page", 0))
+        if page == fail_page:
+            return 500, {"error": {"message": "internal"}}
+        return 200, {"resources": [{"id": page * 10 + i} for i in range(2)] if page < pages else []}
+
+    server.route("GET", "/core/v1/items", handle)
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iterator_raises_page_error(server, prefetch):
+    report_items_route(server, {2: 100})
+    seen = []
+    with pytest.raises(PageError) as info:
+        for item in client().autoload.iter_report_items(1, prefetch=prefetch):
+            seen.append(item)
+    assert info.value.page == 2
+    assert info.value.error["details"]["status_code"] == 500
+    assert len(seen) == 2 * PER_PAGE
+
+
+def test_get_all_items_returns_error_instead_of_partial_list(server):
+    all_items_route(server, fail_page=1)
+    result = client().autoload.get_all_items()
+    assert result["page"] == 1
+
+
+def test_get_all_items_reads_until_empty_page(server):
+    all_items_route(server)
+    items = client().autoload.get_all_items()
+    assert [item["id"] for item in items] == [0, 1, 10, 11, 20, 21]
+
+
+def test_get_all_items_page_is_deprecated(server):
+    all_items_route(server)
+    with pytest.warns(DeprecationWarning):
+        assert len(client().autoload.get_all_items(page=1)) == 6
+
+
+def test_async_iterator_raises_page_error(server):
+    all_items_route(server, fail_page=2)
+
+    async def main():
+        async with AsyncAvitoAPIClient(access_token="TOKEN", retry_policy=FAST_RETRY) as api:
+            seen = []
+            with pytest.raises(PageError):
+                async for item in api.autoload.iter_all_items():
+                    seen.append(item)
+            return seen, await api.autoload.get_all_items()
+
+    seen, result = asyncio.run(main())
+    assert len(seen) == 4
+    assert result["page"] == 2
@@ -0,0 +1,118 @@
+# tests/test_rate_limiter.py
+
+import asyncio
+import time
+from email.utils import formatdate
+import pytest
+from avito_api.utils import RateLimiter, RetryPolicy
+from avito_api.utils.rate_limiter import TokenBucket, parse_retry_after
+from avito_api.utils.request_handler import RequestHandler
+from avito_api.utils.async_request_handler import AsyncRequestHandler
+
+PATH = "/core/v1/accounts/self"
+FAST_RETRY = RetryPolicy(max_attempts=3, backoff_factor=0.01)
+
+
+def test_bucket_allows_burst_then_queues():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    # Следующий в очереди ждет еще один слот
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_bucket_refills_over_time():
+    bucket = TokenBucket(rate=10, capacity=2)
+    bucket.reserve()
+    bucket.reserve()
+    bucket.updated -= 0.2
+    assert bucket.reserve() == 0
+    # Токены не копятся сверх capacity
+    bucket.updated -= 10
+    bucket._refill(time.monotonic())
+    assert bucket.tokens == 2
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("-1") == 0
+    assert parse_retry_after(formatdate(time.time() + 60, usegmt=True)) == pytest.approx(60, abs=2)
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_feedback_pauses_bucket_for_retry_after():
+    limiter = RateLimiter()
+    url = "https://api.avito.ru" + PATH
+    limiter.feedback(url, "A", 429, {"Retry-After": "2"})
+    assert limiter.bucket(url, "A").reserve() == pytest.approx(2, abs=0.1)
+    # Корзины других аккаунтов и групп не затронуты
+    assert limiter.bucket(url, "B").reserve() == 0
+    assert limiter.bucket("https://api.avito.ru/messenger/v1/accounts/1/chats", "A").reserve() == 0
+
+
+def test_feedback_drains_bucket_when_limit_is_exhausted():
+    limiter = RateLimiter({"core": (10, 5)})
+    url = "https://api.avito.ru" + PATH
+    limiter.feedback(url, "A", 200, {"X-RateLimit-Remaining": "0"})
+    assert limiter.bucket(url, "A").reserve() == pytest.approx(0.1, abs=0.01)
+
+
+def test_adaptive_bucket_slows_down_and_recovers():
+    bucket = TokenBucket(rate=8, adaptive=True)
+    bucket.penalize(0)
+    assert bucket.rate == 4
+    for _ in range(100):
+        bucket.recover()
+    assert bucket.rate == 8
+
+
+def too_many_requests(times):
+    left = [times]
+
+    def handle(request):
+        if left[0]:
+            left[0] -= 1
+            return 429, {"error": "rate limit"}, {"Retry-After": "0"}
+        return 200, {"ok": True}
+
+    return handle
+
+
+def test_limiter_requeues_429(server):
+    server.route("GET", PATH, too_many_requests(2))
+    handler = RequestHandler(rate_limiter=RateLimiter(max_requeues=2), retry_policy=FAST_RETRY)
+    assert handler.send_request(server.url + PATH, account="A") == {"ok": True}
+    assert server.count("GET", PATH) == 3
+
+
+def test_limiter_owns_429_retries(server):
+    server.route("GET", PATH, too_many_requests(100))
+    handler = RequestHandler(rate_limiter=RateLimiter(max_requeues=2), retry_policy=FAST_RETRY)
+    result = handler.send_request(server.url + PATH, account="A")
+    assert result["status_code"] == 429
+    # Повторы ограничителя и политики не умножаются: 1 + max_requeues запросов
+    assert server.count("GET", PATH) == 3
+    assert "retries" not in result
+
+
+def test_policy_retries_429_without_limiter(server):
+    server.route("GET", PATH, too_many_requests(100))
+    result = RequestHandler(retry_policy=FAST_RETRY).send_request(server.url + PATH)
+    assert result["status_code"] == 429
+    assert server.count("GET", PATH) == FAST_RETRY.max_attempts
+
+
+def test_async_limiter_owns_429_retries(server):
+    server.route("GET", PATH, too_many_requests(100))
+
+    async def send():
+        handler = AsyncRequestHandler(rate_limiter=RateLimiter(max_requeues=1), retry_policy=FAST_RETRY)
+        try:
+            return await handler.send_request(server.url + PATH, account="A")
+        finally:
+            await handler.close()
+
+    assert asyncio.run(send())["status_code"] == 429
+    assert server.count("GET", PATH) == 2
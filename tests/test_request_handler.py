@@ -0,0 +1,18 @@
+# tests/test_request_handler.py
+
+from avito_api.utils import RequestHandler, default_handler
+
+
+def test_send_request_on_class_uses_default_handler(server):
+    # Вызов как у прежнего статического метода
+    result = RequestHandler.send_request(server.url + "/core/v1/accounts/self", headers={"Authorization": "Bearer A"})
+    assert result == {"who": "Bearer A", "path": "/core/v1/accounts/self"}
+    assert RequestHandler.send_request.__self__ is default_handler()
+    assert default_handler() is default_handler()
+
+
+def test_send_request_on_instance_uses_instance(server):
+    handler = RequestHandler(coalesce=False)
+    assert handler.send_request.__self__ is handler
+    assert handler.send_request(server.url + "/x", method="POST", data={"a": 1}) == {"who": None, "path": "/x"}
+    handler.close()
@@ -0,0 +1,67 @@
+# tests/test_response_cache.py
+
+import time
+from avito_api import AvitoAPIClient
+from avito_api.utils.request_handler import RequestHandler
+from avito_api.utils.response_cache import ResponseCache
+
+USER_INFO = "/core/v1/accounts/self"
+ITEM_INFO = "/core/v1/accounts/1/items/7/"
+ITEM_INFO_TEMPLATE = "/core/v1/accounts/{user_id}/items/{item_id}/"
+
+
+def clients(handler, *tokens):
+    return [AvitoAPIClient(access_token=token, request_handler=handler, lazy_auth=True) for token in tokens]
+
+
+def test_token_only_accounts_on_one_handler_do_not_share_entries(server):
+    cache = ResponseCache()
+    handler = RequestHandler(cache=cache)
+    a, b = clients(handler, "TOKEN_A", "TOKEN_B")
+    for _ in range(2):
+        assert a.item.get_item_info(1, 7)["who"] == "Bearer TOKEN_A"
+        assert b.item.get_item_info(1, 7)["who"] == "Bearer TOKEN_B"
+    assert cache.hits == 2
+    assert server.count("GET", ITEM_INFO) == 2
+
+
+def test_request_without_account_is_not_cached(server):
+    cache = ResponseCache()
+    handler = RequestHandler(cache=cache)
+    url = server.url + USER_INFO
+    for token in ("TOKEN_A", "TOKEN_B"):
+        response = handler.send_request(url, headers={"Authorization": f"Bearer {token}"})
+        assert response["who"] == f"Bearer {token}"
+    assert len(cache) == 0
+
+
+def test_cached_value_is_a_copy(server):
+    client, = clients(RequestHandler(cache=ResponseCache()), "TOKEN")
+    client.user.get_user_info()["who"] = "changed"
+    assert client.user.get_user_info()["who"] == "Bearer TOKEN"
+
+
+def test_expired_entry_is_revalidated_with_etag(server):
+    def handle(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return 304, None, {"ETag": '"v1"'}
+        return 200, {"who": request.token}, {"ETag": '"v1"'}
+
+    server.route("GET", ITEM_INFO, handle)
+    cache = ResponseCache(ttls={ITEM_INFO_TEMPLATE: 0.05})
+    client, = clients(RequestHandler(cache=cache), "TOKEN")
+    assert client.item.get_item_info(1, 7) == {"who": "Bearer TOKEN"}
+    time.sleep(0.1)
+    assert client.item.get_item_info(1, 7) == {"who": "Bearer TOKEN"}
+    assert cache.revalidations == 1
+    assert server.count("GET", ITEM_INFO) == 2
+
+
+def test_write_invalidates_related_entries(server):
+    cache = ResponseCache(ttls={"/autoload/v1/profile": 60})
+    client, = clients(RequestHandler(cache=cache), "TOKEN")
+    client.autoload.get_profile()
+    client.autoload.get_profile()
+    client.autoload.create_or_update_profile({"autoload_enabled": True})
+    client.autoload.get_profile()
+    assert server.count("GET", "/autoload/v1/profile") == 2
@@ -0,0 +1,156 @@
+# tests/test_voice.py
+
+import os
+import re
+import time
+import asyncio
+import pytest
+from avito_api import AvitoAPIClient, AsyncAvitoAPIClient
+from avito_api.messenger.voice import VoiceDownloader, AsyncVoiceDownloader
+from avito_api.utils.async_request_handler import AsyncRequestHandler
+
+USER_ID = 1
+SIZE = 100 * 1024
+VOICE_FILES = f"/messenger/v1/accounts/{USER_ID}/getVoiceFiles"
+
+
+def content(voice_id):
+    return bytes((i * 7 + len(voice_id)) % 251 for i in range(SIZE))
+
+
+def voice_routes(server, cut=None, status=None, delay=0.0):
+    """
+    cut - {ID: сколько байт отдать перед обрывом первой загрузки}; status - ответ вместо файла
+    """
+    cut = dict(cut or {})
+
+    def voice_files(request):
+        ids = request.query["voice_ids"].split(",")
+        return 200, {"voices_urls": {voice_id: f"{server.url}/files/{voice_id}.m4a" for voice_id in ids
+                                     if voice_id != "missing"}}
+
+    def voice_file(request):
+        voice_id = request.path.rsplit("/", 1)[1][:-len(".m4a")]
+        if status is not None:
+            return status, b"error page"
+        data = content(voice_id)
+        match = re.match(r"bytes=(\d+)-", request.headers.get("Range") or "")
+        offset = int(match.group(1)) if match else 0
+        if offset >= len(data):
+            return 416, None, {"Content-Range": f"bytes */{len(data)}"}
+        headers = {"Content-Length": str(len(data) - offset)}
+        if match:
+            headers["Content-Range"] = f"bytes {offset}-{len(data) - 1}/{len(data)}"
+        limit = cut.pop(voice_id, None)
+
+        def chunks():
+            for start in range(offset, len(data) if limit is None else offset + limit, 16 * 1024):
+                time.sleep(delay)
+                yield data[start:min(start + 16 * 1024, len(data) if limit is None else offset + limit)]
+
+        return (206 if match else 200), chunks(), headers
+
+    server.route("GET", VOICE_FILES, voice_files)
+    for voice_id in ("v1", "v2", "v3"):
+        server.route("GET", f"/files/{voice_id}.m4a", voice_file)
+
+
+def downloader(tmp_path, **options):
+    client = AvitoAPIClient(access_token="TOKEN", lazy_auth=True)
+    return VoiceDownloader(client.messenger, USER_ID, str(tmp_path), chunk_size=8 * 1024, **options)
+
+
+def read(tmp_path, voice_id):
+    with open(os.path.join(tmp_path, f"{voice_id}.m4a"), "rb") as handle:
+        return handle.read()
+
+
+def test_downloads_files_and_skips_existing(server, tmp_path):
+    voice_routes(server)
+    results = downloader(tmp_path).download(["v1", "v2", "missing"])
+    assert results["v1"]["size"] == SIZE and read(tmp_path, "v1") == content("v1")
+    assert read(tmp_path, "v2") == content("v2")
+    assert "error" in results["missing"]
+    again = downloader(tmp_path).download(["v1"])
+    assert again["v1"]["skipped"]
+    assert server.count("GET", "/files/v1.m4a") == 1
+
+
+def test_resumes_interrupted_download_with_range(server, tmp_path):
+    voice_routes(server, cut={"v1": 40 * 1024})
+    result = downloader(tmp_path).download(["v1"])["v1"]
+    assert result["size"] == SIZE
+    assert read(tmp_path, "v1") == content("v1")
+    ranges = [r.headers.get("Range") for r in server.requests if r.path == "/files/v1.m4a"]
+    assert ranges == [None, f"bytes={40 * 1024}-"]
+    assert not os.path.exists(os.path.join(tmp_path, "v1.m4a.part"))
+
+
+def test_complete_part_file_is_finished_on_416(server, tmp_path):
+    voice_routes(server)
+    with open(os.path.join(tmp_path, "v1.m4a.part"), "wb") as handle:
+        handle.write(content("v1"))
+    assert downloader(tmp_path).download(["v1"])["v1"]["size"] == SIZE
+    assert read(tmp_path, "v1") == content("v1")
+
+
+def test_416_without_part_file_is_an_error(server, tmp_path):
+    voice_routes(server, status=416)
+    result = downloader(tmp_path).download(["v1"])["v1"]
+    assert "error" in result
+    assert not os.path.exists(os.path.join(tmp_path, "v1.m4a"))
+    assert server.count("GET", "/files/v1.m4a") == 1
+
+
+@pytest.mark.parametrize("status, requests", [(403, 1), (404, 1), (503, 3)])
+def test_client_errors_are_not_retried(server, tmp_path, status, requests):
+    voice_routes(server, status=status)
+    result = downloader(tmp_path, attempts=3).download(["v1"])["v1"]
+    assert str(status) in result["error"]
+    assert server.count("GET", "/files/v1.m4a") == requests
+
+
+def test_file_over_limit_is_rejected(server, tmp_path):
+    voice_routes(server)
+    result = downloader(tmp_path, max_bytes=SIZE // 2).download(["v1"])["v1"]
+    assert "error" in result
+    assert os.listdir(tmp_path) == []
+
+
+def async_download(tmp_path, voice_ids, timeout=30, **options):
+    async def main():
+        handler = AsyncRequestHandler(timeout=timeout)
+        try:
+            client = AsyncAvitoAPIClient(access_token="TOKEN", request_handler=handler)
+            voice = AsyncVoiceDownloader(client.messenger, USER_ID, str(tmp_path), chunk_size=8 * 1024, **options)
+            return await voice.download(voice_ids)
+        finally:
+            await handler.close()
+
+    return asyncio.run(main())
+
+
+def test_async_resumes_interrupted_download(server, tmp_path):
+    voice_routes(server, cut={"v2": 10 * 1024})
+    results = async_download(tmp_path, ["v1", "v2"])
+    assert results["v2"]["size"] == SIZE
+    assert read(tmp_path, "v2") == content("v2")
+
+
+def test_async_slow_file_is_limited_by_read_timeout_not_total(server, tmp_path):
+    # 7 частей по 0.2 с: весь файл дольше таймаута, но каждая часть приходит быстрее
+    voice_routes(server, delay=0.2)
+    result = async_download(tmp_path, ["v3"], timeout=1, attempts=1)["v3"]
+    assert result.get("size") == SIZE, result
+
+
+def test_async_416_without_part_file_is_an_error(server, tmp_path):
+    voice_routes(server, status=416)
+    assert "error" in async_download(tmp_path, ["v1"])["v1"]
+    assert not os.path.exists(os.path.join(tmp_path, "v1.m4a"))
+
+
+def test_async_client_error_is_not_retried(server, tmp_path):
+    voice_routes(server, status=404)
+    assert "404" in async_download(tmp_path, ["v1"], attempts=3)["v1"]["error"]
+    assert server.count("GET", "/files/v1.m4a") == 1
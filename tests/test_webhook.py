@@ -0,0 +1,125 @@
+# tests/test_webhook.py
+
+import json
+import asyncio
+import pytest
+from avito_api.messenger.webhook import WebhookServer, MessageEvent, WebhookEvent, parse_event
+
+
+def notification(event_id="e1", value=None, event_type="message"):
+    if value is None:
+        value = {"id": "m1", "chat_id": "c1", "user_id": 5, "author_id": 7, "content": {"text": "Привет"}}
+    return {"id": event_id, "version": "v3.0.0", "timestamp": 1, "payload": {"type": event_type, "value": value}}
+
+
+def test_parse_message_event():
+    event = parse_event(notification())
+    assert isinstance(event, MessageEvent)
+    assert event.text == "Привет"
+    assert not event.is_own
+
+
+def test_unknown_type_is_generic_event():
+    event = parse_event(notification(event_type="chat_read", value={}))
+    assert type(event) is WebhookEvent
+    assert event.type == "chat_read"
+
+
+@pytest.mark.parametrize("data", [
+    [],
+    {"id": "e1"},
+    {"payload": {"value": {}}},
+    notification(value=["not", "a", "dict"]),
+    notification(value="text"),
+    notification(value={"content": "text"}),
+    notification(event_id=["e1"]),
+])
+def test_malformed_notification_raises_value_error(data):
+    with pytest.raises(ValueError):
+        parse_event(data)
+
+
+async def post(server, body, path=None):
+    _, port = server._server.sockets[0].getsockname()[:2]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = body if isinstance(body, bytes) else json.dumps(body).encode()
+    target = path or (f"/hook?token={server.secret}" if server.secret else "/hook")
+    writer.write(f"POST {target} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n"
+                 f"Connection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), 5)
+    writer.close()
+    return int(response.split()[1])
+
+
+def run_server(scenario, **options):
+    async def main():
+        events = []
+        server = WebhookServer(host="127.0.0.1", port=0, path="/hook", **options)
+        server.add_handler(events.append, "message")
+        async with server:
+            statuses = await scenario(server)
+        return statuses, events, server
+
+    return asyncio.run(main())
+
+
+def test_delivers_events_once():
+    async def scenario(server):
+        return [await post(server, notification("e1")), await post(server, notification("e1")),
+                await post(server, notification("e2"))]
+
+    statuses, events, server = run_server(scenario)
+    assert statuses == [200, 200, 200]
+    assert [event.id for event in events] == ["e1", "e2"]
+    assert server.duplicates == 1
+
+
+@pytest.mark.parametrize("body", [
+    b"not json",
+    b"\xff\xfe",
+    json.dumps(notification(value=[1, 2])).encode(),
+    json.dumps(notification(event_id={"a": 1})).encode(),
+])
+def test_malformed_body_gets_400(body):
+    async def scenario(server):
+        return [await post(server, body)]
+
+    statuses, events, server = run_server(scenario)
+    assert statuses == [400]
+    assert events == []
+    assert server.rejected == 1
+
+
+def test_wrong_secret_and_path():
+    async def scenario(server):
+        return [await post(server, notification(), path="/hook?token=wrong"),
+                await post(server, notification(), path="/other")]
+
+    statuses, events, _ = run_server(scenario, secret="s3cret")
+    assert statuses == [403, 404]
+    assert events == []
+
+
+def test_handler_error_does_not_stop_others():
+    async def scenario(server):
+        server.add_handler(lambda event: 1 / 0)
+        return [await post(server, notification("e1"))]
+
+    statuses, events, _ = run_server(scenario)
+    assert statuses == [200]
+    assert len(events) == 1
+
+
+def test_listens_on_loopback_by_default():
+    assert WebhookServer().host == "127.0.0.1"
+
+
+@pytest.mark.parametrize("host, secret, warned", [
+    ("0.0.0.0", None, True), ("", None, True), ("example.com", None, True),
+    ("0.0.0.0", "secret", False), ("127.0.0.1", None, False), ("::1", None, False), ("localhost", None, False),
+])
+def test_warns_about_public_server_without_secret(caplog, host, secret, warned):
+    with caplog.at_level("WARNING", logger="avito_api"):
+        WebhookServer(host=host, secret=secret)
+    assert any("без проверки secret" in record.message for record in caplog.records) == warned